@@ -0,0 +1,38 @@
+"""
+Analytics package - Auswertungen auf Basis der spaltenorientierten Spieldaten
+"""
+
+from .elo import EloRatings, ELO_COLUMNS, ELO_TABLE_COLUMNS
+from .goal_model import GoalModel, SeasonFit, STRENGTH_COLUMNS
+from .goal_timing import GOAL_TIMING_COLUMNS, bucket_labels, goal_timing_counts
+from .head_to_head import HeadToHead, HEAD_TO_HEAD_COLUMNS
+from .league_table import LeagueTable, TABLE_COLUMNS, points_for_win
+from .match_query import MatchQuery
+from .season_simulator import SeasonSimulator, SimulationResult, SIMULATION_COLUMNS
+from .stats_aggregator import StatsAggregator, TeamCounters
+from .views import MaterializedViews, ViewDefinition
+
+__all__ = [
+    "EloRatings",
+    "ELO_COLUMNS",
+    "ELO_TABLE_COLUMNS",
+    "GoalModel",
+    "SeasonFit",
+    "STRENGTH_COLUMNS",
+    "GOAL_TIMING_COLUMNS",
+    "bucket_labels",
+    "goal_timing_counts",
+    "HeadToHead",
+    "HEAD_TO_HEAD_COLUMNS",
+    "LeagueTable",
+    "TABLE_COLUMNS",
+    "points_for_win",
+    "MatchQuery",
+    "SeasonSimulator",
+    "SimulationResult",
+    "SIMULATION_COLUMNS",
+    "StatsAggregator",
+    "TeamCounters",
+    "MaterializedViews",
+    "ViewDefinition",
+]
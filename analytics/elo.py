@@ -0,0 +1,375 @@
+"""
+EloRatings - Spielstärke aller Vereine über die gesamte Bundesliga-Historie
+
+Elo-Wertung nach jedem Spiel, chronologisch ab 1963:
+
+    Erwartung E = 1 / (1 + 10^(-(R_heim + Heimvorteil - R_gast) / 400))
+    Änderung   = K * G * (Ergebnis - E)
+
+Ergebnis ist 1 (Heimsieg), 0.5 oder 0. G gewichtet deutliche Siege stärker
+(1 bei einem Tor Differenz, 1.5 bei zwei, (11 + Differenz) / 8 darüber).
+
+Die Spiele werden in "Wellen" zerlegt: Ein Spiel landet in der ersten Welle
+nach dem letzten Spiel seiner beiden Vereine. Innerhalb einer Welle spielt
+jeder Verein höchstens einmal, also lassen sich alle Spiele einer Welle mit
+einer Handvoll NumPy-Operationen auf dem Rating-Array verarbeiten - das
+Ergebnis ist identisch zur Verarbeitung Spiel für Spiel.
+
+Nach jedem Spieltag steht ein Schnappschuss aller Ratings bereit
+(Saison × Verein × Spieltag). Neue Spiele, die chronologisch hinter den
+bisherigen liegen, werden fortgeschrieben statt alles neu zu rechnen.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from models.columnar import MatchColumns
+from .league_table import season_game_numbers
+
+logger = logging.getLogger(__name__)
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 20.0
+HOME_ADVANTAGE = 65.0
+
+ELO_COLUMNS = ["Platz", "Verein", "Elo", "Veränderung"]
+
+# Zusatzspalten neben der Bundesliga-Tabelle
+ELO_TABLE_COLUMNS = ["Elo", "Elo ±"]
+
+# Gleitkomma-Spalten unter den je Spiel gespeicherten Arrays
+_FLOAT_ROWS = ("home_before", "away_before", "delta")
+
+
+def goal_difference_weight(goal_difference: np.ndarray) -> np.ndarray:
+    """Gewicht G für die Tordifferenz (wie bei World-Football-Elo)."""
+    difference = np.abs(np.asarray(goal_difference, dtype=np.float64))
+    return np.where(
+        difference <= 1, 1.0, np.where(difference == 2, 1.5, (11 + difference) / 8)
+    )
+
+
+def _waves(home: np.ndarray, away: np.ndarray, n_teams: int) -> np.ndarray:
+    """Welle je Spiel: eins nach der letzten Welle seiner beiden Vereine."""
+    last = [-1] * n_teams
+    waves = []
+    for h, a in zip(home.tolist(), away.tolist()):
+        wave = max(last[h], last[a]) + 1
+        last[h] = last[a] = wave
+        waves.append(wave)
+    return np.asarray(waves, dtype=np.int64)
+
+
+class EloRatings:
+    """Elo-Ratings mit Schnappschüssen nach jedem Spieltag."""
+
+    # Je Spiel gespeicherte Arrays (in Verarbeitungsreihenfolge)
+    _ROW_ARRAYS = (
+        "season_idx",
+        "matchday",
+        "date_key",
+        "home_id",
+        "away_id",
+        "home_score",
+        "away_score",
+        "home_before",
+        "away_before",
+        "delta",
+    )
+
+    def __init__(
+        self,
+        columns: Optional[MatchColumns] = None,
+        k_factor: float = K_FACTOR,
+        home_advantage: float = HOME_ADVANTAGE,
+        initial_rating: float = INITIAL_RATING,
+        goal_weighting: bool = True,
+    ):
+        """
+        Args:
+            columns: Spiele (chronologisch sortiert, wie in MatchColumns)
+            k_factor: Maximale Änderung pro Spiel (vor Tordifferenz-Gewicht)
+            home_advantage: Elo-Punkte, die der Gastgeber gutgeschrieben bekommt
+            initial_rating: Startwert für Vereine ohne bisheriges Spiel
+            goal_weighting: Deutliche Siege stärker gewichten
+        """
+        self.k_factor = k_factor
+        self.home_advantage = home_advantage
+        self.initial_rating = initial_rating
+        self.goal_weighting = goal_weighting
+        self.reset()
+        if columns is not None:
+            self.update(columns)
+
+    def reset(self):
+        """Verwirft alle verarbeiteten Spiele."""
+        self.teams: List[str] = []
+        self.seasons: List[str] = []
+        self._team_index: Dict[str, int] = {}
+        self._season_index: Dict[str, int] = {}
+        self.ratings = np.empty(0, dtype=np.float64)
+        self._keys: List[str] = []
+        self._rows = {
+            name: np.empty(0, dtype=np.float64 if name in _FLOAT_ROWS else np.int64)
+            for name in self._ROW_ARRAYS
+        }
+        self._snapshots: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    # ------------------------------------------------------------------
+    # Berechnung
+    # ------------------------------------------------------------------
+
+    def update(self, columns: MatchColumns) -> int:
+        """
+        Übernimmt den aktuellen Spielbestand.
+
+        Sind die bisher verarbeiteten Spiele der Anfang von columns (neue Spiele
+        liegen chronologisch dahinter), werden nur die neuen Spiele gerechnet,
+        sonst die ganze Historie.
+
+        Returns:
+            int: Anzahl neu verarbeiteter Spiele
+        """
+        keys = np.asarray(columns.match_key).tolist() if len(columns) else []
+        processed = len(self._keys)
+        if processed and keys[:processed] != self._keys:
+            logger.info("Elo: Spielbestand geändert, Historie wird neu berechnet")
+            self.reset()
+            processed = 0
+
+        if len(keys) == processed:
+            return 0
+
+        rows = slice(processed, len(keys))
+        team_ids = np.array(
+            [self._id(self.teams, self._team_index, team) for team in columns.teams],
+            dtype=np.int64,
+        )
+        season_ids = np.array(
+            [
+                self._id(self.seasons, self._season_index, season)
+                for season in columns.seasons
+            ],
+            dtype=np.int64,
+        )
+        if len(self.ratings) < len(self.teams):
+            self.ratings = np.concatenate(
+                [
+                    self.ratings,
+                    np.full(len(self.teams) - len(self.ratings), self.initial_rating),
+                ]
+            )
+
+        new_rows = {
+            "season_idx": season_ids[np.asarray(columns.season_id[rows])],
+            "matchday": np.asarray(columns.matchday[rows], dtype=np.int64),
+            "date_key": np.asarray(columns.date_key[rows], dtype=np.int64),
+            "home_id": team_ids[np.asarray(columns.home_id[rows])],
+            "away_id": team_ids[np.asarray(columns.away_id[rows])],
+            "home_score": np.asarray(columns.home_score[rows], dtype=np.int64),
+            "away_score": np.asarray(columns.away_score[rows], dtype=np.int64),
+        }
+        new_rows.update(self._process(new_rows))
+
+        for name in self._ROW_ARRAYS:
+            self._rows[name] = np.concatenate([self._rows[name], new_rows[name]])
+        self._keys.extend(keys[processed:])
+        self._snapshots = None
+        return len(keys) - processed
+
+    @staticmethod
+    def _id(names: List[str], index: Dict[str, int], name: str) -> int:
+        if name not in index:
+            index[name] = len(names)
+            names.append(name)
+        return index[name]
+
+    def _process(self, rows: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Schreibt die Ratings über die neuen Spiele fort (Welle für Welle)."""
+        home, away = rows["home_id"], rows["away_id"]
+        home_score, away_score = rows["home_score"], rows["away_score"]
+        result = np.where(
+            home_score > away_score, 1.0, np.where(home_score == away_score, 0.5, 0.0)
+        )
+        weight = self.k_factor * (
+            goal_difference_weight(home_score - away_score)
+            if self.goal_weighting
+            else np.ones(len(home))
+        )
+
+        n_rows = len(home)
+        home_before = np.empty(n_rows)
+        away_before = np.empty(n_rows)
+        delta = np.empty(n_rows)
+
+        waves = _waves(home, away, len(self.teams))
+        order = np.argsort(waves, kind="stable")
+        bounds = np.searchsorted(waves[order], np.arange(waves.max() + 2))
+        ratings = self.ratings
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            idx = order[start:stop]
+            h, a = home[idx], away[idx]
+            rating_home, rating_away = ratings[h], ratings[a]
+            expected = 1.0 / (
+                1.0 + 10.0 ** ((rating_away - rating_home - self.home_advantage) / 400)
+            )
+            change = weight[idx] * (result[idx] - expected)
+            home_before[idx] = rating_home
+            away_before[idx] = rating_away
+            delta[idx] = change
+            ratings[h] = rating_home + change
+            ratings[a] = rating_away - change
+
+        return {"home_before": home_before, "away_before": away_before, "delta": delta}
+
+    # ------------------------------------------------------------------
+    # Schnappschüsse
+    # ------------------------------------------------------------------
+
+    @property
+    def snapshots(self) -> np.ndarray:
+        """
+        Ratings nach jedem Spieltag, Form (Saison, Verein, Spieltag + 1).
+
+        Index 0 ist der Stand vor dem ersten Saisonspiel des Vereins; Vereine
+        ohne Spiel in einer Saison haben dort NaN. Spiele ohne Spieltag zählen
+        pro Verein fortlaufend (n-tes Saisonspiel = n-ter Spieltag).
+        """
+        if self._snapshots is None:
+            self._snapshots = self._build_snapshots()
+        return self._snapshots
+
+    def _build_snapshots(self) -> np.ndarray:
+        rows = self._rows
+        n_seasons, n_teams = len(self.seasons), len(self.teams)
+        n_rows = len(self._keys)
+        if not n_rows:
+            return np.full((n_seasons, n_teams, 1), np.nan)
+
+        # Team-Zeilen: erst alle Heim-, dann alle Auswärtssichten
+        row = np.tile(np.arange(n_rows), 2)
+        season = np.tile(rows["season_idx"].astype(np.int64), 2)
+        team = np.concatenate([rows["home_id"], rows["away_id"]]).astype(np.int64)
+        matchday = np.tile(rows["matchday"].astype(np.int64), 2)
+        if (matchday <= 0).any():
+            matchday = np.where(
+                matchday > 0,
+                matchday,
+                season_game_numbers(season, team, np.tile(rows["date_key"], 2)),
+            )
+        n_matchdays = int(matchday.max())
+        pair = season * n_teams + team
+
+        def rating(game_rows: np.ndarray, teams: np.ndarray, after: bool):
+            """Rating eines Vereins vor bzw. nach einem seiner Spiele."""
+            is_home = rows["home_id"][game_rows] == teams
+            before = np.where(
+                is_home, rows["home_before"][game_rows], rows["away_before"][game_rows]
+            )
+            if not after:
+                return before
+            return before + np.where(is_home, 1, -1) * rows["delta"][game_rows]
+
+        # Letztes Spiel je (Saison, Verein, Spieltag)
+        latest = np.full(n_seasons * n_teams * (n_matchdays + 1), -1, dtype=np.int64)
+        np.maximum.at(latest, pair * (n_matchdays + 1) + matchday, row)
+        values = np.full(latest.shape, np.nan)
+        played = np.flatnonzero(latest >= 0)
+        values[played] = rating(
+            latest[played], played // (n_matchdays + 1) % n_teams, after=True
+        )
+        values = values.reshape(n_seasons * n_teams, n_matchdays + 1)
+
+        # Stand vor dem ersten Saisonspiel
+        first = np.full(n_seasons * n_teams, n_rows, dtype=np.int64)
+        np.minimum.at(first, pair, row)
+        active = np.flatnonzero(first < n_rows)
+        values[active, 0] = rating(first[active], active % n_teams, after=False)
+
+        # Spieltage ohne Spiel übernehmen den letzten Stand
+        filled = np.where(~np.isnan(values), np.arange(n_matchdays + 1), 0)
+        np.maximum.accumulate(filled, axis=1, out=filled)
+        values = np.take_along_axis(values, filled, axis=1)
+        return values.reshape(n_seasons, n_teams, n_matchdays + 1)
+
+    # ------------------------------------------------------------------
+    # Abfragen
+    # ------------------------------------------------------------------
+
+    def current(self) -> pd.DataFrame:
+        """Aktuelle Ratings aller Vereine, bestes zuerst."""
+        frame = pd.DataFrame({"Verein": self.teams, "Elo": self.ratings.round(0)})
+        return frame.sort_values("Elo", ascending=False).reset_index(drop=True)
+
+    def rating_of(self, team: str) -> float:
+        """Aktuelles Rating eines Vereins (Startwert, falls unbekannt)."""
+        team_id = self._team_index.get(team)
+        return self.initial_rating if team_id is None else float(self.ratings[team_id])
+
+    def ratings_at(self, season: str, matchday: Optional[int] = None) -> pd.Series:
+        """
+        Ratings aller Vereine einer Saison nach einem Spieltag.
+
+        Args:
+            season: Saison wie in den Spieldaten
+            matchday: Spieltag (Standard: Saisonende)
+
+        Returns:
+            Series Verein -> Elo (nur Vereine mit Spielen in der Saison)
+        """
+        season_id = self._season_index.get(season)
+        if season_id is None:
+            return pd.Series(dtype=np.float64)
+        snapshots = self.snapshots[season_id]
+        last = snapshots.shape[1] - 1
+        column = last if matchday is None else min(max(matchday, 0), last)
+        values = snapshots[:, column]
+        played = ~np.isnan(values)
+        return pd.Series(
+            values[played], index=np.asarray(self.teams, dtype=object)[played]
+        )
+
+    def standings(self, season: str, matchday: Optional[int] = None) -> pd.DataFrame:
+        """Elo-Rangliste einer Saison (Spalten wie ELO_COLUMNS)."""
+        season_id = self._season_index.get(season)
+        if season_id is None:
+            return pd.DataFrame(columns=ELO_COLUMNS)
+        ratings = self.ratings_at(season, matchday)
+        start = pd.Series(
+            self.snapshots[season_id][:, 0],
+            index=np.asarray(self.teams, dtype=object),
+        )[ratings.index]
+        frame = pd.DataFrame(
+            {
+                "Verein": ratings.index,
+                "Elo": ratings.values.round(0),
+                "Veränderung": (ratings.values - start.values).round(0),
+            }
+        ).sort_values(["Elo", "Verein"], ascending=[False, True])
+        frame.insert(0, "Platz", np.arange(1, len(frame) + 1))
+        return frame.reset_index(drop=True)
+
+    def annotate(
+        self, standings: pd.DataFrame, season: str, matchday: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Ergänzt eine Tabelle (LeagueTable.standings) um die Spalten aus
+        ELO_TABLE_COLUMNS: Rating nach dem Spieltag und Änderung seit
+        Saisonbeginn.
+        """
+        elo = self.standings(season, matchday).set_index("Verein")
+        standings = standings.copy()
+        for column, source in zip(ELO_TABLE_COLUMNS, ("Elo", "Veränderung")):
+            standings[column] = standings["Verein"].map(elo[source]).astype("Int64")
+        return standings
+
+    def win_probability(self, home: str, away: str) -> float:
+        """Elo-Erwartungswert des Gastgebers (Sieg = 1, Remis = 0.5)."""
+        difference = self.rating_of(home) + self.home_advantage - self.rating_of(away)
+        return 1.0 / (1.0 + 10.0 ** (-difference / 400))
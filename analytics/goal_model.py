@@ -0,0 +1,559 @@
+"""
+GoalModel - Angriffs- und Abwehrstärken je Saison (Poisson / Dixon-Coles)
+
+Die Tore eines Spiels werden als zwei Poisson-Variablen modelliert:
+
+    log λ (Heimtore)     = c + h + angriff[heim] - abwehr[gast]
+    log μ (Auswärtstore) = c     + angriff[gast] - abwehr[heim]
+
+Das Dixon-Coles-Modell korrigiert zusätzlich die Ergebnisse 0:0, 1:0, 0:1
+und 1:1 über den Parameter rho. Die negative Log-Likelihood und ihr
+Gradient werden für alle Spiele einer Saison vektorisiert berechnet (die
+Gradienten je Verein per bincount). Angriffs- und Abwehrwerte summieren
+sich je Saison zu 0.
+
+Die Saisons werden unabhängig voneinander in einem Prozess-Pool angepasst.
+Jede Anpassung trägt eine Version (Prüfsumme aus Modell und Spieldaten):
+Saisons ohne neue Ergebnisse werden nicht erneut angepasst, und die
+Ergebnis-Matrizen werden je Saison und Version zwischengespeichert.
+
+Beispiel:
+    model = GoalModel("dixon_coles")
+    model.fit(columns)
+    model.scoreline_matrix("2023/24", "FC Bayern München", "Borussia Dortmund")
+    model.outcome_probabilities("2023/24", "FC Bayern München", "Borussia Dortmund")
+"""
+
+import hashlib
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from models.columnar import MatchColumns
+
+try:
+    from scipy.optimize import minimize
+except ImportError:  # pragma: no cover - scipy ist optional
+    minimize = None
+
+logger = logging.getLogger(__name__)
+
+MODELS = ("poisson", "dixon_coles")
+
+# Erhöhen, wenn sich Likelihood oder Optimierung ändern (macht alte Versionen ungültig)
+MODEL_VERSION = 1
+
+STRENGTH_COLUMNS = ["Verein", "Angriff", "Abwehr", "Erw. Tore", "Erw. Gegentore"]
+
+# Zulässiger Bereich für rho und Untergrenze der Korrekturfaktoren
+RHO_BOUNDS = (-0.3, 0.3)
+_TAU_FLOOR = 1e-10
+
+# Parameter-Vektor: [c, h, angriff (n), abwehr (n), rho (nur Dixon-Coles)]
+_INTERCEPT, _HOME = 0, 1
+
+
+def negative_log_likelihood(
+    params: np.ndarray,
+    home: np.ndarray,
+    away: np.ndarray,
+    home_goals: np.ndarray,
+    away_goals: np.ndarray,
+    n_teams: int,
+    dixon_coles: bool = False,
+    regularization: float = 0.0,
+) -> Tuple[float, np.ndarray]:
+    """
+    Negative Log-Likelihood einer Saison und ihr analytischer Gradient.
+
+    Konstante Terme (log x!) entfallen. Zusätzlich enthalten sind die
+    Strafterme (Σ angriff)² + (Σ abwehr)² für die Eindeutigkeit sowie
+    regularization · (angriff² + abwehr²).
+
+    Args:
+        params: Parameter-Vektor (siehe Modulbeschreibung)
+        home, away: Vereinsindizes 0..n_teams-1 je Spiel
+        home_goals, away_goals: Tore je Spiel
+        n_teams: Anzahl Vereine
+        dixon_coles: Korrektur der niedrigen Ergebnisse (letzter Parameter rho)
+        regularization: Gewicht der L2-Schrumpfung der Vereinsstärken
+
+    Returns:
+        (Wert, Gradient)
+    """
+    attack = params[2 : 2 + n_teams]
+    defence = params[2 + n_teams : 2 + 2 * n_teams]
+
+    log_lam = params[_INTERCEPT] + params[_HOME] + attack[home] - defence[away]
+    log_mu = params[_INTERCEPT] + attack[away] - defence[home]
+    lam = np.exp(log_lam)
+    mu = np.exp(log_mu)
+
+    value = float(np.sum(lam - home_goals * log_lam + mu - away_goals * log_mu))
+    # Ableitungen nach log λ bzw. log μ je Spiel
+    d_lam = lam - home_goals
+    d_mu = mu - away_goals
+
+    grad = np.zeros_like(params)
+    if dixon_coles:
+        rho = params[-1]
+        low = (home_goals <= 1) & (away_goals <= 1)
+        x, y = home_goals[low], away_goals[low]
+        lam_low, mu_low = lam[low], mu[low]
+
+        # τ und die Ableitungen von τ nach log λ, log μ und rho
+        tau = np.ones(len(x))
+        dtau_lam = np.zeros(len(x))
+        dtau_mu = np.zeros(len(x))
+        dtau_rho = np.zeros(len(x))
+
+        both = (x == 0) & (y == 0)
+        product = lam_low[both] * mu_low[both]
+        tau[both] = 1 - product * rho
+        dtau_lam[both] = dtau_mu[both] = -product * rho
+        dtau_rho[both] = -product
+
+        home_nil = (x == 0) & (y == 1)
+        tau[home_nil] = 1 + lam_low[home_nil] * rho
+        dtau_lam[home_nil] = lam_low[home_nil] * rho
+        dtau_rho[home_nil] = lam_low[home_nil]
+
+        away_nil = (x == 1) & (y == 0)
+        tau[away_nil] = 1 + mu_low[away_nil] * rho
+        dtau_mu[away_nil] = mu_low[away_nil] * rho
+        dtau_rho[away_nil] = mu_low[away_nil]
+
+        ones = (x == 1) & (y == 1)
+        tau[ones] = 1 - rho
+        dtau_rho[ones] = -1
+
+        tau = np.maximum(tau, _TAU_FLOOR)
+        value -= float(np.sum(np.log(tau)))
+        d_lam[low] -= dtau_lam / tau
+        d_mu[low] -= dtau_mu / tau
+        grad[-1] = -np.sum(dtau_rho / tau)
+
+    grad[_INTERCEPT] = d_lam.sum() + d_mu.sum()
+    grad[_HOME] = d_lam.sum()
+    grad[2 : 2 + n_teams] = np.bincount(
+        home, weights=d_lam, minlength=n_teams
+    ) + np.bincount(away, weights=d_mu, minlength=n_teams)
+    grad[2 + n_teams : 2 + 2 * n_teams] = -(
+        np.bincount(away, weights=d_lam, minlength=n_teams)
+        + np.bincount(home, weights=d_mu, minlength=n_teams)
+    )
+
+    attack_sum, defence_sum = attack.sum(), defence.sum()
+    value += attack_sum**2 + defence_sum**2
+    grad[2 : 2 + n_teams] += 2 * attack_sum
+    grad[2 + n_teams : 2 + 2 * n_teams] += 2 * defence_sum
+
+    if regularization:
+        value += regularization * float(np.sum(attack**2) + np.sum(defence**2))
+        grad[2 : 2 + 2 * n_teams] += 2 * regularization * params[2 : 2 + 2 * n_teams]
+
+    return value, grad
+
+
+def _gradient_descent(
+    fun: Callable[[np.ndarray], Tuple[float, np.ndarray]],
+    x0: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    max_iter: int = 5000,
+    tol: float = 1e-5,
+) -> Tuple[np.ndarray, bool]:
+    """
+    Projizierter Gradientenabstieg mit Barzilai-Borwein-Schrittweite und
+    Backtracking (Ersatz für L-BFGS-B, wenn scipy fehlt).
+    """
+    x = np.clip(x0, lower, upper)
+    value, grad = fun(x)
+    step = 1e-3
+    for _ in range(max_iter):
+        while True:
+            candidate = np.clip(x - step * grad, lower, upper)
+            new_value, new_grad = fun(candidate)
+            if new_value <= value or step < 1e-12:
+                break
+            step /= 2
+
+        dx, dg = candidate - x, new_grad - grad
+        x, value, grad = candidate, new_value, new_grad
+        # Projizierter Gradient (an den Grenzen nur nach innen zeigende Anteile)
+        projected = x - np.clip(x - grad, lower, upper)
+        if np.max(np.abs(projected)) < tol or not np.any(dx):
+            return x, True
+        curvature = float(dx @ dg)
+        step = float(dx @ dx) / curvature if curvature > 0 else step * 2
+    return x, False
+
+
+@dataclass
+class SeasonFit:
+    """Angepasste Parameter einer Saison."""
+
+    season: str
+    model: str
+    version: str
+    teams: List[str]
+    intercept: float
+    home_advantage: float
+    attack: np.ndarray
+    defence: np.ndarray
+    rho: float
+    log_likelihood: float
+    games: int
+    converged: bool
+
+    def team_index(self, team: str) -> int:
+        """Index eines Vereins in dieser Saison oder -1."""
+        try:
+            return self.teams.index(team)
+        except ValueError:
+            return -1
+
+    def expected_goals(
+        self, home: np.ndarray, away: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Erwartete Tore (λ, μ) für Vereinsindizes (beliebige Form)."""
+        lam = np.exp(
+            self.intercept
+            + self.home_advantage
+            + self.attack[home]
+            - self.defence[away]
+        )
+        mu = np.exp(self.intercept + self.attack[away] - self.defence[home])
+        return lam, mu
+
+
+def scoreline_probabilities(
+    lam: np.ndarray, mu: np.ndarray, rho: float = 0.0, max_goals: int = 10
+) -> np.ndarray:
+    """
+    Ergebnis-Wahrscheinlichkeiten P[..., x, y] für 0..max_goals Tore.
+
+    lam und mu dürfen beliebige (gleiche) Form haben; die Masse jenseits von
+    max_goals wird nicht umverteilt.
+    """
+    lam = np.asarray(lam, dtype=float)[..., None]
+    mu = np.asarray(mu, dtype=float)[..., None]
+    goals = np.arange(max_goals + 1)
+    log_factorial = np.concatenate([[0.0], np.cumsum(np.log(goals[1:]))])
+
+    home = np.exp(goals * np.log(lam) - lam - log_factorial)
+    away = np.exp(goals * np.log(mu) - mu - log_factorial)
+    matrix = home[..., :, None] * away[..., None, :]
+    if rho and max_goals >= 1:
+        lam, mu = lam[..., 0], mu[..., 0]
+        matrix[..., 0, 0] *= np.maximum(1 - lam * mu * rho, 0)
+        matrix[..., 0, 1] *= np.maximum(1 + lam * rho, 0)
+        matrix[..., 1, 0] *= np.maximum(1 + mu * rho, 0)
+        matrix[..., 1, 1] *= max(1 - rho, 0)
+    return matrix
+
+
+def _fit_season(
+    season: str,
+    model: str,
+    version: str,
+    teams: List[str],
+    home: np.ndarray,
+    away: np.ndarray,
+    home_goals: np.ndarray,
+    away_goals: np.ndarray,
+    regularization: float,
+) -> SeasonFit:
+    """Passt eine Saison an (läuft im Prozess-Pool, daher modulweit)."""
+    n_teams = len(teams)
+    dixon_coles = model == "dixon_coles"
+    home_goals = home_goals.astype(float)
+    away_goals = away_goals.astype(float)
+
+    n_params = 2 + 2 * n_teams + (1 if dixon_coles else 0)
+    x0 = np.zeros(n_params)
+    x0[_INTERCEPT] = np.log(max((home_goals.mean() + away_goals.mean()) / 2, 0.1))
+    lower = np.full(n_params, -np.inf)
+    upper = np.full(n_params, np.inf)
+    if dixon_coles:
+        lower[-1], upper[-1] = RHO_BOUNDS
+
+    def objective(params: np.ndarray) -> Tuple[float, np.ndarray]:
+        return negative_log_likelihood(
+            params,
+            home,
+            away,
+            home_goals,
+            away_goals,
+            n_teams,
+            dixon_coles,
+            regularization,
+        )
+
+    if minimize is not None:
+        result = minimize(
+            objective,
+            x0,
+            jac=True,
+            method="L-BFGS-B",
+            bounds=list(zip(lower, upper)),
+            options={"maxiter": 1000},
+        )
+        params, converged = result.x, bool(result.success)
+    else:
+        params, converged = _gradient_descent(objective, x0, lower, upper)
+
+    # Log-Likelihood inklusive der konstanten Terme, ohne Strafterme
+    log_factorial = np.concatenate(
+        [
+            [0.0],
+            np.cumsum(
+                np.log(np.arange(1, int(max(home_goals.max(), away_goals.max())) + 1))
+            ),
+        ]
+    )
+    penalty_free = negative_log_likelihood(
+        params, home, away, home_goals, away_goals, n_teams, dixon_coles
+    )[0] - (
+        params[2 : 2 + n_teams].sum() ** 2
+        + params[2 + n_teams : 2 + 2 * n_teams].sum() ** 2
+    )
+    log_likelihood = -penalty_free - float(
+        log_factorial[home_goals.astype(np.int64)].sum()
+        + log_factorial[away_goals.astype(np.int64)].sum()
+    )
+
+    return SeasonFit(
+        season=season,
+        model=model,
+        version=version,
+        teams=list(teams),
+        intercept=float(params[_INTERCEPT]),
+        home_advantage=float(params[_HOME]),
+        attack=params[2 : 2 + n_teams].copy(),
+        defence=params[2 + n_teams : 2 + 2 * n_teams].copy(),
+        rho=float(params[-1]) if dixon_coles else 0.0,
+        log_likelihood=log_likelihood,
+        games=len(home),
+        converged=converged,
+    )
+
+
+class GoalModel:
+    """Saisonweise Poisson-/Dixon-Coles-Modelle mit Ergebnis-Cache."""
+
+    def __init__(
+        self,
+        model: str = "dixon_coles",
+        max_goals: int = 10,
+        regularization: float = 0.01,
+        workers: Optional[int] = None,
+    ):
+        """
+        Args:
+            model: "poisson" oder "dixon_coles"
+            max_goals: Größe der Ergebnis-Matrizen (0..max_goals Tore)
+            regularization: L2-Schrumpfung der Vereinsstärken (stabilisiert
+                            kurze Saisonabschnitte)
+            workers: Prozesse für die Anpassung (None = CPU-Anzahl, 1 = seriell)
+
+        Raises:
+            ValueError: Unbekanntes Modell
+        """
+        if model not in MODELS:
+            raise ValueError(f"Unbekanntes Modell: {model} (erlaubt: {MODELS})")
+        self.model = model
+        self.max_goals = max_goals
+        self.regularization = regularization
+        self.workers = workers
+
+        self._lock = threading.RLock()
+        self.fits: Dict[str, SeasonFit] = {}
+        # (Saison, Version) -> Matrizen (heim, gast, x, y)
+        self._matrices: Dict[Tuple[str, str], np.ndarray] = {}
+
+    # ------------------------------------------------------------------
+    # Anpassung
+    # ------------------------------------------------------------------
+
+    def _version(self, teams: List[str], arrays: Iterable[np.ndarray]) -> str:
+        digest = hashlib.sha1(
+            f"{MODEL_VERSION}|{self.model}|{self.regularization}|".encode("utf-8")
+        )
+        digest.update("\x1f".join(teams).encode("utf-8"))
+        for array in arrays:
+            digest.update(np.ascontiguousarray(array, dtype=np.int64).tobytes())
+        return digest.hexdigest()[:16]
+
+    def _jobs(
+        self, columns: MatchColumns, seasons: Optional[Iterable[str]]
+    ) -> List[tuple]:
+        season_id = np.asarray(columns.season_id)
+        bounds = np.searchsorted(season_id, np.arange(len(columns.seasons) + 1))
+        wanted = set(seasons) if seasons is not None else None
+        team_names = np.asarray(columns.teams, dtype=object)
+
+        jobs = []
+        for i, season in enumerate(columns.seasons):
+            rows = slice(int(bounds[i]), int(bounds[i + 1]))
+            if rows.stop == rows.start or (wanted is not None and season not in wanted):
+                continue
+            team_ids, local = np.unique(
+                np.concatenate([columns.home_id[rows], columns.away_id[rows]]),
+                return_inverse=True,
+            )
+            n_games = rows.stop - rows.start
+            teams = team_names[team_ids].tolist()
+            home, away = local[:n_games], local[n_games:]
+            home_goals = np.asarray(columns.home_score[rows], dtype=np.int64)
+            away_goals = np.asarray(columns.away_score[rows], dtype=np.int64)
+
+            version = self._version(teams, (home, away, home_goals, away_goals))
+            current = self.fits.get(season)
+            if current is not None and current.version == version:
+                continue
+            jobs.append(
+                (
+                    season,
+                    self.model,
+                    version,
+                    teams,
+                    home,
+                    away,
+                    home_goals,
+                    away_goals,
+                    self.regularization,
+                )
+            )
+        return jobs
+
+    def fit(
+        self, columns: Optional[MatchColumns], seasons: Optional[Iterable[str]] = None
+    ) -> List[str]:
+        """
+        Passt alle (oder die angegebenen) Saisons an.
+
+        Saisons, deren Spiele sich seit der letzten Anpassung nicht geändert
+        haben, werden übersprungen.
+
+        Returns:
+            Liste der neu angepassten Saisons
+        """
+        if columns is None or not len(columns):
+            return []
+
+        with self._lock:
+            jobs = self._jobs(columns, seasons)
+            if not jobs:
+                return []
+
+            if len(jobs) == 1 or self.workers == 1:
+                fits = [_fit_season(*job) for job in jobs]
+            else:
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    fits = list(executor.map(_fit_season, *zip(*jobs)))
+
+            for season_fit in fits:
+                previous = self.fits.get(season_fit.season)
+                if previous is not None:
+                    self._matrices.pop((previous.season, previous.version), None)
+                self.fits[season_fit.season] = season_fit
+                if not season_fit.converged:
+                    logger.warning(
+                        f"Modell für Saison {season_fit.season} nicht konvergiert"
+                    )
+
+            if seasons is None:
+                present = set(columns.seasons)
+                for season in [s for s in self.fits if s not in present]:
+                    stale = self.fits.pop(season)
+                    self._matrices.pop((season, stale.version), None)
+
+            logger.info(f"{len(fits)} Saison(s) mit {self.model}-Modell angepasst")
+            return [season_fit.season for season_fit in fits]
+
+    # ------------------------------------------------------------------
+    # Vorhersagen
+    # ------------------------------------------------------------------
+
+    def _fit_for(self, season: str) -> SeasonFit:
+        season_fit = self.fits.get(season)
+        if season_fit is None:
+            raise KeyError(f"Kein Modell für Saison {season}")
+        return season_fit
+
+    def scoreline_matrices(self, season: str) -> np.ndarray:
+        """
+        Ergebnis-Matrizen aller Paarungen einer Saison.
+
+        Returns:
+            Array (heim, gast, x, y) in der Vereinsreihenfolge von fits[season].teams
+
+        Raises:
+            KeyError: Saison nicht angepasst
+        """
+        with self._lock:
+            season_fit = self._fit_for(season)
+            key = (season, season_fit.version)
+            matrices = self._matrices.get(key)
+            if matrices is None:
+                index = np.arange(len(season_fit.teams))
+                lam, mu = season_fit.expected_goals(index[:, None], index[None, :])
+                matrices = scoreline_probabilities(
+                    lam, mu, season_fit.rho, self.max_goals
+                )
+                self._matrices[key] = matrices
+            return matrices
+
+    def scoreline_matrix(self, season: str, home: str, away: str) -> np.ndarray:
+        """
+        Ergebnis-Wahrscheinlichkeiten P[x, y] einer Paarung.
+
+        Raises:
+            KeyError: Saison nicht angepasst oder Verein nicht in der Saison
+        """
+        season_fit = self._fit_for(season)
+        home_id, away_id = season_fit.team_index(home), season_fit.team_index(away)
+        if home_id < 0 or away_id < 0:
+            raise KeyError(f"Paarung {home} - {away} nicht in Saison {season}")
+        return self.scoreline_matrices(season)[home_id, away_id]
+
+    def outcome_probabilities(
+        self, season: str, home: str, away: str
+    ) -> Tuple[float, float, float]:
+        """Wahrscheinlichkeiten für Heimsieg, Unentschieden und Auswärtssieg."""
+        matrix = self.scoreline_matrix(season, home, away)
+        return (
+            float(np.tril(matrix, -1).sum()),
+            float(np.trace(matrix)),
+            float(np.triu(matrix, 1).sum()),
+        )
+
+    def strengths(self, season: str) -> pd.DataFrame:
+        """
+        Vereinsstärken einer Saison (Spalten STRENGTH_COLUMNS).
+
+        Erw. Tore / Erw. Gegentore gelten für ein Spiel gegen einen
+        durchschnittlichen Gegner auf neutralem Platz.
+        """
+        season_fit = self._fit_for(season)
+        frame = pd.DataFrame(
+            {
+                "Verein": season_fit.teams,
+                "Angriff": season_fit.attack.round(3),
+                "Abwehr": season_fit.defence.round(3),
+                "Erw. Tore": np.exp(season_fit.intercept + season_fit.attack).round(2),
+                "Erw. Gegentore": np.exp(
+                    season_fit.intercept - season_fit.defence
+                ).round(2),
+            },
+            columns=STRENGTH_COLUMNS,
+        )
+        return frame.sort_values(
+            ["Erw. Tore", "Verein"], ascending=[False, True]
+        ).reset_index(drop=True)
@@ -0,0 +1,234 @@
+"""
+GoalTiming - Verteilung der Torminuten nach Verein, Saison und Ära
+
+Alle Tore liegen im Spaltenspeicher als flaches Array (goal_minute, sortiert
+nach Spiel). Die Einteilung in Zeitabschnitte ist eine ganzzahlige Division,
+die Zählung je Gruppe ein einziger bincount über Gruppe × Abschnitt:
+
+    1-15 | 16-30 | 31-45 | 46-60 | 61-75 | 76-90 | 90+
+
+Die Nachspielzeit ist in den Minuten bereits enthalten ("90'+3" -> 93), Tore
+nach der 90. Minute bilden daher einen eigenen Abschnitt. Nachspielzeit der
+ersten Halbzeit ("45'+2" -> 47) ist davon nicht zu unterscheiden und zählt
+zu 46-60. Tore ohne Minute (0) werden nicht gezählt.
+
+Die Teilergebnisse sind summierbar und werden in MaterializedViews je Saison
+zwischengespeichert (goal_timing_team / _season / _era).
+"""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from models.columnar import MatchColumns, season_start_year
+
+BUCKET_MINUTES = 15
+REGULATION_MINUTES = 90
+STOPPAGE_LABEL = "90+"
+
+# Gruppierungen -> Spaltenname der Gruppe
+TIMING_GROUPS = {"team": "Verein", "season": "Saison", "era": "Ära"}
+
+# Auswertungen im Export-Sheet (siehe goal_timing_table)
+TIMING_LEVELS = ("Gesamt", "Ära", "Saison", "Verein")
+
+
+def bucket_labels(width: int = BUCKET_MINUTES) -> List[str]:
+    """Beschriftung der Zeitabschnitte, z.B. ["1-15", ..., "76-90", "90+"]."""
+    starts = range(1, REGULATION_MINUTES + 1, width)
+    return [
+        f"{start}-{min(start + width - 1, REGULATION_MINUTES)}" for start in starts
+    ] + [STOPPAGE_LABEL]
+
+
+GOAL_TIMING_COLUMNS = ["Auswertung", "Name"] + bucket_labels() + ["Tore"]
+
+
+def minute_buckets(minutes: np.ndarray, width: int = BUCKET_MINUTES) -> np.ndarray:
+    """Abschnitt je Tor (-1 = ohne Minute, letzter Abschnitt = nach der 90.)."""
+    minutes = np.asarray(minutes, dtype=np.int64)
+    regular = -(-REGULATION_MINUTES // width)
+    buckets = np.where(minutes > REGULATION_MINUTES, regular, (minutes - 1) // width)
+    buckets[minutes <= 0] = -1
+    return buckets
+
+
+def era_label(season_year: int) -> str:
+    """Ära (Jahrzehnt) einer Saison, z.B. 1995 -> "1990er"."""
+    return f"{season_year // 10 * 10}er" if season_year else "Unbekannt"
+
+
+def timing_histogram(
+    groups: np.ndarray, minutes: np.ndarray, n_groups: int, width: int = BUCKET_MINUTES
+) -> np.ndarray:
+    """
+    Tore je Gruppe und Zeitabschnitt.
+
+    Args:
+        groups: Gruppen-ID je Tor (0..n_groups-1)
+        minutes: Minute je Tor
+        n_groups: Anzahl Gruppen
+
+    Returns:
+        Array (Gruppe, Abschnitt)
+    """
+    n_buckets = len(bucket_labels(width))
+    buckets = minute_buckets(minutes, width)
+    valid = buckets >= 0
+    flat = np.asarray(groups, dtype=np.int64)[valid] * n_buckets + buckets[valid]
+    return np.bincount(flat, minlength=n_groups * n_buckets).reshape(
+        n_groups, n_buckets
+    )
+
+
+def goal_timing_counts(
+    columns: MatchColumns,
+    by: str = "team",
+    goals: slice = slice(None),
+    width: int = BUCKET_MINUTES,
+) -> pd.DataFrame:
+    """
+    Summierbare Torminuten-Tabelle (Index = Gruppe, Spalten = Abschnitte).
+
+    Args:
+        columns: Spaltenspeicher
+        by: "team" (Verein des Torerfolgs), "season" oder "era"
+        goals: Torzeilen (z.B. die einer Saison, Standard: alle)
+
+    Raises:
+        ValueError: Unbekannte Gruppierung
+    """
+    if by not in TIMING_GROUPS:
+        raise ValueError(f"Unbekannte Gruppierung: {by}")
+
+    match = np.asarray(columns.goal_match[goals], dtype=np.int64)
+    minutes = np.asarray(columns.goal_minute[goals])
+    if by == "team":
+        is_home = np.asarray(columns.goal_is_home[goals], dtype=bool)
+        groups = np.where(
+            is_home,
+            np.asarray(columns.home_id)[match],
+            np.asarray(columns.away_id)[match],
+        )
+        names = list(columns.teams)
+    elif by == "season":
+        groups = np.asarray(columns.season_id)[match]
+        names = list(columns.seasons)
+    else:
+        eras = [era_label(season_start_year(season)) for season in columns.seasons]
+        era_names, season_era = np.unique(eras, return_inverse=True)
+        groups = season_era[np.asarray(columns.season_id)[match]]
+        names = era_names.tolist()
+
+    histogram = timing_histogram(groups, minutes, len(names), width)
+    frame = pd.DataFrame(
+        histogram,
+        index=pd.Index(names, name=TIMING_GROUPS[by]),
+        columns=bucket_labels(width),
+    )
+    return frame[histogram.sum(axis=1) > 0]
+
+
+def finalize_timing(frame: pd.DataFrame) -> pd.DataFrame:
+    """Anzeige-Tabelle: Gruppe als Spalte, dazu die Summe "Tore"."""
+    frame = frame.reset_index()
+    frame["Tore"] = frame.drop(columns=frame.columns[0]).sum(axis=1)
+    return frame.sort_values(frame.columns[0]).reset_index(drop=True)
+
+
+def timing_shares(frame: pd.DataFrame) -> pd.DataFrame:
+    """Anteile der Abschnitte in Prozent (Eingabe: Ergebnis von finalize_timing)."""
+    shares = frame.copy()
+    labels = [column for column in frame.columns[1:] if column != "Tore"]
+    totals = frame["Tore"].where(frame["Tore"] > 0)
+    shares[labels] = (frame[labels].div(totals, axis=0) * 100).round(1)
+    return shares
+
+
+def _sheet_rows(level: str, counts: pd.DataFrame) -> pd.DataFrame:
+    """Zeilen einer Auswertung im Format GOAL_TIMING_COLUMNS (ohne leere Gruppen)."""
+    frame = pd.DataFrame(counts.to_numpy(), columns=list(counts.columns))
+    frame.insert(0, "Name", list(counts.index))
+    frame.insert(0, "Auswertung", level)
+    frame["Tore"] = frame[list(counts.columns)].sum(axis=1)
+    return frame[frame["Tore"] > 0]
+
+
+def goal_timing_sheet(
+    columns: MatchColumns, width: int = BUCKET_MINUTES
+) -> pd.DataFrame:
+    """
+    Alle Auswertungen untereinander (Spalten GOAL_TIMING_COLUMNS) aus dem
+    Spaltenspeicher, z.B. für Exporte. Gleiches Ergebnis wie goal_timing_table.
+    """
+    by_level = {"Ära": "era", "Saison": "season", "Verein": "team"}
+    frames = []
+    for level in TIMING_LEVELS:
+        if level == "Gesamt":
+            counts = goal_timing_counts(columns, "season", width=width)
+            counts = pd.DataFrame(
+                [counts.to_numpy().sum(axis=0)], index=["Alle"], columns=counts.columns
+            )
+        else:
+            counts = goal_timing_counts(columns, by_level[level], width=width)
+        frames.append(_sheet_rows(level, counts.sort_index()))
+    return pd.concat(frames, ignore_index=True)
+
+
+def goal_timing_table(
+    seasons: Sequence[Optional[str]],
+    teams: Sequence[str],
+    minutes: Sequence[int],
+    width: int = BUCKET_MINUTES,
+) -> pd.DataFrame:
+    """
+    Wie goal_timing_sheet, aber aus einzelnen Toren (z.B. aus den Texten
+    eines vorhandenen Export-Sheets).
+
+    Args:
+        seasons: Saison je Tor
+        teams: Verein des Torerfolgs je Tor
+        minutes: Minute je Tor
+    """
+    minutes = np.asarray(minutes, dtype=np.int64)
+    seasons = [season or "" for season in seasons]
+    levels = {
+        "Gesamt": ["Alle"] * len(minutes),
+        "Ära": [era_label(season_start_year(season)) for season in seasons],
+        "Saison": seasons,
+        "Verein": list(teams),
+    }
+
+    frames = []
+    for level in TIMING_LEVELS:
+        codes, names = pd.factorize(pd.Series(levels[level], dtype=object), sort=True)
+        histogram = timing_histogram(codes, minutes, len(names), width)
+        counts = pd.DataFrame(
+            histogram, index=list(names), columns=bucket_labels(width)
+        )
+        frames.append(_sheet_rows(level, counts))
+    return pd.concat(frames, ignore_index=True)
+
+
+# ---------------------------------------------------------------------------
+# Teilergebnisse für MaterializedViews
+# ---------------------------------------------------------------------------
+
+
+def team_timing_partial(
+    columns: MatchColumns, rows: slice, goals: slice
+) -> pd.DataFrame:
+    return goal_timing_counts(columns, "team", goals)
+
+
+def season_timing_partial(
+    columns: MatchColumns, rows: slice, goals: slice
+) -> pd.DataFrame:
+    return goal_timing_counts(columns, "season", goals)
+
+
+def era_timing_partial(
+    columns: MatchColumns, rows: slice, goals: slice
+) -> pd.DataFrame:
+    return goal_timing_counts(columns, "era", goals)
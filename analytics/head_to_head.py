@@ -0,0 +1,301 @@
+"""
+HeadToHead - Direkter Vergleich aller Vereine über die gesamte Historie
+
+Die Bilanzen liegen als dichte Verein × Verein-Matrizen vor, Zeile =
+Heimverein, Spalte = Gastverein:
+
+    home_wins[a, b]   Heimsiege von a gegen b
+    draws[a, b]       Unentschieden mit a als Gastgeber
+    away_wins[a, b]   Auswärtssiege von b bei a
+    home_goals[a, b]  Tore von a zu Hause gegen b
+    away_goals[a, b]  Tore von b bei a
+
+Die Auswärtsbilanz von a gegen b steht damit transponiert in Zeile b. Der
+Aufbau aus dem Spaltenspeicher ist ein einziger bincount-Durchlauf; neue
+Spiele werden einzeln fortgeschrieben (neue Vereine vergrößern die Matrizen).
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from models.game_data import GameData
+from models.columnar import MatchColumns, match_key
+from .stats_aggregator import TeamCounters
+
+HEAD_TO_HEAD_COLUMNS = [
+    "Verein",
+    "Gegner",
+    "Spiele",
+    "S",
+    "U",
+    "N",
+    "Tore",
+    "Gegentore",
+    "Heim S",
+    "Heim U",
+    "Heim N",
+    "Auswärts S",
+    "Auswärts U",
+    "Auswärts N",
+]
+
+# Ebenen des Matrix-Stapels
+_HOME_WINS, _DRAWS, _AWAY_WINS, _HOME_GOALS, _AWAY_GOALS = range(5)
+
+# (Heimverein-ID, Gastverein-ID, Tore Heim, Tore Auswärts)
+_Entry = Tuple[int, int, int, int]
+
+
+class HeadToHead:
+    """Verein × Verein-Bilanzen als NumPy-Matrizen, indiziert über Vereins-IDs."""
+
+    def __init__(self, teams: Iterable[str] = ()):
+        self._lock = threading.Lock()
+        self.teams: List[str] = list(teams)
+        self._team_index: Dict[str, int] = {
+            team: i for i, team in enumerate(self.teams)
+        }
+        n_teams = len(self.teams)
+        self._grid = np.zeros((5, n_teams, n_teams), dtype=np.int32)
+        self._entries: Dict[str, _Entry] = {}
+
+    @classmethod
+    def from_columns(cls, columns: Optional[MatchColumns]) -> "HeadToHead":
+        """Baut alle Matrizen in einem vektorisierten Durchlauf auf."""
+        if columns is None:
+            return cls()
+        head_to_head = cls(columns.teams)
+        if not len(columns):
+            return head_to_head
+
+        n_teams = len(columns.teams)
+        home_id = np.asarray(columns.home_id, dtype=np.int64)
+        away_id = np.asarray(columns.away_id, dtype=np.int64)
+        home_score = np.asarray(columns.home_score, dtype=np.int64)
+        away_score = np.asarray(columns.away_score, dtype=np.int64)
+        pair = home_id * n_teams + away_id
+
+        def per_pair(weights) -> np.ndarray:
+            return np.bincount(pair, weights=weights, minlength=n_teams * n_teams)
+
+        head_to_head._grid = (
+            np.stack(
+                [
+                    per_pair(home_score > away_score),
+                    per_pair(home_score == away_score),
+                    per_pair(home_score < away_score),
+                    per_pair(home_score),
+                    per_pair(away_score),
+                ]
+            )
+            .astype(np.int32)
+            .reshape(5, n_teams, n_teams)
+        )
+        head_to_head._entries = dict(
+            zip(
+                np.asarray(columns.match_key).tolist(),
+                zip(
+                    home_id.tolist(),
+                    away_id.tolist(),
+                    home_score.tolist(),
+                    away_score.tolist(),
+                ),
+            )
+        )
+        return head_to_head
+
+    # ------------------------------------------------------------------
+    # Fortschreiben
+    # ------------------------------------------------------------------
+
+    def clear(self):
+        """Entfernt alle Vereine und Spiele."""
+        with self._lock:
+            self.teams = []
+            self._team_index = {}
+            self._grid = np.zeros((5, 0, 0), dtype=np.int32)
+            self._entries = {}
+
+    def _id_for(self, team: str) -> int:
+        """ID eines Vereins; unbekannte Vereine vergrößern die Matrizen."""
+        team_id = self._team_index.get(team)
+        if team_id is None:
+            team_id = len(self.teams)
+            self.teams.append(team)
+            self._team_index[team] = team_id
+            self._grid = np.pad(self._grid, ((0, 0), (0, 1), (0, 1)))
+        return team_id
+
+    def add(self, game: GameData):
+        """Nimmt ein Spiel auf (ersetzt ein bereits bekanntes mit gleichem Schlüssel)."""
+        if game.home_score is None or game.away_score is None:
+            return
+        key = match_key(game)
+        with self._lock:
+            entry = (
+                self._id_for(game.home_team.name),
+                self._id_for(game.away_team.name),
+                game.home_score,
+                game.away_score,
+            )
+            previous = self._entries.get(key)
+            if previous == entry:
+                return
+            if previous is not None:
+                self._apply(previous, -1)
+            self._entries[key] = entry
+            self._apply(entry, 1)
+
+    def remove(self, game: GameData) -> bool:
+        """Entfernt ein Spiel. Gibt False zurück, wenn es nicht erfasst war."""
+        with self._lock:
+            previous = self._entries.pop(match_key(game), None)
+            if previous is None:
+                return False
+            self._apply(previous, -1)
+            return True
+
+    def _apply(self, entry: _Entry, sign: int):
+        home, away, home_score, away_score = entry
+        cell = self._grid[:, home, away]
+        cell[_HOME_WINS] += sign * (home_score > away_score)
+        cell[_DRAWS] += sign * (home_score == away_score)
+        cell[_AWAY_WINS] += sign * (home_score < away_score)
+        cell[_HOME_GOALS] += sign * home_score
+        cell[_AWAY_GOALS] += sign * away_score
+
+    # ------------------------------------------------------------------
+    # Matrizen
+    # ------------------------------------------------------------------
+
+    @property
+    def home_wins(self) -> np.ndarray:
+        return self._grid[_HOME_WINS]
+
+    @property
+    def draws(self) -> np.ndarray:
+        return self._grid[_DRAWS]
+
+    @property
+    def away_wins(self) -> np.ndarray:
+        return self._grid[_AWAY_WINS]
+
+    @property
+    def home_goals(self) -> np.ndarray:
+        return self._grid[_HOME_GOALS]
+
+    @property
+    def away_goals(self) -> np.ndarray:
+        return self._grid[_AWAY_GOALS]
+
+    @property
+    def wins(self) -> np.ndarray:
+        """Siege von Zeilenverein gegen Spaltenverein (Heim + Auswärts)."""
+        return self.home_wins + self.away_wins.T
+
+    @property
+    def losses(self) -> np.ndarray:
+        return self.away_wins + self.home_wins.T
+
+    @property
+    def games(self) -> np.ndarray:
+        played = self.home_wins + self.draws + self.away_wins
+        return played + played.T
+
+    def team_id(self, name: str) -> int:
+        """ID eines Vereins oder -1, falls unbekannt."""
+        return self._team_index.get(name, -1)
+
+    # ------------------------------------------------------------------
+    # Abfragen
+    # ------------------------------------------------------------------
+
+    def record(self, team: str, opponent: str) -> Dict[str, TeamCounters]:
+        """
+        Bilanz eines Vereins gegen einen Gegner.
+
+        Returns:
+            Dict mit "home", "away" und "total" (aus Sicht von team)
+        """
+        a, b = self.team_id(team), self.team_id(opponent)
+        if a < 0 or b < 0:
+            return {side: TeamCounters() for side in ("home", "away", "total")}
+
+        with self._lock:
+            at_home = self._grid[:, a, b].tolist()
+            away = self._grid[:, b, a].tolist()
+
+        home = TeamCounters(
+            games=at_home[_HOME_WINS] + at_home[_DRAWS] + at_home[_AWAY_WINS],
+            wins=at_home[_HOME_WINS],
+            draws=at_home[_DRAWS],
+            losses=at_home[_AWAY_WINS],
+            goals_for=at_home[_HOME_GOALS],
+            goals_against=at_home[_AWAY_GOALS],
+        )
+        away = TeamCounters(
+            games=away[_HOME_WINS] + away[_DRAWS] + away[_AWAY_WINS],
+            wins=away[_AWAY_WINS],
+            draws=away[_DRAWS],
+            losses=away[_HOME_WINS],
+            goals_for=away[_AWAY_GOALS],
+            goals_against=away[_HOME_GOALS],
+        )
+        total = TeamCounters(
+            **{
+                field: getattr(home, field) + getattr(away, field)
+                for field in TeamCounters.__dataclass_fields__
+            }
+        )
+        return {"home": home, "away": away, "total": total}
+
+    def to_frame(self, team: Optional[str] = None) -> pd.DataFrame:
+        """
+        Alle Paarungen mit mindestens einem Spiel (Spalten HEAD_TO_HEAD_COLUMNS).
+
+        Args:
+            team: Nur die Bilanzen dieses Vereins gegen alle Gegner
+        """
+        with self._lock:
+            home_wins, draws, away_wins, home_goals, away_goals = self._grid.copy()
+            teams = np.asarray(self.teams, dtype=object)
+
+        games = home_wins + draws + away_wins
+        games = games + games.T
+        if team is not None:
+            team_id = self.team_id(team)
+            mask = np.zeros_like(games, dtype=bool)
+            if team_id >= 0:
+                mask[team_id] = games[team_id] > 0
+        else:
+            mask = games > 0
+        rows, cols = np.nonzero(mask)
+
+        wins = (home_wins + away_wins.T)[rows, cols]
+        draw_total = (draws + draws.T)[rows, cols]
+        losses = (away_wins + home_wins.T)[rows, cols]
+        frame = pd.DataFrame(
+            {
+                "Verein": teams[rows] if len(teams) else [],
+                "Gegner": teams[cols] if len(teams) else [],
+                "Spiele": games[rows, cols],
+                "S": wins,
+                "U": draw_total,
+                "N": losses,
+                "Tore": (home_goals + away_goals.T)[rows, cols],
+                "Gegentore": (away_goals + home_goals.T)[rows, cols],
+                "Heim S": home_wins[rows, cols],
+                "Heim U": draws[rows, cols],
+                "Heim N": away_wins[rows, cols],
+                "Auswärts S": away_wins[cols, rows],
+                "Auswärts U": draws[cols, rows],
+                "Auswärts N": home_wins[cols, rows],
+            },
+            columns=HEAD_TO_HEAD_COLUMNS,
+        )
+        return frame.sort_values(
+            ["Verein", "Spiele", "Gegner"], ascending=[True, False, True]
+        ).reset_index(drop=True)
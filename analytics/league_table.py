@@ -0,0 +1,303 @@
+"""
+LeagueTable - Bundesliga-Tabellen nach jedem Spieltag
+
+Berechnet aus MatchColumns die komplette Tabelle aller Saisons nach jedem
+Spieltag in wenigen vektorisierten Schritten:
+
+1. Jedes Spiel wird in zwei Team-Zeilen zerlegt (Heim- und Auswärtssicht).
+2. Punkte, Tore und Bilanz werden per np.bincount in ein Raster
+   (Saison × Verein) × Spieltag einsortiert und per cumsum aufsummiert.
+3. Ein einziges np.lexsort ordnet alle Zellen nach Saison, Spieltag und den
+   Tabellenkriterien der jeweiligen Epoche.
+
+Regeln je Epoche:
+    - bis 1994-95 zwei Punkte pro Sieg, ab 1995-96 drei
+    - bis 1968-69 entscheidet bei Punktgleichheit der Torquotient,
+      ab 1969-70 die Tordifferenz
+    - danach die Anzahl erzielter Tore, zuletzt der Vereinsname
+
+Spiele ohne Spieltag werden pro Verein in zeitlicher Reihenfolge gezählt
+(n-tes Saisonspiel = n-ter Spieltag).
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from models.columnar import MatchColumns, season_start_year
+
+# Erste Saison (Startjahr) mit drei Punkten pro Sieg
+THREE_POINTS_FROM = 1995
+
+# Erste Saison (Startjahr) mit Tordifferenz statt Torquotient
+GOAL_DIFFERENCE_FROM = 1969
+
+TABLE_COLUMNS = [
+    "Platz",
+    "Verein",
+    "Spiele",
+    "S",
+    "U",
+    "N",
+    "Tore",
+    "Gegentore",
+    "Diff",
+    "Punkte",
+]
+
+# Reihenfolge der aufsummierten Werte im Raster
+_STATS = ("played", "wins", "draws", "losses", "goals_for", "goals_against", "points")
+
+# Wertebereich des Epochen-Kriteriums im Sortierschlüssel (24 Bit)
+_SECOND_MAX = (1 << 24) - 1
+
+
+def points_for_win(season_year: int) -> int:
+    """Punkte für einen Sieg in der Saison mit diesem Startjahr."""
+    return 2 if 0 < season_year < THREE_POINTS_FROM else 3
+
+
+def uses_goal_quotient(season_year: int) -> bool:
+    """True, wenn bei Punktgleichheit der Torquotient entscheidet."""
+    return 0 < season_year < GOAL_DIFFERENCE_FROM
+
+
+def season_game_numbers(
+    season: np.ndarray, team: np.ndarray, date_key: np.ndarray
+) -> np.ndarray:
+    """Laufende Nummer jedes Spiels eines Vereins innerhalb der Saison."""
+    order = np.lexsort((np.arange(len(season)), date_key, team, season))
+    sorted_season, sorted_team = season[order], team[order]
+    new_group = np.r_[
+        True,
+        (sorted_season[1:] != sorted_season[:-1])
+        | (sorted_team[1:] != sorted_team[:-1]),
+    ]
+    starts = np.flatnonzero(new_group)
+    group_start = np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    numbers = np.empty(len(order), dtype=np.int64)
+    numbers[order] = np.arange(len(order)) - group_start + 1
+    return numbers
+
+
+class LeagueTable:
+    """
+    Tabellen aller Saisons nach jedem Spieltag.
+
+    Die Ergebnisse liegen als flache Arrays vor, sortiert nach Saison,
+    Spieltag und Platz. Eine einzelne Tabelle ist damit nur ein Slice.
+    """
+
+    def __init__(self, columns: MatchColumns):
+        self.teams = list(columns.teams)
+        self.seasons = list(columns.seasons)
+        self._compute(columns)
+
+    # ------------------------------------------------------------------
+    # Berechnung
+    # ------------------------------------------------------------------
+
+    def _compute(self, columns: MatchColumns):
+        n_teams = max(len(self.teams), 1)
+        season_years = [season_start_year(season) for season in self.seasons]
+
+        # Team-Zeilen: erst alle Heim-, dann alle Auswärtssichten
+        season = np.tile(np.asarray(columns.season_id, dtype=np.int64), 2)
+        team = np.concatenate(
+            [np.asarray(columns.home_id), np.asarray(columns.away_id)]
+        ).astype(np.int64)
+        home_score = np.asarray(columns.home_score, dtype=np.int64)
+        away_score = np.asarray(columns.away_score, dtype=np.int64)
+        goals_for = np.concatenate([home_score, away_score])
+        goals_against = np.concatenate([away_score, home_score])
+        matchday = np.tile(np.asarray(columns.matchday, dtype=np.int64), 2)
+
+        if (matchday <= 0).any():
+            matchday = np.where(
+                matchday > 0,
+                matchday,
+                season_game_numbers(
+                    season, team, np.tile(np.asarray(columns.date_key), 2)
+                ),
+            )
+
+        # (Saison, Verein)-Paare über eine direkte Nachschlagetabelle
+        pair_of = np.full(len(self.seasons) * n_teams, -1, dtype=np.int64)
+        pair_of[season * n_teams + team] = 0
+        pair_keys = np.flatnonzero(pair_of == 0)
+        pair_of[pair_keys] = np.arange(len(pair_keys))
+        pair = pair_of[season * n_teams + team]
+        pair_season = pair_keys // n_teams
+        pair_team = pair_keys % n_teams
+
+        n_matchdays = int(matchday.max()) if len(matchday) else 0
+        season_matchdays = np.zeros(len(self.seasons), dtype=np.int64)
+        np.maximum.at(season_matchdays, season, matchday)
+        self._season_matchdays = season_matchdays
+
+        # Raster Paar × Spieltag, kumuliert über die Spieltage
+        cell = pair * n_matchdays + (matchday - 1)
+        size = len(pair_keys) * n_matchdays
+        values = {
+            "played": None,
+            "wins": goals_for > goals_against,
+            "draws": goals_for == goals_against,
+            "goals_for": goals_for,
+            "goals_against": goals_against,
+        }
+        stats = {
+            name: np.bincount(cell, weights=value, minlength=size)
+            .reshape(len(pair_keys), n_matchdays)
+            .cumsum(axis=1)
+            .astype(np.int32)
+            for name, value in values.items()
+        }
+        stats["losses"] = stats["played"] - stats["wins"] - stats["draws"]
+        win_points = np.array(
+            [points_for_win(year) for year in season_years], dtype=np.int32
+        )
+        stats["points"] = (
+            stats["wins"] * win_points[pair_season][:, None] + stats["draws"]
+        )
+
+        # Sortierschlüssel je Zelle (Punkte, Epochen-Kriterium, Tore, Name)
+        scored = stats["goals_for"].astype(np.float64)
+        conceded = stats["goals_against"].astype(np.float64)
+        quotient = np.divide(
+            scored,
+            conceded,
+            out=np.where(scored > 0, np.inf, 1.0),
+            where=conceded > 0,
+        )
+        quotient_era = np.array(
+            [uses_goal_quotient(year) for year in season_years], dtype=bool
+        )
+        # Quotienten auf 1e-5 gerundet: verschiedene Brüche mit Nennern bis
+        # ~300 bleiben unterscheidbar, gleiche (z.B. 2:1 und 4:2) gleich
+        second = np.where(
+            quotient_era[pair_season][:, None],
+            np.minimum(np.round(quotient * 1e5), _SECOND_MAX),
+            scored - conceded + (1 << 23),
+        ).astype(np.int64)
+
+        name_rank = np.empty(len(self.teams), dtype=np.int64)
+        name_rank[np.argsort(np.asarray(self.teams, dtype=object), kind="stable")] = (
+            np.arange(len(self.teams))
+        )
+        key = (
+            ((511 - np.minimum(stats["points"], 511).astype(np.int64)) << 43)
+            | ((_SECOND_MAX - second) << 19)
+            | ((511 - np.minimum(stats["goals_for"], 511).astype(np.int64)) << 10)
+            | np.minimum(name_rank[pair_team], 1023)[:, None]
+        )
+
+        # Raster Saison × Spieltag × Verein (aufgefüllt); jede Tabelle wird
+        # dann nur entlang der kurzen Vereinsachse sortiert
+        season_start = np.searchsorted(pair_season, np.arange(len(self.seasons)))
+        slot = np.arange(len(pair_keys)) - season_start[pair_season]
+        n_slots = int(slot.max()) + 1 if len(slot) else 0
+        shape = (len(self.seasons), n_matchdays, n_slots)
+
+        key_grid = np.full(shape, np.iinfo(np.int64).max, dtype=np.int64)
+        cell_grid = np.full(shape, -1, dtype=np.int64)
+        key_grid[pair_season[:, None], np.arange(n_matchdays), slot[:, None]] = key
+        cell_grid[pair_season[:, None], np.arange(n_matchdays), slot[:, None]] = (
+            np.arange(len(pair_keys) * n_matchdays).reshape(len(pair_keys), n_matchdays)
+        )
+        cells = np.take_along_axis(cell_grid, np.argsort(key_grid, axis=-1), axis=-1)
+
+        season_grid, matchday_grid, rank_grid = np.indices(shape)
+        valid = (cells >= 0) & (matchday_grid < season_matchdays[:, None, None])
+        cells = cells[valid]
+
+        self.season_id = season_grid[valid]
+        self.matchday = matchday_grid[valid] + 1
+        self.rank = (rank_grid[valid] + 1).astype(np.int16)
+        self.team_id = pair_team[cells // max(n_matchdays, 1)]
+        for name in _STATS:
+            setattr(self, name, stats[name].ravel()[cells])
+
+        # Schlüssel für die Suche einzelner Tabellen (sortiert)
+        self._group_stride = n_matchdays + 1
+        self._group_keys = self.season_id * self._group_stride + self.matchday
+
+    # ------------------------------------------------------------------
+    # Abfragen
+    # ------------------------------------------------------------------
+
+    def matchdays(self, season: str) -> int:
+        """Anzahl Spieltage einer Saison (0, falls unbekannt)."""
+        if season not in self.seasons:
+            return 0
+        return int(self._season_matchdays[self.seasons.index(season)])
+
+    def _rows(self, season_id: int, matchday: int) -> slice:
+        key = season_id * self._group_stride + matchday
+        start = np.searchsorted(self._group_keys, key, side="left")
+        stop = np.searchsorted(self._group_keys, key, side="right")
+        return slice(int(start), int(stop))
+
+    def standings(self, season: str, matchday: Optional[int] = None) -> pd.DataFrame:
+        """
+        Tabelle einer Saison nach einem Spieltag.
+
+        Args:
+            season: Saison wie in den Spieldaten (z.B. "2024-25")
+            matchday: Spieltag (Standard: letzter vorhandener Spieltag)
+
+        Returns:
+            DataFrame mit den Spalten aus TABLE_COLUMNS
+        """
+        last = self.matchdays(season)
+        if not last:
+            return pd.DataFrame(columns=TABLE_COLUMNS)
+        matchday = last if matchday is None else min(max(matchday, 1), last)
+        return self._frame(self._rows(self.seasons.index(season), matchday))
+
+    def final_standings(self) -> pd.DataFrame:
+        """Abschlusstabellen aller Saisons (mit Spalte "Saison"), z.B. für Exporte."""
+        frames = []
+        for season_id, season in enumerate(self.seasons):
+            last = int(self._season_matchdays[season_id])
+            if last:
+                frame = self._frame(self._rows(season_id, last))
+                frame.insert(0, "Saison", season)
+                frames.append(frame)
+        if not frames:
+            return pd.DataFrame(columns=["Saison"] + TABLE_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+    def team_positions(self, team: str) -> pd.DataFrame:
+        """Platz und Punkte eines Vereins nach jedem Spieltag aller Saisons."""
+        if team not in self.teams:
+            return pd.DataFrame(columns=["Saison", "Spieltag", "Platz", "Punkte"])
+        rows = np.flatnonzero(self.team_id == self.teams.index(team))
+        seasons = np.asarray(self.seasons, dtype=object)
+        return pd.DataFrame(
+            {
+                "Saison": seasons[self.season_id[rows]],
+                "Spieltag": self.matchday[rows],
+                "Platz": self.rank[rows],
+                "Punkte": self.points[rows],
+            }
+        )
+
+    def _frame(self, rows) -> pd.DataFrame:
+        teams = np.asarray(self.teams, dtype=object)
+        goals_for = self.goals_for[rows]
+        goals_against = self.goals_against[rows]
+        return pd.DataFrame(
+            {
+                "Platz": self.rank[rows],
+                "Verein": teams[self.team_id[rows]],
+                "Spiele": self.played[rows],
+                "S": self.wins[rows],
+                "U": self.draws[rows],
+                "N": self.losses[rows],
+                "Tore": goals_for,
+                "Gegentore": goals_against,
+                "Diff": goals_for - goals_against,
+                "Punkte": self.points[rows],
+            }
+        )
@@ -0,0 +1,117 @@
+"""
+MatchQuery - Indizierte Filter über das komplette Spielarchiv
+
+Die Indizes werden einmal pro MatchColumns aufgebaut:
+
+    Saison   -> zusammenhängender Zeilenbereich (die Zeilen sind nach Saison
+                sortiert, ein searchsorted genügt)
+    Verein   -> sortierte Zeilennummern aller Heim- und Auswärtsspiele
+    Tore     -> Zeilen sortiert nach Gesamttoren (Min.-Tore per searchsorted)
+
+Kombinierte Filter werden als Schnittmenge der Zeilenmengen beantwortet,
+beginnend mit der kleinsten. Ergebnis sind Zeilennummern in chronologischer
+Reihenfolge, die direkt an MatchColumns.to_dataframe gehen.
+"""
+
+from typing import List, Optional
+
+import numpy as np
+
+from models.columnar import MatchColumns
+
+# Wert der Auswahlfelder für "kein Filter"
+ALL = "Alle"
+
+
+class MatchQuery:
+    """Vorberechnete Indizes für Saison-, Vereins- und Tore-Filter."""
+
+    def __init__(self, columns: MatchColumns):
+        self.columns = columns
+        n_rows = len(columns)
+
+        season_id = np.asarray(columns.season_id)
+        self._season_bounds = np.searchsorted(
+            season_id, np.arange(len(columns.seasons) + 1)
+        )
+
+        rows = np.arange(n_rows, dtype=np.int64)
+        team_rows = np.concatenate([rows, rows])
+        team_ids = np.concatenate(
+            [np.asarray(columns.home_id), np.asarray(columns.away_id)]
+        )
+        # Nach Verein und innerhalb eines Vereins nach Zeile sortieren
+        order = np.argsort(team_ids.astype(np.int64) * max(n_rows, 1) + team_rows)
+        self._team_rows = team_rows[order]
+        self._team_bounds = np.searchsorted(
+            team_ids[order], np.arange(len(columns.teams) + 1)
+        )
+
+        total_goals = np.asarray(columns.total_goals)
+        self._goal_order = np.argsort(total_goals, kind="stable")
+        self._sorted_goals = total_goals[self._goal_order]
+        self._total_goals = total_goals
+
+    def season_rows(self, season: str) -> np.ndarray:
+        """Zeilen einer Saison."""
+        season_id = self.columns.season_id_of(season)
+        if season_id < 0:
+            return np.empty(0, dtype=np.int64)
+        return np.arange(
+            self._season_bounds[season_id], self._season_bounds[season_id + 1]
+        )
+
+    def team_rows(self, team: str) -> np.ndarray:
+        """Zeilen aller Spiele eines Vereins (aufsteigend)."""
+        team_id = self.columns.team_id(team)
+        if team_id < 0:
+            return np.empty(0, dtype=np.int64)
+        return self._team_rows[
+            self._team_bounds[team_id] : self._team_bounds[team_id + 1]
+        ]
+
+    def min_goals_rows(self, min_goals: int) -> np.ndarray:
+        """Zeilen aller Spiele mit mindestens min_goals Toren (aufsteigend)."""
+        start = np.searchsorted(self._sorted_goals, min_goals, side="left")
+        return np.sort(self._goal_order[start:])
+
+    def filter(
+        self,
+        season: Optional[str] = None,
+        team: Optional[str] = None,
+        min_goals: int = 0,
+    ) -> np.ndarray:
+        """
+        Kombinierter Filter.
+
+        Args:
+            season: Saison oder None/"Alle"
+            team: Verein oder None/"Alle"
+            min_goals: Mindestanzahl Tore (0 = kein Filter)
+
+        Returns:
+            Zeilennummern der passenden Spiele in chronologischer Reihenfolge
+        """
+        candidates: List[np.ndarray] = []
+        if season and season != ALL:
+            candidates.append(self.season_rows(season))
+        if team and team != ALL:
+            candidates.append(self.team_rows(team))
+
+        if not candidates:
+            if min_goals > 0:
+                return self.min_goals_rows(min_goals)
+            return np.arange(len(self.columns))
+
+        # Von der kleinsten Menge ausgehend schneiden (alle sind sortiert)
+        candidates.sort(key=len)
+        rows = candidates[0]
+        for other in candidates[1:]:
+            rows = rows[np.isin(rows, other, assume_unique=True)]
+        if min_goals > 0:
+            rows = rows[self._total_goals[rows] >= min_goals]
+        return rows
+
+    def match_keys(self, rows: np.ndarray) -> List[str]:
+        """Schlüssel der Spiele, z.B. für MatchDatabase.load_games(keys=...)."""
+        return np.asarray(self.columns.match_key)[rows].tolist()
@@ -0,0 +1,348 @@
+"""
+SeasonSimulator - Monte-Carlo-Prognose für den Rest einer Saison
+
+Ausgehend von der aktuellen Tabelle werden die ausstehenden Spiele sehr oft
+(Standard: eine Million Mal) ausgespielt. Die Ergebnisse jedes Spiels werden
+aus seiner Ergebnis-Matrix gezogen (siehe GoalModel), damit auch Tordifferenz
+und erzielte Tore in die Platzierung eingehen.
+
+Ablauf je Batch (komplett in NumPy):
+
+1. Eine Zufallszahl je (Simulation, Spiel); alle Verteilungsfunktionen liegen
+   hintereinander in einem Array (Spiel i im Intervall [i, i + 1]), ein
+   einziges searchsorted liefert damit alle Ergebnisse.
+2. Punkte, Tordifferenz und Tore je Verein per Matrixprodukt mit den
+   Spiel × Verein-Inzidenzmatrizen.
+3. Platzierung per argsort über einen zusammengesetzten Schlüssel
+   (Punkte, Tordifferenz, Tore, Zufall bei völliger Gleichheit).
+
+Die Batches werden auf einen Prozess-Pool verteilt. Jeder Batch erhält einen
+eigenen, aus dem Start-Seed abgeleiteten Zufallsgenerator - das Ergebnis
+hängt damit nur vom Seed ab, nicht von der Anzahl der Prozesse.
+
+Beispiel:
+    fixtures = [(heim, gast) for _, _, heim, gast in remaining]
+    simulator = SeasonSimulator.from_goal_model(standings, fixtures, model.fits[season])
+    result = simulator.run(seed=42)
+    result.to_frame()
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .goal_model import SeasonFit, scoreline_probabilities
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIMULATIONS = 1_000_000
+BATCH_SIZE = 20_000
+
+# Bundesliga: Plätze für den Europapokal, Relegationsplatz, direkte Absteiger
+EUROPEAN_PLACES = 6
+RELEGATION_PLAYOFF = True
+RELEGATED_PLACES = 2
+
+SIMULATION_COLUMNS = [
+    "Verein",
+    "Punkte",
+    "Ø Punkte",
+    "Ø Platz",
+    "Meister (%)",
+    "Europa (%)",
+    "Relegation (%)",
+    "Abstieg (%)",
+]
+
+# Stellen im Sortierschlüssel: Punkte | Tordifferenz + Versatz | Tore
+_DIFF_OFFSET = 2048
+_GOALS_RANGE = 1024
+
+
+@dataclass
+class SimulationResult:
+    """Aufsummierte Platzierungen aller Simulationen."""
+
+    teams: List[str]
+    position_counts: np.ndarray  # (Verein, Platz) -> Anzahl
+    points_total: np.ndarray  # Summe der Endpunkte je Verein
+    current_points: np.ndarray
+    simulations: int
+    elapsed: float
+
+    @property
+    def seasons_per_second(self) -> float:
+        return self.simulations / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def position_probabilities(self) -> np.ndarray:
+        """Wahrscheinlichkeit je (Verein, Platz)."""
+        return self.position_counts / max(self.simulations, 1)
+
+    def to_frame(
+        self,
+        european_places: int = EUROPEAN_PLACES,
+        relegation_playoff: bool = RELEGATION_PLAYOFF,
+        relegated_places: int = RELEGATED_PLACES,
+    ) -> pd.DataFrame:
+        """Titel-, Europapokal- und Abstiegschancen (Spalten SIMULATION_COLUMNS)."""
+        n_teams = len(self.teams)
+        probabilities = self.position_probabilities
+        relegated = probabilities[:, max(n_teams - relegated_places, 0) :].sum(axis=1)
+        playoff_place = n_teams - relegated_places - 1
+        if relegation_playoff and playoff_place >= 0:
+            playoff = probabilities[:, playoff_place]
+        else:
+            playoff = np.zeros(n_teams)
+        places = np.arange(1, n_teams + 1)
+
+        frame = pd.DataFrame(
+            {
+                "Verein": self.teams,
+                "Punkte": self.current_points,
+                "Ø Punkte": (self.points_total / max(self.simulations, 1)).round(1),
+                "Ø Platz": (probabilities @ places).round(2),
+                "Meister (%)": (probabilities[:, 0] * 100).round(2),
+                "Europa (%)": (
+                    probabilities[:, :european_places].sum(axis=1) * 100
+                ).round(2),
+                "Relegation (%)": (playoff * 100).round(2),
+                "Abstieg (%)": (relegated * 100).round(2),
+            },
+            columns=SIMULATION_COLUMNS,
+        )
+        return frame.sort_values(["Ø Platz", "Verein"]).reset_index(drop=True)
+
+
+def _simulate_batch(
+    seed: np.random.SeedSequence,
+    size: int,
+    base: np.ndarray,
+    home_incidence: np.ndarray,
+    away_incidence: np.ndarray,
+    cdf: np.ndarray,
+    max_goals: int,
+    win_points: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Spielt size Saisonenden aus (läuft im Prozess-Pool, daher modulweit).
+
+    Returns:
+        (Platzierungen je (Verein, Platz), Summe der Endpunkte je Verein)
+    """
+    rng = np.random.default_rng(seed)
+    n_fixtures, n_teams = home_incidence.shape
+    cells = (max_goals + 1) ** 2
+
+    # Alle Ergebnisse mit einem searchsorted (Spiel i liegt in [i, i + 1]);
+    # Zeile = Spiel, damit die Suchen eines Spiels im Cache beieinander liegen
+    offsets = np.arange(n_fixtures)[:, None]
+    draws = rng.random((n_fixtures, size)) + offsets
+    outcome = np.searchsorted(cdf, draws, side="right") - offsets * cells
+    np.clip(outcome, 0, cells - 1, out=outcome)
+    home_goals, away_goals = np.divmod(outcome, max_goals + 1)
+
+    draw = (home_goals == away_goals).astype(np.float32)
+    home_points = np.where(home_goals > away_goals, np.float32(win_points), draw)
+    away_points = np.where(away_goals > home_goals, np.float32(win_points), draw)
+    difference = (home_goals - away_goals).astype(np.float32)
+
+    def per_team(home_values, away_values) -> np.ndarray:
+        # (Spiele, Simulationen) -> (Vereine, Simulationen)
+        return home_incidence.T @ home_values.astype(np.float32) + (
+            away_incidence.T @ away_values.astype(np.float32)
+        )
+
+    points = base[0][:, None] + per_team(home_points, away_points)
+    goal_difference = base[1][:, None] + per_team(difference, -difference)
+    goals = base[2][:, None] + per_team(home_goals, away_goals)
+
+    key = (
+        points.astype(np.float64) * (2 * _DIFF_OFFSET)
+        + (goal_difference + _DIFF_OFFSET)
+    ) * _GOALS_RANGE + goals
+    key += rng.random(key.shape)
+    order = np.argsort(-key, axis=0)  # order[platz, s] = Verein
+
+    counts = np.bincount(
+        (order * n_teams + np.arange(n_teams)[:, None]).ravel(),
+        minlength=n_teams * n_teams,
+    ).reshape(n_teams, n_teams)
+    return counts, points.sum(axis=1, dtype=np.float64)
+
+
+class SeasonSimulator:
+    """Monte-Carlo-Simulation der ausstehenden Spiele einer Saison."""
+
+    def __init__(
+        self,
+        standings: pd.DataFrame,
+        fixtures: Sequence[Tuple[str, str]],
+        matrices: np.ndarray,
+        win_points: int = 3,
+    ):
+        """
+        Args:
+            standings: Aktuelle Tabelle (Spalten wie TABLE_COLUMNS)
+            fixtures: Ausstehende Spiele als (Heimverein, Gastverein)
+            matrices: Ergebnis-Matrizen je Spiel, Form (Spiele, x, y)
+            win_points: Punkte für einen Sieg (siehe points_for_win)
+
+        Raises:
+            ValueError: Anzahl der Matrizen passt nicht zu den Spielen
+        """
+        matrices = np.asarray(matrices, dtype=np.float64)
+        if not len(fixtures) and matrices.ndim != 3:
+            matrices = np.ones((0, 1, 1))
+        if len(matrices) != len(fixtures):
+            raise ValueError(
+                f"{len(matrices)} Ergebnis-Matrizen für {len(fixtures)} Spiele"
+            )
+
+        self.teams: List[str] = list(standings["Verein"])
+        for pairing in fixtures:
+            for team in pairing:
+                if team not in self.teams:
+                    self.teams.append(team)  # noch ohne Spiel in der Tabelle
+        index = {team: i for i, team in enumerate(self.teams)}
+        n_teams = len(self.teams)
+
+        # Punkte, Tordifferenz, Tore
+        self.base = np.zeros((3, n_teams), dtype=np.float32)
+        rows = [index[team] for team in standings["Verein"]]
+        self.base[0, rows] = standings["Punkte"].to_numpy(dtype=np.float32)
+        self.base[1, rows] = (standings["Tore"] - standings["Gegentore"]).to_numpy(
+            dtype=np.float32
+        )
+        self.base[2, rows] = standings["Tore"].to_numpy(dtype=np.float32)
+
+        home = np.array([index[h] for h, _ in fixtures], dtype=np.int64)
+        away = np.array([index[a] for _, a in fixtures], dtype=np.int64)
+        fixture_rows = np.arange(len(fixtures))
+        self.home_incidence = np.zeros((len(fixtures), n_teams), dtype=np.float32)
+        self.away_incidence = np.zeros((len(fixtures), n_teams), dtype=np.float32)
+        self.home_incidence[fixture_rows, home] = 1
+        self.away_incidence[fixture_rows, away] = 1
+
+        # Normierte Verteilungsfunktionen, Spiel i verschoben um i
+        self.max_goals = matrices.shape[-1] - 1
+        flat = matrices.reshape(len(fixtures), (self.max_goals + 1) ** 2)
+        totals = flat.sum(axis=1, keepdims=True)
+        flat = flat / np.where(totals > 0, totals, 1)
+        cdf = np.cumsum(flat, axis=1)
+        if len(cdf):
+            cdf[:, -1] = 1.0
+        self.cdf = (cdf + fixture_rows[:, None]).ravel()
+        self.win_points = win_points
+        self.fixtures = list(fixtures)
+
+    @classmethod
+    def from_goal_model(
+        cls,
+        standings: pd.DataFrame,
+        fixtures: Sequence[Tuple[str, str]],
+        season_fit: SeasonFit,
+        max_goals: int = 10,
+        win_points: int = 3,
+    ) -> "SeasonSimulator":
+        """
+        Baut die Ergebnis-Matrizen aus einem angepassten Saison-Modell.
+
+        Vereine ohne Spiel in der Saison gehen mit durchschnittlicher Stärke ein.
+        """
+        attack = np.append(season_fit.attack, 0.0)
+        defence = np.append(season_fit.defence, 0.0)
+        unknown = len(season_fit.teams)
+
+        def ids(position: int) -> np.ndarray:
+            found = np.array(
+                [season_fit.team_index(pairing[position]) for pairing in fixtures],
+                dtype=np.int64,
+            )
+            return np.where(found >= 0, found, unknown)
+
+        home, away = ids(0), ids(1)
+        lam = np.exp(
+            season_fit.intercept
+            + season_fit.home_advantage
+            + attack[home]
+            - defence[away]
+        )
+        mu = np.exp(season_fit.intercept + attack[away] - defence[home])
+        matrices = scoreline_probabilities(lam, mu, season_fit.rho, max_goals)
+        return cls(standings, fixtures, matrices, win_points)
+
+    def run(
+        self,
+        simulations: int = DEFAULT_SIMULATIONS,
+        seed: Optional[int] = None,
+        workers: Optional[int] = None,
+        batch_size: int = BATCH_SIZE,
+    ) -> SimulationResult:
+        """
+        Spielt die Saison simulations-mal zu Ende.
+
+        Args:
+            simulations: Anzahl simulierter Saisonenden
+            seed: Start-Seed (gleicher Seed = gleiches Ergebnis)
+            workers: Prozesse (None = CPU-Anzahl, 1 = seriell)
+            batch_size: Simulationen je Batch (begrenzt den Speicherbedarf)
+        """
+        n_teams = len(self.teams)
+        sizes = [batch_size] * (simulations // batch_size)
+        if simulations % batch_size:
+            sizes.append(simulations % batch_size)
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        shared = (
+            self.base,
+            self.home_incidence,
+            self.away_incidence,
+            self.cdf,
+            self.max_goals,
+            self.win_points,
+        )
+
+        started = time.perf_counter()
+        if len(sizes) <= 1 or workers == 1:
+            results = [
+                _simulate_batch(batch_seed, size, *shared)
+                for batch_seed, size in zip(seeds, sizes)
+            ]
+        else:
+            workers = min(workers or os.cpu_count() or 1, len(sizes))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(
+                    executor.map(
+                        _simulate_batch,
+                        seeds,
+                        sizes,
+                        *[[value] * len(sizes) for value in shared],
+                    )
+                )
+        elapsed = time.perf_counter() - started
+
+        position_counts = np.zeros((n_teams, n_teams), dtype=np.int64)
+        points_total = np.zeros(n_teams)
+        for counts, points in results:
+            position_counts += counts
+            points_total += points
+
+        result = SimulationResult(
+            teams=list(self.teams),
+            position_counts=position_counts,
+            points_total=points_total,
+            current_points=self.base[0].astype(np.int64),
+            simulations=simulations,
+            elapsed=elapsed,
+        )
+        logger.info(
+            f"{simulations:,} Saisons mit {len(self.fixtures)} ausstehenden Spielen "
+            f"simuliert ({result.seasons_per_second:,.0f} Saisons/s)"
+        )
+        return result
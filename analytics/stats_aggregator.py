@@ -0,0 +1,241 @@
+"""
+StatsAggregator - Laufende Kennzahlen für Dashboard und Statistik-Seite
+
+Statt bei jeder Aktualisierung alle Spiele neu zu durchlaufen, werden
+Summen und Zähler beim Hinzufügen bzw. Entfernen einzelner Spiele in O(1)
+fortgeschrieben. Jedes Spiel wird über seinen Schlüssel (siehe
+models.columnar.match_key) gemerkt - erneutes Hinzufügen eines bekannten
+Spiels ersetzt dessen alten Beitrag, wie ein Upsert in der Datenbank.
+
+Der Aufbau aus dem Spaltenspeicher (from_columns) erfolgt vektorisiert.
+"""
+
+import threading
+from collections import Counter
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from models.game_data import GameData
+from models.columnar import MatchColumns, match_key
+
+# Ab so vielen Toren gilt ein Spiel als Torspektakel
+HIGH_SCORING_GOALS = 4
+
+# (Saison, Heimteam, Auswärtsteam, Tore Heim, Tore Auswärts)
+_Entry = Tuple[Optional[str], str, str, Optional[int], Optional[int]]
+
+
+@dataclass
+class TeamCounters:
+    """Bilanz eines Vereins über alle erfassten Spiele."""
+
+    games: int = 0
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    goals_for: int = 0
+    goals_against: int = 0
+
+    @property
+    def win_rate(self) -> float:
+        """Siegquote in Prozent."""
+        return self.wins / self.games * 100 if self.games else 0.0
+
+    @property
+    def goals_per_game(self) -> float:
+        return self.goals_for / self.games if self.games else 0.0
+
+
+class StatsAggregator:
+    """Fortlaufend aktualisierte Kennzahlen über alle erfassten Spiele."""
+
+    def __init__(self, games: Iterable[GameData] = ()):
+        self._lock = threading.Lock()
+        self.clear()
+        for game in games:
+            self.add(game)
+
+    def clear(self):
+        """Setzt alle Zähler zurück."""
+        with self._lock:
+            self._entries: Dict[str, _Entry] = {}
+            self._seasons: Counter = Counter()
+            self._teams: Dict[str, TeamCounters] = {}
+            self.total_games = 0
+            self.total_goals = 0
+            self.draws = 0
+            self.high_scoring = 0
+
+    # ------------------------------------------------------------------
+    # Fortschreiben
+    # ------------------------------------------------------------------
+
+    def add(self, game: GameData):
+        """Nimmt ein Spiel auf (ersetzt ein bereits bekanntes mit gleichem Schlüssel)."""
+        entry = (
+            game.season,
+            game.home_team.name,
+            game.away_team.name,
+            game.home_score,
+            game.away_score,
+        )
+        key = match_key(game)
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous == entry:
+                return
+            if previous is not None:
+                self._apply(previous, -1)
+            self._entries[key] = entry
+            self._apply(entry, 1)
+
+    def remove(self, game: GameData) -> bool:
+        """Entfernt ein Spiel. Gibt False zurück, wenn es nicht erfasst war."""
+        with self._lock:
+            previous = self._entries.pop(match_key(game), None)
+            if previous is None:
+                return False
+            self._apply(previous, -1)
+            return True
+
+    def _apply(self, entry: _Entry, sign: int):
+        season, home, away, home_score, away_score = entry
+        self.total_games += sign
+        if season:
+            self._seasons[season] += sign
+            if not self._seasons[season]:
+                del self._seasons[season]
+
+        scored = home_score is not None and away_score is not None
+        if scored:
+            goals = home_score + away_score
+            self.total_goals += sign * goals
+            self.draws += sign * (home_score == away_score)
+            self.high_scoring += sign * (goals >= HIGH_SCORING_GOALS)
+
+        for team, goals_for, goals_against in (
+            (home, home_score, away_score),
+            (away, away_score, home_score),
+        ):
+            counters = self._teams.setdefault(team, TeamCounters())
+            counters.games += sign
+            if scored:
+                counters.goals_for += sign * goals_for
+                counters.goals_against += sign * goals_against
+                counters.wins += sign * (goals_for > goals_against)
+                counters.draws += sign * (goals_for == goals_against)
+                counters.losses += sign * (goals_for < goals_against)
+            if not counters.games:
+                del self._teams[team]
+
+    # ------------------------------------------------------------------
+    # Aufbau aus dem Spaltenspeicher
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_columns(cls, columns: MatchColumns) -> "StatsAggregator":
+        """Baut die Zähler vektorisiert aus MatchColumns auf."""
+        aggregator = cls()
+        if columns is None or not len(columns):
+            return aggregator
+
+        season_id = np.asarray(columns.season_id)
+        home_id = np.asarray(columns.home_id)
+        away_id = np.asarray(columns.away_id)
+        home_score = np.asarray(columns.home_score, dtype=np.int64)
+        away_score = np.asarray(columns.away_score, dtype=np.int64)
+        goals = home_score + away_score
+
+        aggregator.total_games = len(columns)
+        aggregator.total_goals = int(goals.sum())
+        aggregator.draws = int((home_score == away_score).sum())
+        aggregator.high_scoring = int((goals >= HIGH_SCORING_GOALS).sum())
+
+        season_counts = np.bincount(season_id, minlength=len(columns.seasons))
+        aggregator._seasons = Counter(
+            {
+                season: int(count)
+                for season, count in zip(columns.seasons, season_counts)
+                if season and count
+            }
+        )
+
+        n_teams = len(columns.teams)
+        team = np.concatenate([home_id, away_id])
+        goals_for = np.concatenate([home_score, away_score])
+        goals_against = np.concatenate([away_score, home_score])
+
+        def per_team(weights=None) -> np.ndarray:
+            return np.bincount(team, weights=weights, minlength=n_teams).astype(
+                np.int64
+            )
+
+        games = per_team()
+        wins = per_team(goals_for > goals_against)
+        draws = per_team(goals_for == goals_against)
+        scored = per_team(goals_for)
+        conceded = per_team(goals_against)
+        aggregator._teams = {
+            name: TeamCounters(
+                games=int(games[i]),
+                wins=int(wins[i]),
+                draws=int(draws[i]),
+                losses=int(games[i] - wins[i] - draws[i]),
+                goals_for=int(scored[i]),
+                goals_against=int(conceded[i]),
+            )
+            for i, name in enumerate(columns.teams)
+            if games[i]
+        }
+
+        seasons = np.asarray(columns.seasons, dtype=object)
+        teams = np.asarray(columns.teams, dtype=object)
+        aggregator._entries = dict(
+            zip(
+                np.asarray(columns.match_key).tolist(),
+                zip(
+                    seasons[season_id].tolist(),
+                    teams[home_id].tolist(),
+                    teams[away_id].tolist(),
+                    home_score.tolist(),
+                    away_score.tolist(),
+                ),
+            )
+        )
+        return aggregator
+
+    # ------------------------------------------------------------------
+    # Abfragen
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self.total_games
+
+    @property
+    def season_count(self) -> int:
+        return len(self._seasons)
+
+    @property
+    def team_count(self) -> int:
+        return len(self._teams)
+
+    @property
+    def average_goals(self) -> float:
+        return self.total_goals / self.total_games if self.total_games else 0.0
+
+    def season_names(self) -> List[str]:
+        """Alle Saisons, sortiert."""
+        with self._lock:
+            return sorted(self._seasons)
+
+    def team_names(self) -> List[str]:
+        """Alle Vereine, sortiert."""
+        with self._lock:
+            return sorted(self._teams)
+
+    def team_counters(self) -> Dict[str, TeamCounters]:
+        """Kopie der Bilanzen aller Vereine."""
+        with self._lock:
+            return {name: replace(counters) for name, counters in self._teams.items()}
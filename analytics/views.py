@@ -0,0 +1,288 @@
+"""
+MaterializedViews - Zwischengespeicherte Kennzahl-Tabellen für die GUIs
+
+Jede Sicht (View) wird pro Saison als Teilergebnis berechnet und gemerkt.
+Die Teilergebnisse enthalten nur summierbare Zähler; das Gesamtergebnis
+entsteht durch Aufsummieren und einen abschließenden Formatierungsschritt.
+
+Jede Sicht kennt so die Saisons, von denen sie abhängt. Werden neue Spiele
+übernommen, sind nur deren Saisons veraltet - beim nächsten Zugriff werden
+genau diese Teilergebnisse neu berechnet, alle anderen bleiben erhalten.
+
+Beispiel:
+    views = MaterializedViews(columns)
+    views.get("team_summary")             # berechnet alle Saisons
+    views.update(new_columns, {"2024/25"})
+    views.get("team_summary")             # berechnet nur 2024/25 neu
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+from models.columnar import MatchColumns
+from .goal_timing import (
+    era_timing_partial,
+    finalize_timing,
+    season_timing_partial,
+    team_timing_partial,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ViewDefinition:
+    """
+    Beschreibung einer Sicht.
+
+    partial: (Spalten, Spielzeilen, Torzeilen) -> summierbares Teilergebnis
+             einer Saison, indiziert über den Gruppierungsschlüssel
+    finalize: Summe aller Teilergebnisse -> fertige Anzeige-Tabelle
+    """
+
+    partial: Callable[[MatchColumns, slice, slice], pd.DataFrame]
+    finalize: Callable[[pd.DataFrame], pd.DataFrame]
+
+
+# ---------------------------------------------------------------------------
+# Standard-Sichten
+# ---------------------------------------------------------------------------
+
+
+def _team_partial(columns: MatchColumns, rows: slice, goals: slice) -> pd.DataFrame:
+    home_score = np.asarray(columns.home_score[rows], dtype=np.int64)
+    away_score = np.asarray(columns.away_score[rows], dtype=np.int64)
+    teams = np.asarray(columns.teams, dtype=object)
+    team = np.concatenate([columns.home_id[rows], columns.away_id[rows]])
+    goals_for = np.concatenate([home_score, away_score])
+    goals_against = np.concatenate([away_score, home_score])
+
+    frame = pd.DataFrame(
+        {
+            "Verein": teams[team] if len(teams) else [],
+            "Spiele": 1,
+            "Siege": (goals_for > goals_against).astype(np.int64),
+            "Unentschieden": (goals_for == goals_against).astype(np.int64),
+            "Niederlagen": (goals_for < goals_against).astype(np.int64),
+            "Tore": goals_for,
+            "Gegentore": goals_against,
+        }
+    )
+    return frame.groupby("Verein").sum()
+
+
+def _team_finalize(frame: pd.DataFrame) -> pd.DataFrame:
+    frame = frame.reset_index()
+    frame["Siegquote (%)"] = (frame["Siege"] / frame["Spiele"] * 100).round(1)
+    frame["Ø Tore/Spiel"] = (frame["Tore"] / frame["Spiele"]).round(2)
+    return frame.sort_values(["Siege", "Spiele"], ascending=False).reset_index(
+        drop=True
+    )
+
+
+def _season_partial(columns: MatchColumns, rows: slice, goals: slice) -> pd.DataFrame:
+    home_score = np.asarray(columns.home_score[rows], dtype=np.int64)
+    away_score = np.asarray(columns.away_score[rows], dtype=np.int64)
+    season = columns.seasons[int(columns.season_id[rows.start])]
+    return pd.DataFrame(
+        {
+            "Spiele": [len(home_score)],
+            "Tore": [int((home_score + away_score).sum())],
+            "Heimsiege": [int((home_score > away_score).sum())],
+            "Unentschieden": [int((home_score == away_score).sum())],
+            "Auswärtssiege": [int((home_score < away_score).sum())],
+        },
+        index=pd.Index([season], name="Saison"),
+    )
+
+
+def _season_finalize(frame: pd.DataFrame) -> pd.DataFrame:
+    frame = frame.reset_index()
+    frame["Ø Tore/Spiel"] = (frame["Tore"] / frame["Spiele"]).round(2)
+    frame["Heimsiege (%)"] = (frame["Heimsiege"] / frame["Spiele"] * 100).round(1)
+    return frame.sort_values("Saison").reset_index(drop=True)
+
+
+def _scorer_partial(columns: MatchColumns, rows: slice, goals: slice) -> pd.DataFrame:
+    own_goal = np.asarray(columns.goal_own_goal[goals], dtype=bool)
+    scorer = np.asarray(columns.goal_scorer_id[goals])[~own_goal]
+    penalty = np.asarray(columns.goal_penalty[goals], dtype=bool)[~own_goal]
+    players = np.asarray(columns.players, dtype=object)
+
+    frame = pd.DataFrame(
+        {
+            "Spieler": players[scorer] if len(players) else [],
+            "Tore": 1,
+            "Elfmeter": penalty.astype(np.int64),
+        }
+    )
+    frame = frame[frame["Spieler"] != ""]
+    return frame.groupby("Spieler").sum()
+
+
+def _scorer_finalize(frame: pd.DataFrame) -> pd.DataFrame:
+    frame = frame.reset_index()
+    return frame.sort_values(["Tore", "Spieler"], ascending=[False, True]).reset_index(
+        drop=True
+    )
+
+
+def _scoreline_partial(
+    columns: MatchColumns, rows: slice, goals: slice
+) -> pd.DataFrame:
+    home_score = np.asarray(columns.home_score[rows])
+    away_score = np.asarray(columns.away_score[rows])
+    frame = pd.DataFrame(
+        {
+            "Ergebnis": [f"{h}:{a}" for h, a in zip(home_score, away_score)],
+            "Anzahl": 1,
+        }
+    )
+    return frame.groupby("Ergebnis").sum()
+
+
+def _scoreline_finalize(frame: pd.DataFrame) -> pd.DataFrame:
+    frame = frame.reset_index()
+    frame["Anteil (%)"] = (frame["Anzahl"] / frame["Anzahl"].sum() * 100).round(1)
+    return frame.sort_values(
+        ["Anzahl", "Ergebnis"], ascending=[False, True]
+    ).reset_index(drop=True)
+
+
+DEFAULT_VIEWS: Dict[str, ViewDefinition] = {
+    "team_summary": ViewDefinition(_team_partial, _team_finalize),
+    "season_summary": ViewDefinition(_season_partial, _season_finalize),
+    "scorer_table": ViewDefinition(_scorer_partial, _scorer_finalize),
+    "scoreline_distribution": ViewDefinition(_scoreline_partial, _scoreline_finalize),
+    "goal_timing_team": ViewDefinition(team_timing_partial, finalize_timing),
+    "goal_timing_season": ViewDefinition(season_timing_partial, finalize_timing),
+    "goal_timing_era": ViewDefinition(era_timing_partial, finalize_timing),
+}
+
+
+# ---------------------------------------------------------------------------
+# Verwaltung
+# ---------------------------------------------------------------------------
+
+
+class MaterializedViews:
+    """Benannte Sichten mit saisonweiser Abhängigkeitsverfolgung."""
+
+    def __init__(
+        self,
+        columns: Optional[MatchColumns] = None,
+        views: Optional[Dict[str, ViewDefinition]] = None,
+    ):
+        self._lock = threading.RLock()
+        self._definitions: Dict[str, ViewDefinition] = dict(views or DEFAULT_VIEWS)
+        self._columns: Optional[MatchColumns] = None
+        # Sicht -> Saison -> Teilergebnis
+        self._partitions: Dict[str, Dict[str, pd.DataFrame]] = {}
+        # Sicht -> veraltete Saisons (None = alle)
+        self._stale: Dict[str, Optional[Set[str]]] = {}
+        self._results: Dict[str, pd.DataFrame] = {}
+        self.update(columns)
+
+    def register(self, name: str, definition: ViewDefinition):
+        """Fügt eine Sicht hinzu (oder ersetzt eine vorhandene)."""
+        with self._lock:
+            self._definitions[name] = definition
+            self._partitions.pop(name, None)
+            self._results.pop(name, None)
+            self._stale[name] = None
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._definitions)
+
+    def update(
+        self, columns: Optional[MatchColumns], seasons: Optional[Iterable[str]] = None
+    ):
+        """
+        Übernimmt neue Spalten und markiert geänderte Saisons als veraltet.
+
+        Args:
+            columns: Aktueller Spaltenspeicher
+            seasons: Saisons mit neuen oder geänderten Spielen (None = alle)
+        """
+        with self._lock:
+            self._columns = columns
+            for name in self._definitions:
+                if name in self._stale and self._stale[name] is None:
+                    continue  # ohnehin komplett neu zu berechnen
+                if seasons is None:
+                    self._stale[name] = None
+                else:
+                    self._stale.setdefault(name, set()).update(seasons)
+
+    def depends_on(self, name: str) -> List[str]:
+        """Saisons, aus denen die (zuletzt berechnete) Sicht besteht."""
+        with self._lock:
+            return sorted(self._partitions.get(name, {}))
+
+    def get(self, name: str) -> pd.DataFrame:
+        """
+        Ergebnis einer Sicht; veraltete Saisons werden vorher neu berechnet.
+
+        Raises:
+            KeyError: Unbekannte Sicht
+        """
+        with self._lock:
+            definition = self._definitions[name]
+            if name not in self._stale and name in self._results:
+                return self._results[name]
+            self._refresh(name, definition)
+            return self._results[name]
+
+    def _season_ranges(self) -> Dict[str, tuple]:
+        """Saison -> (Spielzeilen, Torzeilen) im aktuellen Spaltenspeicher."""
+        columns = self._columns
+        if columns is None or not len(columns):
+            return {}
+
+        season_id = np.asarray(columns.season_id)
+        bounds = np.searchsorted(season_id, np.arange(len(columns.seasons) + 1))
+        goal_bounds = np.searchsorted(np.asarray(columns.goal_match), bounds)
+        return {
+            season: (
+                slice(int(bounds[i]), int(bounds[i + 1])),
+                slice(int(goal_bounds[i]), int(goal_bounds[i + 1])),
+            )
+            for i, season in enumerate(columns.seasons)
+            if bounds[i + 1] > bounds[i]
+        }
+
+    def _refresh(self, name: str, definition: ViewDefinition):
+        stale = self._stale.pop(name, None)
+        ranges = self._season_ranges()
+        partitions = self._partitions.setdefault(name, {})
+
+        # Saisons, die nicht mehr existieren, fallen weg
+        for season in set(partitions) - set(ranges):
+            del partitions[season]
+
+        to_compute = [
+            season
+            for season in ranges
+            if stale is None or season in stale or season not in partitions
+        ]
+        for season in to_compute:
+            rows, goals = ranges[season]
+            partitions[season] = definition.partial(self._columns, rows, goals)
+
+        if partitions:
+            combined = pd.concat(list(partitions.values()))
+            combined = combined.groupby(level=0).sum()
+        else:
+            combined = pd.DataFrame()
+        self._results[name] = (
+            definition.finalize(combined) if len(combined) else combined
+        )
+        logger.debug(
+            f"Sicht '{name}': {len(to_compute)} von {len(ranges)} Saisons neu berechnet"
+        )
@@ -30,7 +30,7 @@ set DIST_DIR=dist
 set SPEC_FILE=%PROJECT_NAME%.spec
 set MAIN_FILE=main.py
 set ICON_FILE=assets\icon.ico
-set DATA_FILES=config;gui;scrapers;exporters;models;assets
+set DATA_FILES=config;gui;scrapers;exporters;models;storage;analytics;assets
 
 REM Prüfe ob Python verfügbar ist
 echo 🔍 Prüfe Python-Installation...
@@ -125,6 +125,8 @@ if not exist "gui" set MISSING_DIRS=!MISSING_DIRS! gui
 if not exist "scrapers" set MISSING_DIRS=!MISSING_DIRS! scrapers
 if not exist "exporters" set MISSING_DIRS=!MISSING_DIRS! exporters
 if not exist "models" set MISSING_DIRS=!MISSING_DIRS! models
+if not exist "storage" set MISSING_DIRS=!MISSING_DIRS! storage
+if not exist "analytics" set MISSING_DIRS=!MISSING_DIRS! analytics
 
 if not "!MISSING_DIRS!"=="" (
     echo ❌ Fehlende Verzeichnisse: !MISSING_DIRS!
@@ -217,6 +219,8 @@ echo     ('gui', 'gui'^),
 echo     ('scrapers', 'scrapers'^),
 echo     ('exporters', 'exporters'^),
 echo     ('models', 'models'^),
+echo     ('storage', 'storage'^),
+echo     ('analytics', 'analytics'^),
 echo     ('config', 'config'^),
 echo ]
 echo.
@@ -243,8 +247,15 @@ echo     'scrapers.kicker_scraper',
 echo     'scrapers.improved_kicker_scraper',
 echo     'exporters.excel_exporter_new',
 echo     'exporters.merge_service',
+echo     'exporters.parquet_exporter', 'exporters.base_exporter', 'exporters.stream_exporters', 'exporters.export_formats', 'exporters.backup_manager', 'exporters.export_cache',
+echo     'models.columnar',
+echo     'pyarrow',
 echo     'models.game_data',
 echo     'models.extended_data',
+echo     'models.serialization',
+echo     'storage.match_database', 'storage.columnar_store', 'storage.html_archive', 'scrapers.archive_reparser', 'zstandard', 'analytics.league_table', 'analytics.stats_aggregator', 'analytics.match_query', 'analytics.head_to_head', 'analytics.views', 'analytics.elo', 'analytics.goal_model', 'analytics.season_simulator', 'analytics.goal_timing',
+echo     'sqlite3',
+echo     'msgpack',
 echo     'config.settings_manager',
 echo ]
 echo.
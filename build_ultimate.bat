@@ -87,6 +87,8 @@ echo     ('gui', 'gui'^),
 echo     ('scrapers', 'scrapers'^),
 echo     ('exporters', 'exporters'^),
 echo     ('models', 'models'^),
+echo     ('storage', 'storage'^),
+echo     ('analytics', 'analytics'^),
 echo     ('config', 'config'^),
 echo ]
 echo.
@@ -112,8 +114,10 @@ echo     'datetime', 'json', 'csv', 'os', 'sys',
 echo     # Project Modules
 echo     'gui.app', 'gui.tkinter_app',
 echo     'scrapers.kicker_scraper', 'scrapers.improved_kicker_scraper', 'scrapers.base_scraper',
-echo     'exporters.excel_exporter_new', 'exporters.merge_service',
-echo     'models.game_data', 'models.extended_data',
+echo     'exporters.excel_exporter_new', 'exporters.merge_service', 'exporters.parquet_exporter', 'exporters.base_exporter', 'exporters.stream_exporters', 'exporters.export_formats', 'exporters.backup_manager', 'exporters.export_cache',
+echo     'models.columnar', 'pyarrow', 'pyarrow.dataset',
+echo     'models.game_data', 'models.extended_data', 'models.serialization',
+echo     'storage.match_database', 'storage.columnar_store', 'storage.html_archive', 'scrapers.archive_reparser', 'zstandard', 'analytics.league_table', 'analytics.stats_aggregator', 'analytics.match_query', 'analytics.head_to_head', 'analytics.views', 'analytics.elo', 'analytics.goal_model', 'analytics.season_simulator', 'analytics.goal_timing', 'sqlite3', 'msgpack',
 echo     'config.settings_manager',
 echo ]
 echo.
@@ -33,6 +33,13 @@ class SettingsManager:
             "show_progress_details": True,
             # Erweiterte Einstellungen
             "cache_enabled": True,
+            "database_path": "data/bundesliga.db",
+            "columnar_store_path": "data/columnar",
+            "html_archive_enabled": False,
+            "html_archive_path": "data/html_archive",
+            "backup_retention": 5,
+            "elo_k_factor": 20.0,
+            "elo_home_advantage": 65.0,
             "log_level": "INFO",
             "max_log_files": 5,
         }
@@ -103,6 +110,33 @@ class SettingsManager:
         self.set("export_format", format_str)
         self.save_settings()
 
+    def get_database_path(self) -> str:
+        """Holt den Pfad zur Spiele-Datenbank."""
+        return self.get("database_path", "data/bundesliga.db")
+
+    def get_columnar_store_path(self) -> str:
+        """Holt den Pfad zum memory-mapped Spaltenspeicher."""
+        return self.get("columnar_store_path", "data/columnar")
+
+    def is_html_archive_enabled(self) -> bool:
+        """Prüft, ob abgerufene Seiten archiviert werden sollen (Opt-in)."""
+        return bool(self.get("html_archive_enabled", False))
+
+    def get_html_archive_path(self) -> str:
+        """Holt den Pfad zum HTML-Archiv."""
+        return self.get("html_archive_path", "data/html_archive")
+
+    def get_backup_retention(self) -> int:
+        """Holt die Anzahl der Sicherungen, die pro Export-Datei behalten werden."""
+        return int(self.get("backup_retention", 5))
+
+    def get_elo_settings(self) -> Dict[str, float]:
+        """Holt K-Faktor und Heimvorteil für die Elo-Ratings."""
+        return {
+            "k_factor": float(self.get("elo_k_factor", 20.0)),
+            "home_advantage": float(self.get("elo_home_advantage", 65.0)),
+        }
+
     def get_scraper_settings(self) -> Dict[str, Any]:
         """Holt alle Scraper-Einstellungen."""
         return {
@@ -156,7 +190,9 @@ class SettingsManager:
             elif "csv" in format_str:
                 extension = ".csv"
             elif "json" in format_str:
-                extension = ".json"
+                extension = ".jsonl"
+            elif "parquet" in format_str:
+                extension = ".parquet"
             else:
                 extension = ".xlsx"
 
@@ -205,3 +241,18 @@ def create_export_filename(base_name: str, extension: str = None) -> str:
 def get_export_path(filename: str) -> str:
     """Convenience-Funktion für Export-Pfade."""
     return get_settings_manager().get_export_path(filename)
+
+
+def get_database_path() -> str:
+    """Convenience-Funktion für den Datenbank-Pfad."""
+    return get_settings_manager().get_database_path()
+
+
+def get_columnar_store_path() -> str:
+    """Convenience-Funktion für den Spaltenspeicher-Pfad."""
+    return get_settings_manager().get_columnar_store_path()
+
+
+def get_elo_settings() -> Dict[str, float]:
+    """Convenience-Funktion für die Elo-Einstellungen."""
+    return get_settings_manager().get_elo_settings()
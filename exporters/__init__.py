@@ -2,7 +2,25 @@
 Exporters package - Export-Module für Bundesliga Scraper
 """
 
+from .base_exporter import BaseExporter
 from .excel_exporter_new import ExcelExporter
 from .merge_service import MergeService
+from .backup_manager import BackupManager
+from .export_cache import content_hash
+from .parquet_exporter import ParquetExporter, ParquetLoader
+from .stream_exporters import CsvExporter, JsonLinesExporter
+from .export_formats import EXPORT_FORMATS, get_exporter
 
-__all__ = ["ExcelExporter", "MergeService"]
+__all__ = [
+    "BaseExporter",
+    "ExcelExporter",
+    "MergeService",
+    "BackupManager",
+    "content_hash",
+    "ParquetExporter",
+    "ParquetLoader",
+    "CsvExporter",
+    "JsonLinesExporter",
+    "EXPORT_FORMATS",
+    "get_exporter",
+]
@@ -0,0 +1,175 @@
+"""
+BackupManager - Günstige, rotierende Sicherungen von Export-Dateien
+
+Sicherungen werden - je nach Dateisystem - als Reflink (Copy-on-Write-Klon,
+z.B. Btrfs/XFS/APFS), als Hardlink oder als gestreamte Kopie angelegt. Die
+Originaldatei bleibt dabei unverändert an ihrem Platz.
+
+Hardlinks sind nur sicher, solange Dateien nie an Ort und Stelle überschrieben
+werden. Excel-, CSV- und JSON-Exporter sowie der MergeService schreiben
+deshalb über atomic_target() in eine temporäre Datei und ersetzen das Ziel
+erst danach per os.replace - die Sicherung behält so ihren eigenen Inhalt.
+"""
+
+import glob
+import logging
+import os
+import shutil
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# ioctl-Nummer für Reflinks unter Linux (FICLONE aus linux/fs.h)
+FICLONE = 0x40049409
+
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Zeitstempel im Namen einer Sicherung (<name>.<zeitstempel>.backup<endung>)
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S_%f"
+# Glob-Muster mit fester Breite für TIMESTAMP_FORMAT, z.B. 20240824_153000_123456
+TIMESTAMP_PATTERN = "[0-9]" * 8 + "_" + "[0-9]" * 6 + "_" + "[0-9]" * 6
+
+
+@contextmanager
+def atomic_target(path) -> Iterator[Path]:
+    """
+    Liefert einen temporären Pfad neben dem Ziel und ersetzt das Ziel erst,
+    wenn der Block ohne Fehler durchgelaufen ist.
+
+    Beispiel:
+        with atomic_target(filepath) as tmp_path:
+            workbook.save(tmp_path)
+    """
+    target = Path(path)
+    tmp_path = target.with_name(f".{target.name}.tmp")
+    try:
+        yield tmp_path
+        os.replace(tmp_path, target)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+class BackupManager:
+    """Erstellt und rotiert Sicherungen einzelner Dateien."""
+
+    def __init__(self, backup_dir: Optional[str] = None, retention: int = 5):
+        """
+        Args:
+            backup_dir: Zielordner (Standard: Unterordner "backups" neben der Datei)
+            retention: Anzahl der Sicherungen, die pro Datei behalten werden
+        """
+        self.backup_dir = Path(backup_dir) if backup_dir else None
+        self.retention = max(1, retention)
+
+    def _backup_dir_for(self, path: Path) -> Path:
+        return self.backup_dir or path.parent / "backups"
+
+    def backups(self, path) -> List[Path]:
+        """
+        Alle Sicherungen einer Datei, neueste zuerst.
+
+        Das Muster prüft den Zeitstempel mit fester Breite, damit Sicherungen
+        anderer Dateien mit gleichem Namensanfang (z.B. "daten.v2.xlsx" neben
+        "daten.xlsx") nicht mitgezählt und bei der Rotation gelöscht werden.
+        """
+        path = Path(path)
+        backup_dir = self._backup_dir_for(path)
+        if not backup_dir.exists():
+            return []
+        pattern = (
+            f"{glob.escape(path.stem)}.{TIMESTAMP_PATTERN}"
+            f".backup{glob.escape(path.suffix)}"
+        )
+        return sorted(
+            backup_dir.glob(pattern),
+            key=lambda backup: backup.name,
+            reverse=True,
+        )
+
+    def backup(self, path) -> Optional[str]:
+        """
+        Sichert eine Datei, ohne sie zu verschieben.
+
+        Ist die Datei seit der letzten Sicherung unverändert (gleicher Inode
+        bzw. gleiche Größe und Änderungszeit), wird keine neue angelegt.
+
+        Returns:
+            Pfad der (neuen oder vorhandenen) Sicherung oder None, falls die
+            Datei nicht existiert
+        """
+        path = Path(path)
+        if not path.exists():
+            return None
+
+        existing = self.backups(path)
+        if existing and self._is_unchanged(path, existing[0]):
+            return str(existing[0])
+
+        backup_dir = self._backup_dir_for(path)
+        backup_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+        backup_path = backup_dir / f"{path.stem}.{timestamp}.backup{path.suffix}"
+
+        method = self._clone(path, backup_path)
+        logger.info(f"Backup erstellt ({method}): {backup_path}")
+
+        self._rotate(path)
+        return str(backup_path)
+
+    def restore(self, backup_path, target) -> str:
+        """Stellt eine Sicherung wieder her (atomar, Sicherung bleibt erhalten)."""
+        with atomic_target(target) as tmp_path:
+            self._stream_copy(Path(backup_path), tmp_path)
+        return str(target)
+
+    def _is_unchanged(self, path: Path, backup: Path) -> bool:
+        current, previous = path.stat(), backup.stat()
+        if (current.st_dev, current.st_ino) == (previous.st_dev, previous.st_ino):
+            return True
+        return (
+            current.st_size == previous.st_size
+            and current.st_mtime_ns == previous.st_mtime_ns
+        )
+
+    def _clone(self, source: Path, target: Path) -> str:
+        """Reflink, sonst Hardlink, sonst gestreamte Kopie."""
+        if fcntl is not None:
+            try:
+                with open(source, "rb") as src, open(target, "wb") as dst:
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                shutil.copystat(source, target)
+                return "reflink"
+            except OSError:
+                target.unlink(missing_ok=True)
+
+        try:
+            os.link(source, target)
+            return "hardlink"
+        except OSError:
+            pass
+
+        self._stream_copy(source, target)
+        return "copy"
+
+    def _stream_copy(self, source: Path, target: Path):
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+        # Änderungszeit übernehmen, damit _is_unchanged greift
+        shutil.copystat(source, target)
+
+    def _rotate(self, path: Path):
+        """Löscht Sicherungen jenseits der Aufbewahrungsgrenze."""
+        for old_backup in self.backups(path)[self.retention :]:
+            try:
+                old_backup.unlink()
+            except OSError as e:
+                logger.warning(f"Backup konnte nicht gelöscht werden: {e}")
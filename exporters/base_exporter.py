@@ -0,0 +1,246 @@
+"""
+BaseExporter - Gemeinsame Schnittstelle aller Export-Formate
+
+Jedes Format (Excel, CSV, JSON Lines, Parquet) implementiert export() und
+liefert den Pfad der erzeugten Datei. Die Formatierung einzelner Spiele
+(Gewinner, Torschützen, Aufstellungen) ist hier zentral definiert, damit
+alle Formate dieselben Werte schreiben.
+
+export_if_changed() prüft vorher über einen Inhalts-Hash (siehe
+export_cache), ob ein identischer Export bereits vorliegt, und überspringt
+das Schreiben in diesem Fall.
+
+Formate, die in eine einzelne Datei schreiben, implementieren zusätzlich
+_write_to() und können damit auch direkt in den Speicher exportieren
+(export_to_buffer), z.B. für Download-Buttons ohne Umweg über die Platte.
+"""
+
+import io
+import logging
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import BinaryIO, Callable, List, Optional, Tuple
+
+from models.game_data import GameData
+from .backup_manager import atomic_target
+from .export_cache import content_hash, is_current, record_export
+
+logger = logging.getLogger(__name__)
+
+OVERVIEW_COLUMNS = [
+    "Datum",
+    "Saison",
+    "Spieltag",
+    "Heimteam",
+    "Auswärtsteam",
+    "Ergebnis",
+    "Tore_Heim",
+    "Tore_Auswärts",
+    "Tore_Gesamt",
+    "Gewinner",
+    "Torschützen_Heim",
+    "Torschützen_Auswärts",
+    "Aufstellung_Heim",
+    "Aufstellung_Auswärts",
+    "URL",
+]
+
+
+class BaseExporter(ABC):
+    """Abstrakte Basis-Klasse für alle Exporter."""
+
+    # Dateiendung inkl. Punkt und MIME-Typ für Downloads
+    extension = ""
+    mime = "application/octet-stream"
+    # False für Formate, die ein Verzeichnis statt einer Datei schreiben
+    supports_buffer = True
+
+    def __init__(self, output_dir: str = "exports"):
+        """
+        Initialisiert den Exporter.
+
+        Args:
+            output_dir: Pfad zum Ausgabeverzeichnis (Standard: 'exports')
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(exist_ok=True)
+        # True, wenn der letzte export_if_changed-Aufruf nichts schreiben musste
+        self.last_export_skipped = False
+
+    def set_output_directory(self, output_dir: str):
+        """
+        Setzt ein neues Ausgabeverzeichnis.
+
+        Args:
+            output_dir: Neuer Pfad zum Ausgabeverzeichnis
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(exist_ok=True)
+
+    @abstractmethod
+    def export(self, games: List[GameData], filename: str = None) -> str:
+        """Exportiert Spiele und gibt den Pfad der erzeugten Datei zurück."""
+        pass
+
+    def export_if_changed(self, games: List[GameData], filename: str = None) -> str:
+        """
+        Wie export(), überspringt das Schreiben aber, wenn bereits ein Export
+        mit identischem Inhalt (gleiche Spiele, gleiches Format) vorliegt.
+
+        Returns:
+            str: Pfad der (neu geschriebenen oder vorhandenen) Exportdatei
+        """
+        if filename is None:
+            filename = self._default_filename(games)
+        return self._export_cached(
+            self._target_path(filename),
+            self._content_hash(games, filename),
+            lambda: self.export(games, filename),
+        )
+
+    def export_to_buffer(self, games: List[GameData]) -> io.BytesIO:
+        """
+        Exportiert Spiele in einen Speicherpuffer statt in eine Datei.
+
+        Returns:
+            io.BytesIO: Puffer, auf den Anfang zurückgesetzt
+        """
+        if not games:
+            raise ValueError("Keine Spiele zum Exportieren vorhanden")
+
+        buffer = io.BytesIO()
+        self._write_to(games, buffer)
+        buffer.seek(0)
+        return buffer
+
+    def export_with_buffer(
+        self, games: List[GameData], filename: str = None
+    ) -> Tuple[str, io.BytesIO]:
+        """
+        Exportiert einmal in den Speicher und legt dieselben Bytes zusätzlich
+        im Ausgabeverzeichnis ab. Ist die Datei bereits aktuell (siehe
+        export_if_changed), wird sie nur gelesen statt neu erzeugt.
+
+        Returns:
+            Tuple aus Pfad der Exportdatei und Puffer mit ihrem Inhalt
+        """
+        if filename is None:
+            filename = self._default_filename(games)
+        target = self._target_path(filename)
+        buffers = []
+
+        def write() -> str:
+            buffers.append(self.export_to_buffer(games))
+            with atomic_target(target) as tmp_path:
+                tmp_path.write_bytes(buffers[0].getbuffer())
+            return str(target)
+
+        exported_file = self._export_cached(
+            target, self._content_hash(games, filename), write
+        )
+        if not buffers:
+            buffers.append(io.BytesIO(target.read_bytes()))
+        return exported_file, buffers[0]
+
+    def _write_to(self, games: List[GameData], stream: BinaryIO):
+        """Schreibt den Export in ein binäres Dateiobjekt."""
+        raise NotImplementedError(
+            f"{type(self).__name__} unterstützt keinen Export in den Speicher"
+        )
+
+    def _content_hash(self, games: List[GameData], filename: str) -> str:
+        return content_hash(games, format=type(self).__name__, filename=filename)
+
+    def _export_cached(
+        self,
+        target: Path,
+        digest: str,
+        write: Callable[[], str],
+        parts: Optional[List[Path]] = None,
+    ) -> str:
+        """
+        Führt write() nur aus, wenn target nicht bereits zu digest passt.
+
+        parts: Weitere Dateien, die write() neben target erzeugt (z.B. die
+        Teil-Arbeitsmappen eines aufgeteilten Exports); fehlt oder ändert
+        sich eine davon, wird neu geschrieben.
+        """
+        if is_current(target, digest):
+            self.last_export_skipped = True
+            logger.info(f"Export unverändert, übersprungen: {target}")
+            return str(target)
+
+        exported_file = write()
+        record_export(exported_file, digest, parts)
+        self.last_export_skipped = False
+        return exported_file
+
+    def _target_path(self, filename: str) -> Path:
+        """Pfad, den export() für diesen Dateinamen erzeugt."""
+        return self.output_dir / filename
+
+    def _default_filename(self, games: List[GameData]) -> str:
+        return f"bundesliga_daten_{len(games)}_spiele{self.extension}"
+
+    def _determine_winner(self, game: GameData) -> str:
+        """Bestimmt den Gewinner eines Spiels."""
+        return determine_winner(game)
+
+    def _format_goals(self, goals: List) -> str:
+        """Formatiert eine Liste von Toren als String."""
+        return format_goals(goals)
+
+    def _format_lineup(self, team) -> str:
+        """Formatiert die Aufstellung eines Teams als String."""
+        return format_lineup(team)
+
+    def _overview_row(self, game: GameData) -> tuple:
+        """Eine Zeile im Format von OVERVIEW_COLUMNS."""
+        return overview_row(game)
+
+
+def determine_winner(game: GameData) -> str:
+    """Bestimmt den Gewinner eines Spiels."""
+    if game.home_score > game.away_score:
+        return game.home_team.name
+    elif game.away_score > game.home_score:
+        return game.away_team.name
+    else:
+        return "Unentschieden"
+
+
+def format_goals(goals: List) -> str:
+    """Formatiert eine Liste von Toren als String."""
+    if not goals:
+        return ""
+
+    return ", ".join([f"{goal.scorer} ({goal.minute}')" for goal in goals])
+
+
+def format_lineup(team) -> str:
+    """Formatiert die Aufstellung eines Teams als String."""
+    if not hasattr(team, "players") or not team.players:
+        return ""
+
+    return ", ".join([f"{player.name}" for player in team.players])
+
+
+def overview_row(game: GameData) -> tuple:
+    """Eine Zeile im Format von OVERVIEW_COLUMNS."""
+    return (
+        game.date,
+        game.season,
+        game.matchday or None,
+        game.home_team.name,
+        game.away_team.name,
+        f"{game.home_score}:{game.away_score}",
+        game.home_score,
+        game.away_score,
+        game.home_score + game.away_score,
+        determine_winner(game),
+        format_goals(game.home_goals),
+        format_goals(game.away_goals),
+        format_lineup(game.home_team),
+        format_lineup(game.away_team),
+        game.url,
+    )
@@ -1,176 +1,571 @@
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any
+from typing import BinaryIO, List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from pathlib import Path
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import FormulaRule
+from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.utils import get_column_letter
 from models.game_data import GameData
-
-
-class ExcelExporter:
+from .base_exporter import BaseExporter, OVERVIEW_COLUMNS
+from .backup_manager import atomic_target
+from .export_cache import content_hash
+from models.columnar import MatchColumns, season_start_year
+from analytics.league_table import LeagueTable, TABLE_COLUMNS
+from analytics.goal_timing import (
+    GOAL_TIMING_COLUMNS,
+    goal_timing_sheet,
+    goal_timing_table,
+)
+from analytics.head_to_head import HeadToHead, HEAD_TO_HEAD_COLUMNS
+from models.serialization import encode_games, decode_games
+
+TEAM_COLUMNS = [
+    "Datum",
+    "Saison",
+    "Spieltag",
+    "Gegner",
+    "Ergebnis",
+    "Tore_Gesamt",
+    "Gewinner",
+    "Torschützen_Team",
+    "Torschützen_Gegner",
+    "Aufstellung_Team",
+    "Aufstellung_Gegner",
+    "URL",
+]
+
+STATISTICS_COLUMNS = ["Statistik", "Wert"]
+STATISTICS_SOURCE_COLUMNS = ["Tore_Gesamt"]
+
+# Abschlusstabellen aller Saisons
+STANDINGS_SHEET = "Tabellen"
+STANDINGS_COLUMNS = ["Saison"] + TABLE_COLUMNS
+STANDINGS_SOURCE_COLUMNS = [
+    "Saison",
+    "Spieltag",
+    "Datum",
+    "Heimteam",
+    "Auswärtsteam",
+    "Tore_Heim",
+    "Tore_Auswärts",
+]
+
+# Direkter Vergleich aller Paarungen (gleiche Quellspalten wie die Tabellen)
+HEAD_TO_HEAD_SHEET = "Direkter Vergleich"
+
+# Torminuten nach Ära, Saison und Verein. Der Export rechnet mit den Minuten
+# der Tore; beim Zusammenführen liegen nur die Torschützen-Texte vor
+GOAL_TIMING_SHEET = "Torminuten"
+GOAL_TIMING_SOURCE_COLUMNS = [
+    "Saison",
+    "Heimteam",
+    "Auswärtsteam",
+    "Torschützen_Heim",
+    "Torschützen_Auswärts",
+]
+
+# Minute am Ende jedes Eintrags "Name (12')" - siehe format_goals (nur für
+# goal_timing_frame)
+_GOAL_MINUTE = re.compile(r"\((\d+)'\)(?=, |$)")
+
+# Aufteilungen für export_split
+SPLIT_MODES = ("season", "team")
+
+# Anzeigenamen der Aufteilungen in den GUIs (None = eine Arbeitsmappe)
+SPLIT_MODE_LABELS = {
+    "Eine Arbeitsmappe": None,
+    "Pro Saison": "season",
+    "Pro Verein": "team",
+}
+
+# Zeilen vom Anfang, die in die Spaltenbreiten immer eingehen (siehe column_widths)
+WIDTH_SAMPLE_ROWS = 1000
+MAX_COLUMN_WIDTH = 50
+
+HEADER_FONT = Font(bold=True, color="FFFFFF")
+HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+HEADER_ALIGNMENT = Alignment(horizontal="center")
+BAND_FILL = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")
+
+# Ab dieser Zeilenzahl werden Spaltenbreiten aus einer Stichprobe bestimmt
+FRAME_SAMPLE_ROWS = 5000
+
+
+def column_widths(df: pd.DataFrame) -> List[int]:
+    """
+    Spaltenbreiten aus einem DataFrame (vektorisiert, max. 50 Zeichen).
+
+    Große Frames werden stichprobenartig ausgewertet; die ersten Zeilen sind
+    immer enthalten, damit die sichtbaren Zeilen passend breit sind.
+    """
+    frame = df
+    if len(df) > FRAME_SAMPLE_ROWS:
+        frame = pd.concat(
+            [
+                df.head(WIDTH_SAMPLE_ROWS),
+                df.iloc[WIDTH_SAMPLE_ROWS:].sample(
+                    FRAME_SAMPLE_ROWS - WIDTH_SAMPLE_ROWS, random_state=0
+                ),
+            ]
+        )
+
+    widths = []
+    for name in frame.columns:
+        values = frame[name].dropna().to_numpy()
+        longest = np.char.str_len(values.astype(str)).max() if len(values) else 0
+        widths.append(min(max(int(longest), len(str(name))) + 2, MAX_COLUMN_WIDTH))
+    return widths
+
+
+def format_worksheet(worksheet, df: pd.DataFrame):
+    """
+    Formatiert ein mit DataFrame.to_excel geschriebenes Arbeitsblatt.
+
+    Kopfzeile stylen, Spaltenbreiten aus dem DataFrame in einem Durchgang
+    setzen und Zebra-Streifen als bedingte Formatierung hinterlegen - ohne
+    jede Zelle des Blatts anzufassen.
+    """
+    for cell in worksheet[1]:
+        cell.font = HEADER_FONT
+        cell.fill = HEADER_FILL
+        cell.alignment = HEADER_ALIGNMENT
+
+    for index, width in enumerate(column_widths(df), start=1):
+        worksheet.column_dimensions[get_column_letter(index)].width = width
+
+    if len(df) and len(df.columns):
+        last_cell = f"{get_column_letter(len(df.columns))}{len(df) + 1}"
+        worksheet.conditional_formatting.add(
+            f"A2:{last_cell}",
+            FormulaRule(formula=["MOD(ROW(),2)=0"], fill=BAND_FILL),
+        )
+
+
+def standings_frame(matches: Iterable[tuple]) -> pd.DataFrame:
+    """
+    Abschlusstabellen aller Saisons (Spalten wie STANDINGS_COLUMNS).
+
+    Args:
+        matches: Tupel in der Reihenfolge von STANDINGS_SOURCE_COLUMNS
+    """
+    columns = MatchColumns.from_records(
+        (index, *match) for index, match in enumerate(matches)
+    )
+    return LeagueTable(columns).final_standings()
+
+
+def head_to_head_frame(matches: Iterable[tuple]) -> pd.DataFrame:
+    """
+    Bilanzen aller Paarungen (Spalten wie HEAD_TO_HEAD_COLUMNS).
+
+    Args:
+        matches: Tupel in der Reihenfolge von STANDINGS_SOURCE_COLUMNS
+    """
+    columns = MatchColumns.from_records(
+        (index, *match) for index, match in enumerate(matches)
+    )
+    return HeadToHead.from_columns(columns).to_frame()
+
+
+def goal_timing_frame(matches: Iterable[tuple]) -> pd.DataFrame:
+    """
+    Torminuten-Verteilungen aus den Texten eines vorhandenen Sheets (Spalten
+    wie GOAL_TIMING_COLUMNS). Nur für den MergeService - beim Export stehen
+    die Tore selbst zur Verfügung (siehe goal_timing_sheet).
+
+    Args:
+        matches: Tupel in der Reihenfolge von GOAL_TIMING_SOURCE_COLUMNS
+    """
+    seasons: List[Optional[str]] = []
+    teams: List[str] = []
+    minutes: List[int] = []
+    for season, home, away, home_goals, away_goals in matches:
+        for team, scorers in ((home, home_goals), (away, away_goals)):
+            found = _GOAL_MINUTE.findall(scorers or "")
+            seasons.extend([season] * len(found))
+            teams.extend([team] * len(found))
+            minutes.extend(int(minute) for minute in found)
+    return goal_timing_table(seasons, teams, minutes)
+
+
+def statistics_rows(total_games: int, total_goals: int) -> Iterator[tuple]:
+    """Zeilen des Statistik-Sheets (Spalten wie STATISTICS_COLUMNS)."""
+    avg_goals = total_goals / total_games if total_games > 0 else 0
+
+    yield ("Gesamtanzahl Spiele", total_games)
+    yield ("Gesamtanzahl Tore", total_goals)
+    yield ("Durchschnittliche Tore pro Spiel", f"{avg_goals:.2f}")
+
+
+def statistics_frame(matches: Iterable[tuple]) -> pd.DataFrame:
+    """
+    Statistik-Sheet (Spalten wie STATISTICS_COLUMNS).
+
+    Args:
+        matches: Tupel in der Reihenfolge von STATISTICS_SOURCE_COLUMNS
+    """
+    goals = [total or 0 for (total,) in matches]
+    return pd.DataFrame(
+        list(statistics_rows(len(goals), sum(goals))), columns=STATISTICS_COLUMNS
+    )
+
+
+def _export_partition(
+    output_dir: str, filename: str, payload: bytes, team: Optional[str]
+) -> str:
+    """Schreibt eine Teil-Arbeitsmappe (läuft im Worker-Prozess)."""
+    exporter = ExcelExporter(output_dir)
+    return exporter._write_workbook(
+        decode_games(payload),
+        exporter.output_dir / filename,
+        teams=[team] if team else None,
+    )
+
+
+class ExcelExporter(BaseExporter):
     """Exportiert Bundesliga-Daten in Excel-Dateien."""
 
-    def __init__(self, output_dir: str = "exports"):
-        """
-        Initialisiert den ExcelExporter.
+    extension = ".xlsx"
+    mime = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 
-        Args:
-            output_dir: Pfad zum Ausgabeverzeichnis (Standard: 'exports')
-        """
-        self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(exist_ok=True)
+    def export(self, games: List[GameData], filename: str = None) -> str:
+        """Standard-Export der gemeinsamen Schnittstelle (siehe export_by_team)."""
+        return self.export_by_team(games, filename)
 
-    def set_output_directory(self, output_dir: str):
+    def export_by_team(self, games: List[GameData], filename: str = None) -> str:
         """
-        Setzt ein neues Ausgabeverzeichnis.
+        Exportiert Spiele gruppiert nach Teams in separate Sheets.
 
-        Args:
-            output_dir: Neuer Pfad zum Ausgabeverzeichnis
+        Die Arbeitsmappe wird im write-only-Modus von openpyxl gestreamt:
+        Zeilen werden direkt geschrieben, Spaltenbreiten aus einer Stichprobe
+        berechnet und die Zebra-Streifen als bedingte Formatierung statt pro
+        Zelle gesetzt. Tore und Aufstellungen werden pro Spiel nur einmal
+        formatiert (siehe _games_frame/_team_frame).
         """
-        self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(exist_ok=True)
-
-    def export_by_team(self, games: List[GameData], filename: str = None) -> str:
-        """Exportiert Spiele gruppiert nach Teams in separate Sheets."""
         if not games:
             raise ValueError("Keine Spiele zum Exportieren vorhanden")
 
         if filename is None:
             filename = f"bundesliga_daten_{len(games)}_spiele.xlsx"
 
-        filepath = self.output_dir / filename
+        return self._write_workbook(games, self.output_dir / filename)
 
-        # Spiele nach Teams gruppieren
-        teams_games = {}
-        for game in games:
-            home_team = game.home_team.name
-            away_team = game.away_team.name
+    def _write_workbook(
+        self, games: List[GameData], filepath: Path, teams: Optional[List[str]] = None
+    ) -> str:
+        """Schreibt die Arbeitsmappe aus _build_workbook atomar nach filepath."""
+        workbook = self._build_workbook(games, teams)
+        with atomic_target(filepath) as tmp_path:
+            workbook.save(tmp_path)
+        return str(filepath)
 
-            # Spiel dem Heimteam zuordnen
-            if home_team not in teams_games:
-                teams_games[home_team] = []
-            teams_games[home_team].append(game)
+    def _write_to(self, games: List[GameData], stream: BinaryIO):
+        self._build_workbook(games).save(stream)
 
-            # Spiel dem Auswärtsteam zuordnen
-            if away_team not in teams_games:
-                teams_games[away_team] = []
-            teams_games[away_team].append(game)
+    def _build_workbook(
+        self, games: List[GameData], teams: Optional[List[str]] = None
+    ) -> Workbook:
+        """
+        Baut eine Arbeitsmappe mit Übersicht, Team-Sheets und Statistik.
+
+        Args:
+            games: Zu exportierende Spiele
+            teams: Nur für diese Vereine Team-Sheets anlegen (None = alle)
+        """
+        games_frame = self._games_frame(games)
+        team_groups = dict(
+            iter(self._team_frame(games_frame).groupby("Team", sort=False))
+        )
+
+        workbook = Workbook(write_only=True)
+
+        # Übersichts-Sheet
+        self._write_sheet(workbook, "Übersicht", games_frame[OVERVIEW_COLUMNS])
+
+        # Team-spezifische Sheets (Reihenfolge des ersten Auftretens)
+        team_order = dict.fromkeys(
+            name
+            for game in games
+            for name in (game.home_team.name, game.away_team.name)
+        )
+        for team_name in team_order:
+            if teams is not None and team_name not in teams:
+                continue
+            self._write_sheet(
+                workbook,
+                self._sanitize_sheet_name(team_name),
+                team_groups[team_name][TEAM_COLUMNS],
+            )
 
-        # Excel-Writer erstellen
-        with pd.ExcelWriter(filepath, engine="openpyxl") as writer:
-            # Übersichts-Sheet
-            self._create_overview_sheet(games, writer)
+        # Abschlusstabellen, direkter Vergleich und Torminuten (nur für
+        # vollständige Spielpläne, nicht pro Verein)
+        if teams is None:
+            standings = standings_frame(
+                games_frame[STANDINGS_SOURCE_COLUMNS].itertuples(index=False, name=None)
+            )
+            self._write_sheet(workbook, STANDINGS_SHEET, standings[STANDINGS_COLUMNS])
+            head_to_head = head_to_head_frame(
+                games_frame[STANDINGS_SOURCE_COLUMNS].itertuples(index=False, name=None)
+            )
+            self._write_sheet(
+                workbook, HEAD_TO_HEAD_SHEET, head_to_head[HEAD_TO_HEAD_COLUMNS]
+            )
+            goal_timing = goal_timing_sheet(MatchColumns.from_games(games))
+            self._write_sheet(
+                workbook, GOAL_TIMING_SHEET, goal_timing[GOAL_TIMING_COLUMNS]
+            )
 
-            # Team-spezifische Sheets
-            for team_name, team_games in teams_games.items():
-                safe_team_name = self._sanitize_sheet_name(team_name)
-                self._create_team_sheet(team_games, team_name, writer, safe_team_name)
+        # Statistik-Sheet
+        self._write_sheet(
+            workbook,
+            "Statistiken",
+            pd.DataFrame(
+                list(self._statistics_rows(games)), columns=STATISTICS_COLUMNS
+            ),
+        )
+        return workbook
+
+    def export_split(
+        self,
+        games: List[GameData],
+        mode: str = "season",
+        folder_name: str = None,
+        workers: Optional[int] = None,
+        skip_unchanged: bool = False,
+    ) -> str:
+        """
+        Exportiert eine Arbeitsmappe pro Saison oder pro Verein.
 
-            # Statistik-Sheet
-            self._create_statistics_sheet(games, writer)
+        Die Arbeitsmappen werden parallel in einem Prozess-Pool geschrieben;
+        eine kleine Index-Arbeitsmappe verlinkt alle Dateien. Jede Datei bleibt
+        so klein genug, um in Excel schnell geöffnet zu werden.
 
-        return str(filepath)
+        Args:
+            games: Zu exportierende Spiele
+            mode: "season" (pro Saison) oder "team" (pro Verein)
+            folder_name: Unterordner im Ausgabeverzeichnis
+            workers: Anzahl Prozesse (Standard: alle CPU-Kerne)
+            skip_unchanged: Nichts schreiben, wenn der Ordner bereits genau
+                diese Spiele enthält und alle Teil-Arbeitsmappen unverändert
+                vorhanden sind (siehe export_if_changed)
+
+        Returns:
+            str: Pfad zur Index-Arbeitsmappe
+        """
+        if not games:
+            raise ValueError("Keine Spiele zum Exportieren vorhanden")
+        if mode not in SPLIT_MODES:
+            raise ValueError(f"Unbekannter Export-Modus: {mode}")
 
-    def _create_overview_sheet(self, games: List[GameData], writer):
-        """Erstellt ein Übersichts-Sheet mit allen Spielen."""
-        overview_data = []
+        if folder_name is None:
+            folder_name = f"bundesliga_{mode}_{len(games)}_spiele"
+        folder = self.output_dir / folder_name
 
-        for game in games:
-            # Verwende die korrekt extrahierte matchday aus dem GameData-Objekt
-            row_data = {
-                "Datum": game.date,
-                "Saison": game.season,
-                "Spieltag": game.matchday
-                or "",  # KORREKTUR: Verwende game.matchday statt _extract_spieltag
-                "Heimteam": game.home_team.name,
-                "Auswärtsteam": game.away_team.name,
-                "Ergebnis": f"{game.home_score}:{game.away_score}",
-                "Tore_Heim": game.home_score,
-                "Tore_Auswärts": game.away_score,
-                "Tore_Gesamt": game.home_score + game.away_score,
-                "Gewinner": self._determine_winner(game),
-                "Torschützen_Heim": self._format_goals(game.home_goals),
-                "Torschützen_Auswärts": self._format_goals(game.away_goals),
-                "Aufstellung_Heim": self._format_lineup(game.home_team),
-                "Aufstellung_Auswärts": self._format_lineup(game.away_team),
-            }
-            overview_data.append(row_data)
-
-        df = pd.DataFrame(overview_data)
-        # Sortieren nach Datum
-        df = df.sort_values("Datum", ascending=False)
-
-        df.to_excel(writer, sheet_name="Übersicht", index=False)
-
-        # Formatierung
-        worksheet = writer.sheets["Übersicht"]
-        self._format_worksheet(worksheet, df)
-
-    def _create_team_sheet(
-        self, games: List[GameData], team_name: str, writer, sheet_name: str
-    ):
-        """Erstellt ein Sheet für ein spezifisches Team."""
-        team_data = []
+        keys, partitions = self._split_partitions(games, mode)
+        if skip_unchanged:
+            digest = content_hash(
+                games, format=type(self).__name__, split=mode, folder=folder_name
+            )
+            return self._export_cached(
+                folder / "Index.xlsx",
+                digest,
+                lambda: self._write_split(keys, partitions, mode, folder, workers),
+                parts=[folder / self._split_file_name(key) for key in keys],
+            )
+        return self._write_split(keys, partitions, mode, folder, workers)
 
+    def _split_partitions(
+        self, games: List[GameData], mode: str
+    ) -> Tuple[List[str], Dict[str, List[GameData]]]:
+        """Spiele je Saison bzw. Verein, mit sortierten Schlüsseln."""
+        partitions: Dict[str, List[GameData]] = {}
         for game in games:
-            # Basis-Daten mit korrekter Spieltag-Nummer
-            row_data = {
-                "Datum": game.date,
-                "Saison": game.season,
-                "Spieltag": game.matchday
-                or "",  # KORREKTUR: Verwende game.matchday statt _extract_spieltag
-                "Ergebnis": f"{game.home_score}:{game.away_score}",
-                "Tore_Gesamt": game.home_score + game.away_score,
-                "Gewinner": self._determine_winner(game),
-            }
-
-            # Team-spezifische Torschützen
-            if game.home_team.name == team_name:
-                # Heimspiel für dieses Team
-                row_data["Torschützen_Team"] = self._format_goals(game.home_goals)
-                row_data["Torschützen_Gegner"] = self._format_goals(game.away_goals)
-                row_data["Aufstellung_Team"] = self._format_lineup(game.home_team)
-                row_data["Aufstellung_Gegner"] = self._format_lineup(game.away_team)
+            if mode == "season":
+                partitions.setdefault(game.season or "Ohne Saison", []).append(game)
             else:
-                # Auswärtsspiel für dieses Team
-                row_data["Torschützen_Team"] = self._format_goals(game.away_goals)
-                row_data["Torschützen_Gegner"] = self._format_goals(game.home_goals)
-                row_data["Aufstellung_Team"] = self._format_lineup(game.away_team)
-                row_data["Aufstellung_Gegner"] = self._format_lineup(game.home_team)
-
-            team_data.append(row_data)
-
-        df = pd.DataFrame(team_data)
-        df = df.sort_values("Datum", ascending=False)
-
-        df.to_excel(writer, sheet_name=sheet_name, index=False)
-
-        # Formatierung
-        worksheet = writer.sheets[sheet_name]
-        self._format_worksheet(worksheet, df)
-
-    def _create_statistics_sheet(self, games: List[GameData], writer):
-        """Erstellt ein Sheet mit Spielstatistiken."""
-        # Basis-Statistiken berechnen
-        total_games = len(games)
-        total_goals = sum(game.home_score + game.away_score for game in games)
-        avg_goals = total_goals / total_games if total_games > 0 else 0
-
-        # Statistiken in DataFrame umwandeln
-        stats_data = [
-            {"Statistik": "Gesamtanzahl Spiele", "Wert": total_games},
-            {"Statistik": "Gesamtanzahl Tore", "Wert": total_goals},
-            {
-                "Statistik": "Durchschnittliche Tore pro Spiel",
-                "Wert": f"{avg_goals:.2f}",
-            },
+                partitions.setdefault(game.home_team.name, []).append(game)
+                partitions.setdefault(game.away_team.name, []).append(game)
+
+        if mode == "season":
+            keys = sorted(
+                partitions, key=lambda season: (season_start_year(season), season)
+            )
+        else:
+            keys = sorted(partitions)
+        return keys, partitions
+
+    def _split_file_name(self, key: str) -> str:
+        """Dateiname der Teil-Arbeitsmappe einer Saison bzw. eines Vereins."""
+        return f"{self._sanitize_file_name(key)}.xlsx"
+
+    def _write_split(
+        self,
+        keys: List[str],
+        partitions: Dict[str, List[GameData]],
+        mode: str,
+        folder: Path,
+        workers: Optional[int],
+    ) -> str:
+        """Schreibt die Teil-Arbeitsmappen und den Index (siehe export_split)."""
+        folder.mkdir(parents=True, exist_ok=True)
+
+        jobs = [
+            (
+                str(folder),
+                self._split_file_name(key),
+                encode_games(partitions[key]),
+                key if mode == "team" else None,
+            )
+            for key in keys
         ]
 
-        df = pd.DataFrame(stats_data)
+        if len(jobs) == 1 or workers == 1:
+            files = [_export_partition(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                files = list(executor.map(_export_partition, *zip(*jobs)))
+
+        index_rows = [
+            (
+                key,
+                len(partitions[key]),
+                sum(game.home_score + game.away_score for game in partitions[key]),
+                Path(file).name,
+            )
+            for key, file in zip(keys, files)
+        ]
+        return self._write_index(
+            folder / "Index.xlsx",
+            "Saison" if mode == "season" else "Verein",
+            index_rows,
+        )
+
+    def _write_index(self, filepath: Path, label: str, rows: List[tuple]) -> str:
+        """Schreibt die Index-Arbeitsmappe mit relativen Links auf die Dateien."""
+        workbook = Workbook()
+        worksheet = workbook.active
+        worksheet.title = "Index"
+        columns = [label, "Spiele", "Tore", "Datei"]
+        worksheet.append(columns)
+
+        for key, game_count, goal_count, file_name in rows:
+            worksheet.append([key, game_count, goal_count, file_name])
+            link_cell = worksheet.cell(row=worksheet.max_row, column=4)
+            link_cell.hyperlink = file_name
+            link_cell.style = "Hyperlink"
+
+        format_worksheet(worksheet, pd.DataFrame(rows, columns=columns))
+        with atomic_target(filepath) as tmp_path:
+            workbook.save(tmp_path)
+        return str(filepath)
 
-        df.to_excel(writer, sheet_name="Statistiken", index=False)
+    def _sanitize_file_name(self, name: str) -> str:
+        """Bereinigt Saison- oder Vereinsnamen für Dateinamen."""
+        return re.sub(r'[\\/:*?"<>|]+', "-", name).strip() or "Export"
 
-        # Formatierung
-        worksheet = writer.sheets["Statistiken"]
-        self._format_worksheet(worksheet, df)
+    def _games_frame(self, games: List[GameData]) -> pd.DataFrame:
+        """
+        Ein Frame mit einer Zeile pro Spiel und allen formatierten Feldern.
+
+        Absteigend nach Datum sortiert (Spiele ohne Datum zuletzt). Alle
+        Spalten sind object-typisiert, damit fehlende Werte als None (leere
+        Zelle) und Zahlen als Python-int geschrieben werden.
+        """
+        frame = pd.DataFrame(
+            [self._overview_row(game) for game in games],
+            columns=OVERVIEW_COLUMNS,
+            dtype=object,
+        )
+        return frame.sort_values(
+            "Datum", ascending=False, na_position="last", kind="stable"
+        )
+
+    def _team_frame(self, games_frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Long-Format: jede Spielzeile einmal aus Heim- und einmal aus
+        Auswärtssicht, mit Spalte Team. Die formatierten Strings werden dabei
+        nur referenziert, nicht neu erzeugt.
+        """
+        shared = [
+            "Datum",
+            "Saison",
+            "Spieltag",
+            "Ergebnis",
+            "Tore_Gesamt",
+            "Gewinner",
+            "URL",
+        ]
+        home = games_frame[shared].assign(
+            Team=games_frame["Heimteam"],
+            Gegner=games_frame["Auswärtsteam"],
+            Heimspiel=True,
+            Torschützen_Team=games_frame["Torschützen_Heim"],
+            Torschützen_Gegner=games_frame["Torschützen_Auswärts"],
+            Aufstellung_Team=games_frame["Aufstellung_Heim"],
+            Aufstellung_Gegner=games_frame["Aufstellung_Auswärts"],
+        )
+        away = games_frame[shared].assign(
+            Team=games_frame["Auswärtsteam"],
+            Gegner=games_frame["Heimteam"],
+            Heimspiel=False,
+            Torschützen_Team=games_frame["Torschützen_Auswärts"],
+            Torschützen_Gegner=games_frame["Torschützen_Heim"],
+            Aufstellung_Team=games_frame["Aufstellung_Auswärts"],
+            Aufstellung_Gegner=games_frame["Aufstellung_Heim"],
+        )
+        # Stabile Sortierung nach Position im (bereits sortierten) Spiele-Frame
+        position = np.arange(len(games_frame))
+        long_frame = pd.concat([home, away], ignore_index=True)
+        order = np.argsort(np.concatenate([position, position]), kind="stable")
+        return long_frame.iloc[order]
+
+    def _statistics_rows(self, games: List[GameData]) -> Iterator[tuple]:
+        """Erzeugt die Zeilen des Statistik-Sheets."""
+        return statistics_rows(
+            len(games), sum(game.home_score + game.away_score for game in games)
+        )
+
+    def _write_sheet(self, workbook: "Workbook", title: str, frame: pd.DataFrame):
+        """
+        Schreibt ein Sheet im Streaming-Verfahren.
+
+        Im write-only-Modus müssen die Spaltenbreiten vor den Zeilen
+        feststehen; sie werden vektorisiert aus dem Frame bestimmt (siehe
+        column_widths), danach werden die Zeilen direkt geschrieben.
+        """
+        worksheet = workbook.create_sheet(title)
+        columns = [str(name) for name in frame.columns]
+
+        for index, width in enumerate(column_widths(frame), start=1):
+            worksheet.column_dimensions[get_column_letter(index)].width = width
+
+        worksheet.append(self._header_cells(worksheet, columns))
+        for row in frame.itertuples(index=False, name=None):
+            worksheet.append(row)
+
+        if len(frame):
+            # Zebra-Streifen als eine Regel statt Füllung pro Zelle
+            last_cell = f"{get_column_letter(len(columns))}{len(frame) + 1}"
+            worksheet.conditional_formatting.add(
+                f"A2:{last_cell}",
+                FormulaRule(formula=["MOD(ROW(),2)=0"], fill=BAND_FILL),
+            )
+
+    def _header_cells(self, worksheet, columns: List[str]) -> List["WriteOnlyCell"]:
+        """Formatierte Kopfzeile für ein write-only-Sheet."""
+        cells = []
+        for name in columns:
+            cell = WriteOnlyCell(worksheet, value=name)
+            cell.font = HEADER_FONT
+            cell.fill = HEADER_FILL
+            cell.alignment = HEADER_ALIGNMENT
+            cells.append(cell)
+        return cells
 
     def _sanitize_sheet_name(self, name: str) -> str:
         """Bereinigt Teamnamen für Excel-Sheet-Namen."""
@@ -182,62 +577,6 @@ class ExcelExporter:
         # Länge auf 31 Zeichen begrenzen (Excel-Limit)
         return name[:31]
 
-    def _determine_winner(self, game: GameData) -> str:
-        """Bestimmt den Gewinner eines Spiels."""
-        if game.home_score > game.away_score:
-            return game.home_team.name
-        elif game.away_score > game.home_score:
-            return game.away_team.name
-        else:
-            return "Unentschieden"
-
-    def _format_worksheet(self, worksheet, df):
-        """Formatiert ein Excel-Arbeitsblatt."""
-        try:
-            from openpyxl.styles import Font, PatternFill, Alignment
-            from openpyxl.utils import get_column_letter
-            from openpyxl.utils.dataframe import dataframe_to_rows
-
-            # Header formatieren
-            header_font = Font(bold=True, color="FFFFFF")
-            header_fill = PatternFill(
-                start_color="366092", end_color="366092", fill_type="solid"
-            )
-
-            for cell in worksheet[1]:
-                cell.font = header_font
-                cell.fill = header_fill
-                cell.alignment = Alignment(horizontal="center")
-
-            # Spaltenbreiten anpassen
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = get_column_letter(column[0].column)
-
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-
-            # Datenzeilen formatieren (abwechselnde Farben)
-            light_fill = PatternFill(
-                start_color="F2F2F2", end_color="F2F2F2", fill_type="solid"
-            )
-
-            for row_num, row in enumerate(worksheet.iter_rows(min_row=2), start=2):
-                if row_num % 2 == 0:
-                    for cell in row:
-                        cell.fill = light_fill
-
-        except ImportError:
-            # Fallback falls openpyxl-Styles nicht verfügbar sind
-            pass
-
     def _extract_spieltag(self, date_str: str) -> str:
         """
         VERALTETE METHODE - Wird nicht mehr verwendet!
@@ -245,17 +584,3 @@ class ExcelExporter:
         """
         # Diese Methode ist veraltet, wird aber für Kompatibilität beibehalten
         return ""
-
-    def _format_goals(self, goals: List) -> str:
-        """Formatiert eine Liste von Toren als String."""
-        if not goals:
-            return ""
-
-        return ", ".join([f"{goal.scorer} ({goal.minute}')" for goal in goals])
-
-    def _format_lineup(self, team) -> str:
-        """Formatiert die Aufstellung eines Teams als String."""
-        if not hasattr(team, "players") or not team.players:
-            return ""
-
-        return ", ".join([f"{player.name}" for player in team.players])
@@ -0,0 +1,123 @@
+"""
+Export-Cache - Überspringt Exporte, deren Inhalt sich nicht geändert hat
+
+Für jeden Export wird ein SHA-256 über die binär kodierten Spiele
+(models.serialization.encode_games) und die Export-Optionen gebildet. Der
+Hash liegt zusammen mit Größe und Änderungszeit der erzeugten Datei in einer
+versteckten Begleitdatei neben dem Ziel:
+
+    exports/bundesliga_batch_612_spiele.xlsx
+    exports/.bundesliga_batch_612_spiele.xlsx.export.json
+
+Stimmen Hash, Größe und Änderungszeit überein, ist das Ziel bereits aktuell
+und muss nicht neu geschrieben werden. Wurde die Datei von Hand verändert
+oder gelöscht, wird sie wieder neu erzeugt. Bei Exporten aus mehreren
+Dateien (Index-Arbeitsmappe mit Teil-Arbeitsmappen) werden Größe und
+Änderungszeit jeder Teildatei mit hinterlegt und ebenso geprüft.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Iterable, Optional
+
+from models.game_data import GameData
+from models.serialization import encode_games
+
+logger = logging.getLogger(__name__)
+
+# Erhöhen, wenn sich der Aufbau der Exporte ändert (erzwingt Neuschreiben)
+EXPORT_CACHE_VERSION = 2
+
+MANIFEST_SUFFIX = ".export.json"
+
+
+def content_hash(games: Iterable[GameData], **options) -> str:
+    """
+    Stabiler Hash über Spiele und Export-Optionen.
+
+    Args:
+        games: Zu exportierende Spiele (Reihenfolge zählt)
+        **options: Weitere Einflussgrößen, z.B. Format oder Aufteilung
+
+    Returns:
+        str: Hex-Digest (SHA-256)
+    """
+    digest = hashlib.sha256()
+    digest.update(
+        json.dumps(
+            {"version": EXPORT_CACHE_VERSION, **options},
+            sort_keys=True,
+            default=str,
+        ).encode("utf-8")
+    )
+    digest.update(encode_games(games))
+    return digest.hexdigest()
+
+
+def manifest_path(target) -> Path:
+    """Pfad der Begleitdatei zu einem Export-Ziel (Datei oder Verzeichnis)."""
+    target = Path(target)
+    return target.parent / f".{target.name}{MANIFEST_SUFFIX}"
+
+
+def _fingerprint(target: Path) -> dict:
+    stat = target.stat()
+    if target.is_dir():
+        # Verzeichnisse (Parquet-Datasets): nur Existenz prüfen
+        return {}
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _matches(path: Path, recorded: dict) -> bool:
+    if not path.exists():
+        return False
+    return all(recorded.get(key) == value for key, value in _fingerprint(path).items())
+
+
+def is_current(target, digest: str) -> bool:
+    """
+    Prüft, ob das Ziel bereits mit genau diesem Inhalt exportiert wurde.
+
+    Auch alle mit record_export hinterlegten Teildateien müssen noch
+    unverändert vorhanden sein.
+    """
+    target = Path(target)
+    manifest = manifest_path(target)
+    if not target.exists() or not manifest.exists():
+        return False
+    try:
+        recorded = json.loads(manifest.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    return (
+        recorded.get("hash") == digest
+        and _matches(target, recorded)
+        and all(
+            _matches(target.parent / name, fingerprint)
+            for name, fingerprint in recorded.get("parts", {}).items()
+        )
+    )
+
+
+def record_export(target, digest: str, parts: Optional[Iterable] = None):
+    """
+    Hinterlegt den Hash eines erfolgreich geschriebenen Exports.
+
+    Args:
+        target: Export-Ziel (Datei oder Verzeichnis)
+        digest: Hash aus content_hash
+        parts: Weitere zum Export gehörende Dateien neben dem Ziel
+    """
+    target = Path(target)
+    manifest = manifest_path(target)
+    recorded = {"hash": digest, **_fingerprint(target)}
+    if parts is not None:
+        recorded["parts"] = {
+            Path(part).name: _fingerprint(Path(part)) for part in parts
+        }
+    try:
+        manifest.write_text(json.dumps(recorded), encoding="utf-8")
+    except OSError as e:
+        logger.warning(f"Export-Hash konnte nicht gespeichert werden: {e}")
@@ -0,0 +1,40 @@
+"""
+Zuordnung der Export-Formate aus den Einstellungen zu Exportern
+"""
+
+from typing import Dict, Optional, Type
+
+from .base_exporter import BaseExporter
+from .excel_exporter_new import ExcelExporter
+from .parquet_exporter import ParquetExporter
+from .stream_exporters import CsvExporter, JsonLinesExporter
+
+# Anzeigename (wie in den Einstellungen gespeichert) -> Exporter-Klasse
+EXPORT_FORMATS: Dict[str, Type[BaseExporter]] = {
+    "Excel (.xlsx)": ExcelExporter,
+    "CSV (.csv)": CsvExporter,
+    "JSON Lines (.jsonl)": JsonLinesExporter,
+    "Parquet (.parquet)": ParquetExporter,
+}
+
+DEFAULT_EXPORT_FORMAT = "Excel (.xlsx)"
+
+
+def normalize_export_format(export_format: Optional[str]) -> str:
+    """
+    Bildet ein gespeichertes Export-Format auf einen Schlüssel von
+    EXPORT_FORMATS ab.
+
+    Ältere Einstellungen ("JSON (.json)") werden auf JSON Lines abgebildet;
+    unbekannte Formate fallen auf Excel zurück.
+    """
+    if export_format and "json" in export_format.lower():
+        return "JSON Lines (.jsonl)"
+    if export_format in EXPORT_FORMATS:
+        return export_format
+    return DEFAULT_EXPORT_FORMAT
+
+
+def get_exporter(export_format: str, output_dir: str = "exports") -> BaseExporter:
+    """Erstellt den Exporter für ein Export-Format (siehe normalize_export_format)."""
+    return EXPORT_FORMATS[normalize_export_format(export_format)](output_dir)
@@ -5,20 +5,180 @@
 
 import pandas as pd
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 
+from openpyxl import load_workbook
+
+from models.game_data import GameData
+from .base_exporter import OVERVIEW_COLUMNS, overview_row
+from .backup_manager import BackupManager, atomic_target
+from .excel_exporter_new import (
+    GOAL_TIMING_COLUMNS,
+    GOAL_TIMING_SHEET,
+    GOAL_TIMING_SOURCE_COLUMNS,
+    HEAD_TO_HEAD_COLUMNS,
+    HEAD_TO_HEAD_SHEET,
+    STANDINGS_COLUMNS,
+    STANDINGS_SHEET,
+    STANDINGS_SOURCE_COLUMNS,
+    STATISTICS_COLUMNS,
+    STATISTICS_SOURCE_COLUMNS,
+    TEAM_COLUMNS,
+    format_worksheet,
+    goal_timing_frame,
+    head_to_head_frame,
+    standings_frame,
+    statistics_frame,
+)
+from config.settings_manager import get_settings_manager
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Schlüssel-Spalten für den Abgleich von Spielen. Das Datum allein reicht
+# nicht: kicker-Daten haben oft keine Jahreszahl ("Sa., 24.08."), und ohne
+# Datum setzt der Scraper "01.09.<Jahr>" ein.
+GAME_KEY_COLUMNS = ("Saison", "Spieltag", "Datum", "Heimteam", "Auswärtsteam")
+TEAM_KEY_COLUMNS = ("Saison", "Spieltag", "Datum", "Gegner")
+
+# Team-Sheets: Spalte -> (Quelle bei Heimspiel, Quelle bei Auswärtsspiel)
+TEAM_FIELD_SOURCES = {
+    "Torschützen_Team": ("Torschützen_Heim", "Torschützen_Auswärts"),
+    "Torschützen_Gegner": ("Torschützen_Auswärts", "Torschützen_Heim"),
+    "Aufstellung_Team": ("Aufstellung_Heim", "Aufstellung_Auswärts"),
+    "Aufstellung_Gegner": ("Aufstellung_Auswärts", "Aufstellung_Heim"),
+}
+
+
+def _sanitize_sheet_name(name: str) -> str:
+    """Gleiche Bereinigung wie ExcelExporter._sanitize_sheet_name."""
+    for char in ["/", "\\", "?", "*", "[", "]", ":"]:
+        name = name.replace(char, "_")
+    return name[:31]
+
+
+def _team_perspective(record: Dict[str, Any], is_home: bool) -> Dict[str, Any]:
+    """Wandelt eine Spielzeile in eine Zeile aus Sicht eines Vereins."""
+    team_record = dict(record)
+    team_record["Gegner"] = record.get("Auswärtsteam" if is_home else "Heimteam")
+    for column, (home_source, away_source) in TEAM_FIELD_SOURCES.items():
+        team_record[column] = record.get(home_source if is_home else away_source)
+    return team_record
+
+
+class _SheetIndex:
+    """
+    Inhalt eines Sheets mit Hash-Index über die Schlüsselspalten.
+
+    kind: "games" (Heim-/Auswärtsteam-Spalten), "team" (Team-Sheet, Schlüssel
+    aus Saison, Spieltag, Datum und Gegner) oder None (z.B. Tabellen - werden
+    als Ganzes neu berechnet). Fehlt eine Schlüsselspalte (Team-Sheets älterer
+    Exporte ohne "Gegner"), wird mit den vorhandenen abgeglichen.
+
+    Hat das Sheet eine Spalte "URL", wird zuerst über die Spielbericht-URL
+    zugeordnet, so dass ein erneut gescraptes Spiel mit korrigiertem Datum
+    oder Spieltag seine Zeile ersetzt statt angehängt zu werden.
+    """
+
+    def __init__(self, kind: Optional[str], columns: List[str], rows: List[tuple]):
+        self.columns = columns
+        self.rows: List[list] = [list(row) for row in rows]
+        self.changed = False
+        self.kind = kind
+        self._positions = {column: i for i, column in enumerate(columns)}
+
+        key_columns = {"games": GAME_KEY_COLUMNS, "team": TEAM_KEY_COLUMNS}.get(
+            self.kind, ()
+        )
+        self._key_columns: Tuple[str, ...] = tuple(
+            column for column in key_columns if column in self._positions
+        )
+
+        self.index: Dict[tuple, int] = {}
+        self.url_index: Dict[str, int] = {}
+        for position, row in enumerate(self.rows):
+            self._index_row(position, row)
+
+    @classmethod
+    def from_worksheet(cls, worksheet) -> "_SheetIndex":
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if not header:
+            return cls(None, [], [])
+
+        columns = [str(value) if value is not None else "" for value in header]
+        if all(column in columns for column in ("Datum", "Heimteam", "Auswärtsteam")):
+            kind = "games"
+        elif "Datum" in columns and "Torschützen_Team" in columns:
+            kind = "team"
+        else:
+            kind = None
+        return cls(kind, columns, list(rows))
+
+    def _value(self, row, column: str):
+        position = self._positions.get(column)
+        return row[position] if position is not None else None
+
+    def _key(self, row) -> tuple:
+        return tuple(self._value(row, column) for column in self._key_columns)
+
+    def _index_row(self, position: int, row):
+        if not self._key_columns:
+            return
+        self.index[self._key(row)] = position
+        url = self._value(row, "URL")
+        if url:
+            self.url_index[url] = position
+
+    def upsert(self, record: Dict[str, Any]):
+        """Ersetzt die passende Zeile oder hängt eine neue an."""
+        # Leere Strings liest openpyxl als leere Zellen (None) zurück
+        row = [
+            None if record.get(column) == "" else record.get(column)
+            for column in self.columns
+        ]
+        url = self._value(row, "URL")
+
+        position = self.url_index.get(url) if url else None
+        if position is None and self._key_columns:
+            position = self.index.get(self._key(row))
+
+        if position is None:
+            position = len(self.rows)
+            self.rows.append(row)
+            self.changed = True
+        elif self.rows[position] != row:
+            # Geänderter Schlüssel (z.B. korrigiertes Datum): alten Eintrag lösen
+            old_key = self._key(self.rows[position])
+            if self.index.get(old_key) == position:
+                del self.index[old_key]
+            self.rows[position] = row
+            self.changed = True
+        else:
+            return
+        self._index_row(position, row)
+
 
 class MergeService:
     """Service zum Zusammenführen von neuen Spieldaten mit existierenden Excel-Dateien."""
 
-    def __init__(self):
-        """Initialisiert den MergeService."""
+    def __init__(
+        self, backup_retention: Optional[int] = None, auto_backup: bool = True
+    ):
+        """
+        Initialisiert den MergeService.
+
+        Args:
+            backup_retention: Anzahl Sicherungen pro Datei (Standard: Einstellungen)
+            auto_backup: Vor jedem Zusammenführen automatisch sichern
+        """
         self.logger = logger
+        if backup_retention is None:
+            backup_retention = get_settings_manager().get_backup_retention()
+        self.backup_manager = BackupManager(retention=backup_retention)
+        self.auto_backup = auto_backup
 
     def merge_with_existing(
         self, new_data: List[Dict[str, Any]], excel_path: str
@@ -26,6 +186,14 @@ class MergeService:
         """
         Fügt neue Spieldaten zu einer existierenden Excel-Datei hinzu.
 
+        Die Arbeitsmappe wird genau einmal geladen. Jede Zeile wird über einen
+        Schlüssel (Spalte URL, sonst Saison/Spieltag/Datum/Heimteam/Auswärtsteam,
+        in Team-Sheets Saison/Spieltag/Datum/Gegner) einem Hash-Index
+        zugeordnet: vorhandene Spiele werden ersetzt, neue angehängt. Neue
+        Zeilen landen nur in Spiel-Sheets (mit Heim-/Auswärtsteam-Spalten)
+        und in den Team-Sheets der beiden beteiligten Vereine. Nur geänderte
+        Sheets werden neu geschrieben.
+
         Args:
             new_data: Liste der neuen Spieldaten
             excel_path: Pfad zur existierenden Excel-Datei
@@ -40,45 +208,90 @@ class MergeService:
                 self.logger.info(f"Excel-Datei existiert nicht: {excel_path}")
                 return False
 
-            # Neue Daten in DataFrame konvertieren
-            new_df = pd.DataFrame(new_data)
-
-            if new_df.empty:
+            if not new_data:
                 self.logger.info("Keine neuen Daten zum Zusammenführen")
                 return True
 
-            # Existierende Daten laden
-            with pd.ExcelFile(excel_path) as existing_file:
-                sheet_names = existing_file.sheet_names
-
-                # Für jedes Sheet prüfen und zusammenführen
-                with pd.ExcelWriter(
-                    excel_path, engine="openpyxl", mode="a", if_sheet_exists="replace"
-                ) as writer:
-                    for sheet_name in sheet_names:
-                        existing_df = pd.read_excel(excel_path, sheet_name=sheet_name)
-
-                        # Neue Daten filtern, die zu diesem Sheet gehören
-                        # (vereinfachte Logik - in der Praxis würde man nach Verein filtern)
-                        combined_df = pd.concat(
-                            [existing_df, new_df], ignore_index=True
+            workbook = load_workbook(excel_path)
+            sheets = {
+                name: _SheetIndex.from_worksheet(workbook[name])
+                for name in workbook.sheetnames
+            }
+            team_sheets = {
+                _sanitize_sheet_name(name): name
+                for name, sheet in sheets.items()
+                if sheet.kind == "team"
+            }
+
+            for record in new_data:
+                for sheet in sheets.values():
+                    if sheet.kind == "games":
+                        sheet.upsert(record)
+
+                for is_home, team_key in (
+                    (True, "Heimteam"),
+                    (False, "Auswärtsteam"),
+                ):
+                    team_name = record.get(team_key)
+                    if not team_name:
+                        continue
+                    sheet_name = team_sheets.get(_sanitize_sheet_name(team_name))
+                    if sheet_name is None:
+                        # Verein ohne eigenes Sheet - neues Team-Sheet anlegen
+                        sheet_name = _sanitize_sheet_name(team_name)
+                        sheets[sheet_name] = _SheetIndex("team", list(TEAM_COLUMNS), [])
+                        sheets[sheet_name].changed = True
+                        team_sheets[sheet_name] = sheet_name
+                    sheets[sheet_name].upsert(_team_perspective(record, is_home))
+
+            overview = sheets.get("Übersicht")
+            if overview is not None and overview.changed:
+                # Aus der Übersicht abgeleitete Sheets neu berechnen
+                for name, columns, build, source in (
+                    (
+                        STANDINGS_SHEET,
+                        STANDINGS_COLUMNS,
+                        standings_frame,
+                        STANDINGS_SOURCE_COLUMNS,
+                    ),
+                    (
+                        HEAD_TO_HEAD_SHEET,
+                        HEAD_TO_HEAD_COLUMNS,
+                        head_to_head_frame,
+                        STANDINGS_SOURCE_COLUMNS,
+                    ),
+                    (
+                        GOAL_TIMING_SHEET,
+                        GOAL_TIMING_COLUMNS,
+                        goal_timing_frame,
+                        GOAL_TIMING_SOURCE_COLUMNS,
+                    ),
+                    (
+                        "Statistiken",
+                        STATISTICS_COLUMNS,
+                        statistics_frame,
+                        STATISTICS_SOURCE_COLUMNS,
+                    ),
+                ):
+                    if name in sheets:
+                        sheets[name] = self._derived_sheet(
+                            overview, columns, build, source
                         )
 
-                        # Duplikate entfernen (basierend auf Datum, Heimteam, Auswärtsteam)
-                        if all(
-                            col in combined_df.columns
-                            for col in ["Datum", "Heimteam", "Auswärtsteam"]
-                        ):
-                            combined_df = combined_df.drop_duplicates(
-                                subset=["Datum", "Heimteam", "Auswärtsteam"],
-                                keep="last",
-                            )
+            changed = [name for name, sheet in sheets.items() if sheet.changed]
+            for name in changed:
+                self._rewrite_sheet(workbook, name, sheets[name])
 
-                        # Zurück in Excel schreiben
-                        combined_df.to_excel(writer, sheet_name=sheet_name, index=False)
+            if changed:
+                if self.auto_backup:
+                    self.backup_existing_file(excel_path)
+                # Atomar ersetzen - Hardlink-Sicherungen behalten den alten Inhalt
+                with atomic_target(excel_path) as tmp_path:
+                    workbook.save(tmp_path)
 
             self.logger.info(
-                f"Erfolgreich {len(new_data)} neue Datensätze zusammengeführt"
+                f"Erfolgreich {len(new_data)} neue Datensätze zusammengeführt "
+                f"({len(changed)} Sheet(s) aktualisiert)"
             )
             return True
 
@@ -86,10 +299,51 @@ class MergeService:
             self.logger.error(f"Fehler beim Zusammenführen: {e}")
             return False
 
+    def _derived_sheet(
+        self,
+        overview: "_SheetIndex",
+        columns: List[str],
+        build,
+        source_columns: List[str] = STANDINGS_SOURCE_COLUMNS,
+    ) -> "_SheetIndex":
+        """Berechnet ein abgeleitetes Sheet (z.B. Tabellen) aus der Übersicht."""
+        frame = build(
+            tuple(overview._value(row, column) for column in source_columns)
+            for row in overview.rows
+        )
+        sheet = _SheetIndex(
+            None,
+            list(columns),
+            list(frame.itertuples(index=False, name=None)),
+        )
+        sheet.changed = True
+        return sheet
+
+    def _rewrite_sheet(self, workbook, name: str, sheet: "_SheetIndex"):
+        """Ersetzt ein Sheet an gleicher Position durch den neuen Inhalt."""
+        position = len(workbook.sheetnames)
+        if name in workbook.sheetnames:
+            position = workbook.sheetnames.index(name)
+            workbook.remove(workbook[name])
+            if name == "Statistiken":
+                position = len(workbook.sheetnames)
+        elif "Statistiken" in workbook.sheetnames:
+            # Neue Team-Sheets vor dem Statistik-Sheet einsortieren
+            position = workbook.sheetnames.index("Statistiken")
+
+        worksheet = workbook.create_sheet(name, position)
+        worksheet.append(sheet.columns)
+        for row in sheet.rows:
+            worksheet.append(row)
+        format_worksheet(worksheet, pd.DataFrame(sheet.rows, columns=sheet.columns))
+
     def backup_existing_file(self, excel_path: str) -> str:
         """
         Erstellt ein Backup der existierenden Excel-Datei.
 
+        Die Datei bleibt an ihrem Platz (Reflink, Hardlink oder Kopie im
+        Unterordner "backups"); ältere Sicherungen werden rotiert.
+
         Args:
             excel_path: Pfad zur Excel-Datei
 
@@ -97,15 +351,7 @@ class MergeService:
             str: Pfad zum Backup oder None bei Fehlern
         """
         try:
-            excel_file = Path(excel_path)
-            if not excel_file.exists():
-                return None
-
-            backup_path = excel_file.with_suffix(f".backup{excel_file.suffix}")
-            excel_file.rename(backup_path)
-
-            self.logger.info(f"Backup erstellt: {backup_path}")
-            return str(backup_path)
+            return self.backup_manager.backup(excel_path)
 
         except Exception as e:
             self.logger.error(f"Fehler beim Backup erstellen: {e}")
@@ -126,7 +372,11 @@ class MergeService:
         if hasattr(games, "__iter__"):
             game_dicts = []
             for game in games:
-                if hasattr(game, "to_dict"):
+                if isinstance(game, GameData):
+                    # Gleiche Spalten und Formatierung wie der Excel-Export
+                    game_dict = dict(zip(OVERVIEW_COLUMNS, overview_row(game)))
+                    game_dicts.append(game_dict)
+                elif hasattr(game, "to_dict"):
                     game_dicts.append(game.to_dict())
                 else:
                     # Fallback für Objekte ohne to_dict
@@ -0,0 +1,314 @@
+"""
+ParquetExporter - Partitionierter Parquet-Export für die Datenanalyse
+
+Schreibt Spiele, Tore und Aufstellungen als drei Parquet-Datasets, jeweils
+nach Saison partitioniert (Hive-Layout: season=2024-25/...). Der passende
+ParquetLoader liest nur die benötigten Spalten und Partitionen.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from models.game_data import GameData, Team, Player, Goal
+from .base_exporter import BaseExporter
+from models.columnar import (
+    match_records,
+    goal_records,
+    lineup_records,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+except ImportError:  # pragma: no cover - pyarrow ist optional
+    pa = None
+
+
+TABLES = ("matches", "goals", "lineups")
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError(
+            "Für den Parquet-Export wird pyarrow benötigt: pip install pyarrow"
+        )
+
+
+def _schemas() -> Dict[str, "pa.Schema"]:
+    return {
+        "matches": pa.schema(
+            [
+                ("match_key", pa.string()),
+                ("season", pa.string()),
+                ("matchday", pa.int16()),
+                ("date", pa.string()),
+                ("home_team", pa.string()),
+                ("away_team", pa.string()),
+                ("home_score", pa.int16()),
+                ("away_score", pa.int16()),
+                ("total_goals", pa.int16()),
+                ("winner", pa.string()),
+                ("stadium", pa.string()),
+                ("attendance", pa.int32()),
+            ]
+        ),
+        "goals": pa.schema(
+            [
+                ("match_key", pa.string()),
+                ("season", pa.string()),
+                ("matchday", pa.int16()),
+                ("team", pa.string()),
+                ("opponent", pa.string()),
+                ("is_home", pa.bool_()),
+                ("scorer", pa.string()),
+                ("minute", pa.int16()),
+                ("assist", pa.string()),
+                ("penalty", pa.bool_()),
+                ("own_goal", pa.bool_()),
+            ]
+        ),
+        "lineups": pa.schema(
+            [
+                ("match_key", pa.string()),
+                ("season", pa.string()),
+                ("matchday", pa.int16()),
+                ("team", pa.string()),
+                ("opponent", pa.string()),
+                ("is_home", pa.bool_()),
+                ("slot", pa.int8()),
+                ("player", pa.string()),
+                ("position", pa.string()),
+                ("number", pa.int16()),
+            ]
+        ),
+    }
+
+
+def _partitioning() -> "ds.Partitioning":
+    return ds.partitioning(pa.schema([("season", pa.string())]), flavor="hive")
+
+
+class ParquetExporter(BaseExporter):
+    """Exportiert Bundesliga-Daten als nach Saison partitionierte Parquet-Datasets."""
+
+    extension = ".parquet"
+    # Schreibt ein Dataset-Verzeichnis, keine einzelne Datei
+    supports_buffer = False
+
+    def export(self, games: List[GameData], filename: str = None) -> str:
+        """
+        Gemeinsame Schnittstelle: schreibt ein Dataset-Verzeichnis, dessen
+        Name der Dateiname ohne Endung ist.
+        """
+        dataset_name = Path(filename).stem if filename else "bundesliga_parquet"
+        return self.export_dataset(games, dataset_name)
+
+    def _target_path(self, filename: str) -> Path:
+        return self.output_dir / Path(filename).stem
+
+    def export_dataset(
+        self, games: List[GameData], dataset_name: str = "bundesliga_parquet"
+    ) -> str:
+        """
+        Schreibt Spiele, Tore und Aufstellungen als Parquet-Dataset.
+
+        Bereits vorhandene Saisons im Dataset werden ersetzt, andere Saisons
+        bleiben unverändert - so lassen sich einzelne Saisons nachladen.
+
+        Returns:
+            str: Pfad zum Dataset-Verzeichnis
+        """
+        _require_pyarrow()
+        if not games:
+            raise ValueError("Keine Spiele zum Exportieren vorhanden")
+
+        dataset_dir = self.output_dir / dataset_name
+        schemas = _schemas()
+        records = {
+            "matches": match_records(games),
+            "goals": goal_records(games),
+            "lineups": lineup_records(games),
+        }
+
+        for table_name in TABLES:
+            schema = schemas[table_name]
+            table = pa.Table.from_pylist(list(records[table_name]), schema=schema)
+            # Sortierung verbessert die Row-Group-Statistiken für Team-Filter
+            sort_column = "home_team" if table_name == "matches" else "team"
+            table = table.sort_by([("season", "ascending"), (sort_column, "ascending")])
+
+            ds.write_dataset(
+                table,
+                dataset_dir / table_name,
+                format="parquet",
+                partitioning=_partitioning(),
+                existing_data_behavior="delete_matching",
+                basename_template="part-{i}.parquet",
+            )
+
+        return str(dataset_dir)
+
+
+class ParquetLoader:
+    """Liest ein mit ParquetExporter geschriebenes Dataset."""
+
+    def __init__(self, dataset_dir: str):
+        _require_pyarrow()
+        self.dataset_dir = Path(dataset_dir)
+        self._datasets: Dict[str, "ds.Dataset"] = {}
+
+    def _dataset(self, table_name: str) -> "ds.Dataset":
+        if table_name not in TABLES:
+            raise ValueError(f"Unbekannte Tabelle: {table_name}")
+        if table_name not in self._datasets:
+            self._datasets[table_name] = ds.dataset(
+                self.dataset_dir / table_name,
+                format="parquet",
+                schema=_schemas()[table_name],
+                partitioning=_partitioning(),
+            )
+        return self._datasets[table_name]
+
+    def seasons(self) -> List[str]:
+        """Alle im Dataset vorhandenen Saisons (aus den Partitionen)."""
+        table = self._dataset("matches").to_table(columns=["season"])
+        return sorted(pc.unique(table["season"]).to_pylist())
+
+    def _filter(
+        self,
+        table_name: str,
+        seasons: Optional[List[str]] = None,
+        teams: Optional[List[str]] = None,
+    ):
+        expression = None
+
+        if seasons:
+            expression = pc.field("season").isin(seasons)
+
+        if teams:
+            if table_name == "matches":
+                team_filter = pc.field("home_team").isin(teams) | pc.field(
+                    "away_team"
+                ).isin(teams)
+            else:
+                team_filter = pc.field("team").isin(teams)
+            expression = team_filter if expression is None else expression & team_filter
+
+        return expression
+
+    def load_table(
+        self,
+        table_name: str = "matches",
+        columns: Optional[List[str]] = None,
+        seasons: Optional[List[str]] = None,
+        teams: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Lädt eine Tabelle mit Spaltenauswahl und Filter-Pushdown.
+
+        Args:
+            table_name: "matches", "goals" oder "lineups"
+            columns: Nur diese Spalten lesen (None = alle)
+            seasons: Nur diese Saisons lesen - überspringt andere Partitionen
+            teams: Nur Zeilen dieser Vereine (bei matches: Heim- oder Auswärtsteam)
+        """
+        table = self._dataset(table_name).to_table(
+            columns=columns, filter=self._filter(table_name, seasons, teams)
+        )
+        return table.to_pandas()
+
+    def load_games(
+        self, seasons: Optional[List[str]] = None, teams: Optional[List[str]] = None
+    ) -> List[GameData]:
+        """Baut GameData-Objekte aus den drei Tabellen wieder auf."""
+        matches = self._dataset("matches").to_table(
+            filter=self._filter("matches", seasons, teams)
+        )
+        if matches.num_rows == 0:
+            return []
+
+        # Tore/Aufstellungen über die Saison-Partitionen filtern; die teure
+        # Schlüssel-Liste wird nur bei einem Team-Filter benötigt
+        related_filter = self._filter("goals", seasons)
+        if teams:
+            key_filter = pc.field("match_key").isin(matches["match_key"])
+            related_filter = (
+                key_filter if related_filter is None else related_filter & key_filter
+            )
+
+        goals_by_match: Dict[str, tuple] = {}
+        goals = self._dataset("goals").to_table(filter=related_filter)
+        for key, is_home, scorer, minute, team, assist, penalty, own_goal in _rows(
+            goals,
+            ["match_key", "is_home", "scorer", "minute", "team", "assist"]
+            + ["penalty", "own_goal"],
+        ):
+            goal = Goal(
+                scorer=scorer,
+                minute=minute or 0,
+                team=team,
+                assist=assist,
+                penalty=bool(penalty),
+                own_goal=bool(own_goal),
+            )
+            goals_by_match.setdefault(key, ([], []))[0 if is_home else 1].append(goal)
+
+        players_by_match: Dict[str, tuple] = {}
+        lineups = (
+            self._dataset("lineups")
+            .to_table(filter=related_filter)
+            .sort_by([("slot", "ascending")])
+        )
+        for key, is_home, name, position, number in _rows(
+            lineups, ["match_key", "is_home", "player", "position", "number"]
+        ):
+            player = Player(name=name, position=position, number=number)
+            players_by_match.setdefault(key, ([], []))[0 if is_home else 1].append(
+                player
+            )
+
+        games = []
+        for (
+            key,
+            season,
+            matchday,
+            date,
+            home_name,
+            away_name,
+            home_score,
+            away_score,
+            stadium,
+            attendance,
+        ) in _rows(
+            matches,
+            ["match_key", "season", "matchday", "date", "home_team", "away_team"]
+            + ["home_score", "away_score", "stadium", "attendance"],
+        ):
+            home_goals, away_goals = goals_by_match.get(key, ([], []))
+            home_players, away_players = players_by_match.get(key, ([], []))
+            games.append(
+                GameData(
+                    home_team=Team(name=home_name, players=home_players),
+                    away_team=Team(name=away_name, players=away_players),
+                    date=date,
+                    home_score=home_score,
+                    away_score=away_score,
+                    season=season,
+                    home_goals=home_goals,
+                    away_goals=away_goals,
+                    matchday=matchday,
+                    stadium=stadium,
+                    attendance=attendance,
+                    url=None if key.startswith("local:") else key,
+                )
+            )
+
+        return games
+
+
+def _rows(table: "pa.Table", columns: List[str]):
+    """Iteriert spaltenweise konvertierte Zeilen (schneller als to_pylist())."""
+    return zip(*(table.column(name).to_pylist() for name in columns))
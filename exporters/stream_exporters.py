@@ -0,0 +1,72 @@
+"""
+Streamende Text-Exporter (CSV und JSON Lines)
+
+Schreiben Zeile für Zeile direkt aus den GameData-Objekten in die Datei -
+ohne DataFrame und ohne Formatierung. Der schnelle Weg für alle, die kein
+gestyltes Excel benötigen.
+"""
+
+import csv
+import io
+import json
+from typing import BinaryIO, List
+
+from models.game_data import GameData
+from .base_exporter import BaseExporter, OVERVIEW_COLUMNS
+from .backup_manager import atomic_target
+
+
+class CsvExporter(BaseExporter):
+    """Exportiert Spiele als CSV (eine Zeile pro Spiel)."""
+
+    extension = ".csv"
+    mime = "text/csv"
+
+    def export(self, games: List[GameData], filename: str = None) -> str:
+        if not games:
+            raise ValueError("Keine Spiele zum Exportieren vorhanden")
+
+        filepath = self.output_dir / (filename or self._default_filename(games))
+        with atomic_target(filepath) as tmp_path:
+            with open(tmp_path, "wb") as f:
+                self._write_to(games, f)
+
+        return str(filepath)
+
+    def _write_to(self, games: List[GameData], stream: BinaryIO):
+        # utf-8-sig, damit Excel Umlaute beim Öffnen korrekt erkennt
+        text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        writer = csv.writer(text, delimiter=";")
+        writer.writerow(OVERVIEW_COLUMNS)
+        for game in games:
+            writer.writerow(self._overview_row(game))
+        text.flush()
+        text.detach()
+
+
+class JsonLinesExporter(BaseExporter):
+    """Exportiert Spiele als JSON Lines (ein JSON-Objekt pro Zeile)."""
+
+    extension = ".jsonl"
+    mime = "application/x-ndjson"
+
+    def export(self, games: List[GameData], filename: str = None) -> str:
+        if not games:
+            raise ValueError("Keine Spiele zum Exportieren vorhanden")
+
+        filepath = self.output_dir / (filename or self._default_filename(games))
+        with atomic_target(filepath) as tmp_path:
+            with open(tmp_path, "wb") as f:
+                self._write_to(games, f)
+
+        return str(filepath)
+
+    def _write_to(self, games: List[GameData], stream: BinaryIO):
+        text = io.TextIOWrapper(stream, encoding="utf-8")
+        for game in games:
+            record = dict(zip(OVERVIEW_COLUMNS, self._overview_row(game)))
+            record["URL"] = game.url
+            text.write(json.dumps(record, ensure_ascii=False))
+            text.write("\n")
+        text.flush()
+        text.detach()
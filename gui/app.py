@@ -5,7 +5,8 @@ Bundesliga Scraper - Moderne Streamlit GUI (Clean Design)
 import streamlit as st
 import asyncio
 import pandas as pd
-from typing import List, Optional
+import numpy as np
+from typing import Iterable, List, Optional
 import os
 import sys
 import time
@@ -22,8 +23,32 @@ sys.path.insert(0, str(parent_dir))
 try:
     from models.game_data import GameData
     from scrapers.kicker_scraper import KickerScraper
-    from exporters.excel_exporter_new import ExcelExporter
+    from exporters.excel_exporter_new import ExcelExporter, SPLIT_MODE_LABELS
     from exporters.merge_service import MergeService
+    from exporters.export_formats import (
+        EXPORT_FORMATS,
+        get_exporter,
+        normalize_export_format,
+    )
+    from storage.match_database import MatchDatabase
+    from storage.columnar_store import ColumnarMatchStore
+    from storage.html_archive import HtmlArchive
+    from config.settings_manager import (
+        get_database_path,
+        get_columnar_store_path,
+        get_elo_settings,
+        get_settings_manager,
+    )
+    from analytics.elo import EloRatings
+    from analytics.goal_model import GoalModel
+    from analytics.goal_timing import TIMING_GROUPS, bucket_labels, timing_shares
+    from analytics.head_to_head import HeadToHead
+    from analytics.league_table import LeagueTable, points_for_win
+    from analytics.match_query import MatchQuery
+    from analytics.season_simulator import DEFAULT_SIMULATIONS, SeasonSimulator
+    from analytics.stats_aggregator import StatsAggregator
+    from analytics.views import MaterializedViews
+    from models.columnar import season_start_year
 except ImportError as e:
     st.error(f"Import-Fehler: {e}")
     st.stop()
@@ -33,6 +58,24 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@st.cache_resource
+def get_match_database() -> MatchDatabase:
+    """Öffnet die Spiele-Datenbank einmal pro Streamlit-Prozess."""
+    return MatchDatabase(get_database_path())
+
+
+@st.cache_resource
+def get_columnar_store() -> ColumnarMatchStore:
+    """Memory-mapped Spaltenspeicher für schnelle Anzeige und Statistiken."""
+    return ColumnarMatchStore(get_columnar_store_path())
+
+
+@st.cache_resource
+def get_html_archive() -> Optional[HtmlArchive]:
+    """HTML-Archiv (nur wenn in den Einstellungen aktiviert)."""
+    return HtmlArchive.from_settings()
+
+
 def init_page_config():
     """Initialisiert die Seiten-Konfiguration mit modernem Design."""
     st.set_page_config(
@@ -213,37 +256,18 @@ def show_header():
     )
 
 
-def show_stats_cards(games_data: List[GameData]):
-    """Zeigt Statistik-Karten an."""
-    if not games_data:
+def show_stats_cards(stats: StatsAggregator):
+    """Zeigt Statistik-Karten aus den laufenden Kennzahlen an."""
+    if not stats.total_games:
         return
 
     col1, col2, col3, col4 = st.columns(4)
-
-    with col1:
-        total_games = len(games_data)
-        st.metric("Gesamte Spiele", total_games, help="Anzahl der geladenen Spiele")
-
-    with col2:
-        total_goals = sum(
-            game.home_score + game.away_score
-            for game in games_data
-            if game.home_score is not None and game.away_score is not None
-        )
-        st.metric("Tore insgesamt", total_goals, help="Alle geschossenen Tore")
-
-    with col3:
-        seasons = len(set(game.season for game in games_data if game.season))
-        st.metric("Saisons", seasons, help="Verschiedene Saisons")
-
-    with col4:
-        teams = len(
-            set(
-                [game.home_team for game in games_data]
-                + [game.away_team for game in games_data]
-            )
-        )
-        st.metric("Vereine", teams, help="Verschiedene Vereine")
+    col1.metric(
+        "Gesamte Spiele", stats.total_games, help="Anzahl der geladenen Spiele"
+    )
+    col2.metric("Tore insgesamt", stats.total_goals, help="Alle geschossenen Tore")
+    col3.metric("Saisons", stats.season_count, help="Verschiedene Saisons")
+    col4.metric("Vereine", stats.team_count, help="Verschiedene Vereine")
 
 
 class ModernBundesligaApp:
@@ -251,19 +275,71 @@ class ModernBundesligaApp:
 
     def __init__(self):
         # Initialisiere Komponenten
-        self.scraper = KickerScraper()
+        self.scraper = KickerScraper(archive=get_html_archive())
         self.exporter = ExcelExporter()
         self.exporter.output_dir = Path("exports")
         self.merger = MergeService()
-        self.games_data: List[GameData] = []
 
-        # Session State initialisieren
-        if "games_data" not in st.session_state:
-            st.session_state.games_data = []
+        self.database = get_match_database()
+        self.columnar_store = get_columnar_store()
+
+        # Session State initialisieren - Spiele werden nur bei Bedarf geladen
+        # (Statistiken und Filter arbeiten auf dem Spaltenspeicher)
+        if "match_columns" not in st.session_state:
+            try:
+                st.session_state.match_columns = self.columnar_store.open()
+                if (
+                    st.session_state.match_columns is None
+                    and self.database.count_games()
+                ):
+                    self.refresh_match_columns()
+            except Exception as e:
+                logger.error(f"Fehler beim Öffnen des Spaltenspeichers: {e}")
+                st.session_state.match_columns = None
+        if "stats" not in st.session_state:
+            # Einmal aufbauen, danach nur noch pro Spiel fortschreiben
+            st.session_state.stats = StatsAggregator.from_columns(
+                st.session_state.match_columns
+            )
+        if "views" not in st.session_state:
+            # Kennzahl-Tabellen bleiben zwischen Reruns erhalten
+            st.session_state.views = MaterializedViews(st.session_state.match_columns)
+        if "head_to_head" not in st.session_state:
+            st.session_state.head_to_head = HeadToHead.from_columns(
+                st.session_state.match_columns
+            )
         if "last_update" not in st.session_state:
             st.session_state.last_update = None
         if "export_dir" not in st.session_state:
             st.session_state.export_dir = "exports"
+        if "export_format" not in st.session_state:
+            # Gespeichertes Format gilt auch, bevor der Einstellungs-Tab offen war
+            st.session_state.export_format = normalize_export_format(
+                get_settings_manager().get_export_format()
+            )
+        if "save_exports" not in st.session_state:
+            st.session_state.save_exports = True
+
+    def refresh_match_columns(self, seasons: Optional[Iterable[str]] = None):
+        """
+        Baut den Spaltenspeicher nach Datenbankänderungen neu auf.
+
+        Args:
+            seasons: Saisons mit neuen Spielen (None = alle Sichten komplett neu)
+        """
+        self.columnar_store.write_from_database(self.database)
+        st.session_state.match_columns = self.columnar_store.open()
+        if st.session_state.get("views") is not None:
+            st.session_state.views.update(st.session_state.match_columns, seasons)
+        if (
+            st.session_state.get("elo") is not None
+            and st.session_state.match_columns is not None
+        ):
+            # Neue Spiele werden fortgeschrieben, nicht alles neu gerechnet
+            st.session_state.elo.update(st.session_state.match_columns)
+        # Tabellen und Filter-Indizes beim nächsten Aufruf neu berechnen
+        st.session_state.league_table = None
+        st.session_state.match_query = None
 
     def run(self):
         """Startet die Anwendung."""
@@ -318,48 +394,57 @@ class ModernBundesligaApp:
         st.header("📊 Dashboard")
 
         # Stats Cards
-        show_stats_cards(st.session_state.games_data)
+        show_stats_cards(st.session_state.stats)
+
+        columns = st.session_state.get("match_columns")
+        if columns is not None and len(columns):
+            views: MaterializedViews = st.session_state.views
+            col1, col2 = st.columns(2)
+            with col1:
+                st.subheader("🏆 Top Vereine")
+                top_teams = views.get("team_summary").head(5)
+                st.dataframe(
+                    top_teams[["Verein", "Spiele", "Siege", "Tore"]],
+                    use_container_width=True,
+                    hide_index=True,
+                )
+            with col2:
+                st.subheader("🥇 Top-Torschützen")
+                st.dataframe(
+                    views.get("scorer_table").head(5),
+                    use_container_width=True,
+                    hide_index=True,
+                )
 
-        if st.session_state.games_data:
             st.subheader("🔍 Spiele-Filter")
 
             col1, col2, col3 = st.columns(3)
 
             with col1:
-                seasons = sorted(
-                    set(
-                        game.season
-                        for game in st.session_state.games_data
-                        if game.season
-                    )
-                )
+                seasons = st.session_state.stats.season_names()
                 selected_season = st.selectbox("Saison:", ["Alle"] + seasons)
 
             with col2:
-                teams = sorted(
-                    set(
-                        [game.home_team for game in st.session_state.games_data]
-                        + [game.away_team for game in st.session_state.games_data]
-                    )
-                )
+                teams = st.session_state.stats.team_names()
                 selected_team = st.selectbox("Verein:", ["Alle"] + teams)
 
             with col3:
                 min_goals = st.number_input("Min. Tore:", min_value=0, value=0)
 
             # Gefilterte Daten anzeigen
-            filtered_games = self.filter_games(
-                st.session_state.games_data, selected_season, selected_team, min_goals
-            )
+            rows = self.filter_games(selected_season, selected_team, min_goals)
 
-            if filtered_games:
-                st.subheader(f"📋 Gefilterte Spiele ({len(filtered_games)})")
-                df = self.games_to_dataframe(filtered_games)
+            if len(rows):
+                st.subheader(f"📋 Gefilterte Spiele ({len(rows)})")
+                df = columns.to_dataframe(rows)
                 st.dataframe(df, use_container_width=True)
 
                 # Export Button
                 if st.button("📥 Gefilterte Daten exportieren"):
-                    self.export_games(filtered_games, "filtered_games")
+                    keys = st.session_state.match_query.match_keys(rows)
+                    self.export_games(
+                        self.database.load_games(keys=keys), "filtered_games"
+                    )
         else:
             st.info(
                 "📥 Laden Sie zunächst Spieldaten über 'Batch Download' oder 'Einzelspiele'."
@@ -455,111 +540,315 @@ class ModernBundesligaApp:
         """Zeigt detaillierte Statistiken."""
         st.header("📈 Detaillierte Statistiken")
 
-        if not st.session_state.games_data:
+        stats: StatsAggregator = st.session_state.stats
+        if not stats.total_games:
             st.info("📥 Laden Sie zunächst Spieldaten.")
             return
 
-        games = st.session_state.games_data
-
         # Grundstatistiken
         col1, col2, col3, col4 = st.columns(4)
 
         with col1:
-            total_games = len(games)
-            st.metric("🎯 Gesamte Spiele", total_games)
+            st.metric("🎯 Gesamte Spiele", stats.total_games)
 
         with col2:
-            total_goals = sum(
-                game.home_score + game.away_score
-                for game in games
-                if game.home_score is not None and game.away_score is not None
-            )
-            avg_goals = total_goals / total_games if total_games > 0 else 0
-            st.metric("⚽ Durchschn. Tore/Spiel", f"{avg_goals:.2f}")
+            st.metric("⚽ Durchschn. Tore/Spiel", f"{stats.average_goals:.2f}")
 
         with col3:
-            high_scoring = sum(
-                1
-                for game in games
-                if game.home_score is not None
-                and game.away_score is not None
-                and (game.home_score + game.away_score) >= 4
-            )
-            st.metric("🔥 Torspektakel (4+ Tore)", high_scoring)
+            st.metric("🔥 Torspektakel (4+ Tore)", stats.high_scoring)
 
         with col4:
-            draws = sum(
-                1
-                for game in games
-                if game.home_score is not None
-                and game.away_score is not None
-                and game.home_score == game.away_score
-            )
-            st.metric("🤝 Unentschieden", draws)
+            st.metric("🤝 Unentschieden", stats.draws)
+
+        # Bundesliga-Tabelle
+        self.show_league_table()
+
+        # Monte-Carlo-Prognose der laufenden Saison
+        self.show_season_forecast()
 
         # Top Teams
         st.subheader("🏆 Top Vereine")
 
-        team_stats = {}
-        for game in games:
-            if game.home_score is not None and game.away_score is not None:
-                # Home team
-                if game.home_team not in team_stats:
-                    team_stats[game.home_team] = {
-                        "games": 0,
-                        "wins": 0,
-                        "goals_for": 0,
-                        "goals_against": 0,
-                    }
+        views: MaterializedViews = st.session_state.views
+        st.dataframe(
+            views.get("team_summary").head(10),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+        # Saisonübersicht und Ergebnisverteilung
+        st.subheader("📅 Saisonübersicht")
+        st.dataframe(
+            views.get("season_summary"), use_container_width=True, hide_index=True
+        )
+
+        st.subheader("🔢 Häufigste Ergebnisse")
+        scorelines = views.get("scoreline_distribution")
+        if len(scorelines):
+            st.bar_chart(scorelines.head(15).set_index("Ergebnis")["Anzahl"])
+
+        # Torminuten nach Ära, Saison und Verein
+        self.show_goal_timing(views)
+
+        # Direkter Vergleich
+        self.show_head_to_head(stats)
+
+        # Torjäger und Spielerkarrieren
+        self.show_player_stats(stats)
+
+    def show_goal_timing(self, views: MaterializedViews):
+        """Zeigt die Verteilung der Torminuten in 15-Minuten-Abschnitten."""
+        st.subheader("⏱️ Torminuten")
+
+        eras = views.get("goal_timing_era")
+        if not len(eras):
+            st.info("Keine Torminuten erfasst.")
+            return
+        st.bar_chart(eras[bucket_labels()].sum())
+
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            level = st.radio(
+                "Aufteilung:",
+                list(TIMING_GROUPS.values()),
+                index=2,
+                horizontal=True,
+                key="timing_level",
+            )
+        with col2:
+            as_shares = st.checkbox("Anteile in %", key="timing_shares")
+
+        by = {label: key for key, label in TIMING_GROUPS.items()}[level]
+        frame = views.get(f"goal_timing_{by}")
+        if as_shares:
+            frame = timing_shares(frame)
+        st.dataframe(frame, use_container_width=True, hide_index=True)
+
+    def show_head_to_head(self, stats: StatsAggregator):
+        """Zeigt die Bilanz zweier Vereine und eines Vereins gegen alle Gegner."""
+        head_to_head: HeadToHead = st.session_state.head_to_head
+        teams = stats.team_names()
+        if len(teams) < 2:
+            return
 
-                team_stats[game.home_team]["games"] += 1
-                team_stats[game.home_team]["goals_for"] += game.home_score
-                team_stats[game.home_team]["goals_against"] += game.away_score
+        st.subheader("⚔️ Direkter Vergleich")
+        col1, col2 = st.columns(2)
+        with col1:
+            team = st.selectbox("Verein:", teams, key="h2h_team")
+        with col2:
+            opponents = [name for name in teams if name != team]
+            opponent = st.selectbox("Gegner:", opponents, key="h2h_opponent")
 
-                if game.home_score > game.away_score:
-                    team_stats[game.home_team]["wins"] += 1
+        record = head_to_head.record(team, opponent)
+        total = record["total"]
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("🎯 Spiele", total.games)
+        with col2:
+            st.metric(f"✅ Siege {team}", total.wins)
+        with col3:
+            st.metric("🤝 Unentschieden", total.draws)
+        with col4:
+            st.metric(f"✅ Siege {opponent}", total.losses)
 
-                # Away team
-                if game.away_team not in team_stats:
-                    team_stats[game.away_team] = {
-                        "games": 0,
-                        "wins": 0,
-                        "goals_for": 0,
-                        "goals_against": 0,
+        st.dataframe(
+            pd.DataFrame(
+                [
+                    {
+                        "": label,
+                        "Spiele": counters.games,
+                        "S": counters.wins,
+                        "U": counters.draws,
+                        "N": counters.losses,
+                        "Tore": f"{counters.goals_for}:{counters.goals_against}",
                     }
+                    for label, counters in (
+                        ("Heim", record["home"]),
+                        ("Auswärts", record["away"]),
+                        ("Gesamt", total),
+                    )
+                ]
+            ),
+            use_container_width=True,
+            hide_index=True,
+        )
 
-                team_stats[game.away_team]["games"] += 1
-                team_stats[game.away_team]["goals_for"] += game.away_score
-                team_stats[game.away_team]["goals_against"] += game.home_score
+        with st.expander(f"📋 {team} gegen alle Gegner"):
+            st.dataframe(
+                head_to_head.to_frame(team).drop(columns="Verein"),
+                use_container_width=True,
+                hide_index=True,
+            )
 
-                if game.away_score > game.home_score:
-                    team_stats[game.away_team]["wins"] += 1
+    def show_player_stats(self, stats: StatsAggregator):
+        """Zeigt Torjägerlisten und Karrieredaten aus dem Spielerindex."""
+        st.subheader("👟 Torjäger")
 
-        # Top Teams DataFrame
-        team_df_data = []
-        for team, stats in team_stats.items():
-            win_rate = (
-                (stats["wins"] / stats["games"] * 100) if stats["games"] > 0 else 0
+        col1, col2 = st.columns(2)
+        with col1:
+            team = st.selectbox(
+                "Verein:", ["Alle"] + stats.team_names(), key="scorer_team"
             )
-            avg_goals = (
-                (stats["goals_for"] / stats["games"]) if stats["games"] > 0 else 0
+        with col2:
+            season = st.selectbox(
+                "Saison:",
+                ["Alle"] + list(reversed(stats.season_names())),
+                key="scorer_season",
             )
 
-            team_df_data.append(
-                {
-                    "Verein": team,
-                    "Spiele": stats["games"],
-                    "Siege": stats["wins"],
-                    "Siegquote (%)": f"{win_rate:.1f}",
-                    "Tore": stats["goals_for"],
-                    "Ø Tore/Spiel": f"{avg_goals:.1f}",
-                }
+        scorers = self.database.top_scorers(
+            team=None if team == "Alle" else team,
+            season=None if season == "Alle" else season,
+        )
+        if scorers:
+            st.dataframe(
+                pd.DataFrame(
+                    [
+                        {
+                            "Spieler": row["player"],
+                            "Tore": row["goals"],
+                            "Elfmeter": row["penalties"],
+                            "Einsätze": row["appearances"],
+                            "Saisons": row["seasons"],
+                        }
+                        for row in scorers
+                    ]
+                ),
+                use_container_width=True,
             )
+        else:
+            st.info("Keine Torschützen für diese Auswahl erfasst.")
 
-        team_df = pd.DataFrame(team_df_data)
-        team_df = team_df.sort_values("Siege", ascending=False).head(10)
+        st.subheader("🧑 Spielerkarriere")
+        search = st.text_input("Spieler suchen:", key="player_search")
+        if not search:
+            return
+        players = self.database.find_players(search)
+        if not players:
+            st.info(f"Kein Spieler zu '{search}' gefunden.")
+            return
+
+        player = st.selectbox("Spieler:", players, key="player_select")
+        clubs = self.database.player_clubs(player)
+        career = self.database.player_career(player)
+
+        st.markdown(
+            " → ".join(
+                f"**{club['team']}** ({club['first_season']}–{club['last_season']})"
+                for club in clubs
+            )
+        )
+        st.dataframe(
+            pd.DataFrame(
+                [
+                    {
+                        "Saison": row["season"],
+                        "Verein": row["team"],
+                        "Einsätze": row["appearances"],
+                        "Tore": row["goals"],
+                        "Elfmeter": row["penalties"],
+                        "Eigentore": row["own_goals"],
+                    }
+                    for row in career
+                ]
+            ),
+            use_container_width=True,
+        )
+
+    def show_league_table(self):
+        """Zeigt die Tabelle einer Saison nach einem wählbaren Spieltag."""
+        columns = st.session_state.get("match_columns")
+        if columns is None or not len(columns):
+            return
+
+        if st.session_state.get("league_table") is None:
+            st.session_state.league_table = LeagueTable(columns)
+        table = st.session_state.league_table
+        if st.session_state.get("elo") is None:
+            st.session_state.elo = EloRatings(columns, **get_elo_settings())
+        elo: EloRatings = st.session_state.elo
+
+        st.subheader("📋 Tabelle")
+        seasons = list(reversed(table.seasons))
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            season = st.selectbox("Saison:", seasons, key="table_season")
+        last_matchday = table.matchdays(season)
+        with col2:
+            if last_matchday > 1:
+                matchday = st.slider(
+                    "Nach Spieltag:",
+                    min_value=1,
+                    max_value=last_matchday,
+                    value=last_matchday,
+                    key=f"table_matchday_{season}",
+                )
+            else:
+                matchday = last_matchday
+
+        st.dataframe(
+            elo.annotate(table.standings(season, matchday), season, matchday),
+            use_container_width=True,
+            hide_index=True,
+        )
 
-        st.dataframe(team_df, use_container_width=True)
+    def show_season_forecast(self):
+        """Simuliert die ausstehenden Spiele einer Saison und zeigt die Chancen."""
+        columns = st.session_state.get("match_columns")
+        table: Optional[LeagueTable] = st.session_state.get("league_table")
+        if columns is None or table is None:
+            return
+
+        st.subheader("🎲 Saisonprognose")
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            season = st.selectbox(
+                "Saison:", list(reversed(table.seasons)), key="forecast_season"
+            )
+        with col2:
+            simulations = st.select_slider(
+                "Simulationen:",
+                options=[10_000, 100_000, DEFAULT_SIMULATIONS],
+                value=DEFAULT_SIMULATIONS,
+                format_func=lambda n: f"{n:,}".replace(",", "."),
+                key="forecast_simulations",
+            )
+        with col3:
+            st.write("")
+            start = st.button("🎲 Simulieren", use_container_width=True)
+
+        if start:
+            with st.spinner("🔄 Lade ausstehende Spiele und simuliere..."):
+                rows = self.filter_games(season, "Alle", 0)
+                known = st.session_state.match_query.match_keys(rows)
+                fixtures = asyncio.run(
+                    self.scraper.get_remaining_fixtures(season, known)
+                )
+                if not fixtures:
+                    st.info("✅ Keine ausstehenden Spiele - die Saison ist abgeschlossen.")
+                    return
+
+                if st.session_state.get("goal_model") is None:
+                    st.session_state.goal_model = GoalModel()
+                model: GoalModel = st.session_state.goal_model
+                model.fit(columns, [season])  # unveränderte Saisons werden übersprungen
+
+                simulator = SeasonSimulator.from_goal_model(
+                    table.standings(season),
+                    [(home, away) for _, _, home, away in fixtures],
+                    model.fits[season],
+                    win_points=points_for_win(season_start_year(season)),
+                )
+                st.session_state.forecast = (season, simulator.run(simulations))
+
+        forecast = st.session_state.get("forecast")
+        if forecast is not None and forecast[0] == season:
+            result = forecast[1]
+            st.caption(
+                f"{result.simulations:,} Simulationen in {result.elapsed:.1f} s "
+                f"({result.seasons_per_second:,.0f} Saisons/s)"
+            )
+            st.dataframe(result.to_frame(), use_container_width=True, hide_index=True)
 
     def show_settings(self):
         """Zeigt die Einstellungen."""
@@ -602,10 +891,33 @@ class ModernBundesligaApp:
             st.subheader("📁 Export-Einstellungen")
 
             # Export Format
+            format_labels = list(EXPORT_FORMATS)
             export_format = st.selectbox(
                 "Standard-Exportformat:",
-                ["Excel (.xlsx)", "CSV (.csv)", "JSON (.json)"],
-                index=0,
+                format_labels,
+                index=format_labels.index(
+                    normalize_export_format(st.session_state.get("export_format"))
+                ),
+                help="CSV, JSON Lines und Parquet sind deutlich schneller als Excel",
+            )
+            st.session_state.export_format = export_format
+
+            # Aufteilung großer Exporte
+            split_labels = list(SPLIT_MODE_LABELS)
+            st.session_state.export_split = st.selectbox(
+                "Aufteilung:",
+                split_labels,
+                index=split_labels.index(
+                    st.session_state.get("export_split", split_labels[0])
+                ),
+                help="Große Exporte als eine Arbeitsmappe pro Saison oder Verein",
+            )
+
+            # Exporte zusätzlich auf der Platte ablegen
+            st.session_state.save_exports = st.checkbox(
+                "Exporte im Export-Verzeichnis speichern",
+                value=st.session_state.get("save_exports", True),
+                help="Ohne Häkchen werden Exporte nur im Speicher erzeugt und direkt zum Download angeboten",
             )
 
             # Include Extended Data
@@ -689,6 +1001,9 @@ class ModernBundesligaApp:
                 "export_directory": new_output_dir,
             }
 
+            # Export-Format dauerhaft speichern (gilt auch für die Tkinter-GUI)
+            get_settings_manager().set_export_format(export_format)
+
             # Update exporter with new directory
             self.exporter.output_dir = Path(new_output_dir)
 
@@ -734,7 +1049,8 @@ class ModernBundesligaApp:
                 st.success("✅ Session-Daten gelöscht!")
 
         with col3:
-            games_count = len(st.session_state.get("games_data", []))
+            stats = st.session_state.get("stats")
+            games_count = stats.total_games if stats is not None else 0
             st.metric("💾 Geladene Spiele", games_count)
 
     def show_license(self):
@@ -849,54 +1165,11 @@ class ModernBundesligaApp:
             "⚠️ **Wichtiger Hinweis**: Durch die Nutzung dieser Software stimmen Sie automatisch den oben genannten Lizenzbedingungen zu."
         )
 
-    def filter_games(
-        self, games: List[GameData], season: str, team: str, min_goals: int
-    ) -> List[GameData]:
-        """Filtert Spiele nach den angegebenen Kriterien."""
-        filtered = games
-
-        if season != "Alle":
-            filtered = [game for game in filtered if game.season == season]
-
-        if team != "Alle":
-            filtered = [
-                game for game in filtered if team in [game.home_team, game.away_team]
-            ]
-
-        if min_goals > 0:
-            filtered = [
-                game
-                for game in filtered
-                if game.home_score is not None
-                and game.away_score is not None
-                and (game.home_score + game.away_score) >= min_goals
-            ]
-
-        return filtered
-
-    def games_to_dataframe(self, games: List[GameData]) -> pd.DataFrame:
-        """Konvertiert Spieldaten zu DataFrame."""
-        data = []
-        for game in games:
-            data.append(
-                {
-                    "Datum": game.date.strftime("%d.%m.%Y") if game.date else "N/A",
-                    "Saison": game.season or "N/A",
-                    "Heimteam": game.home_team or "N/A",
-                    "Auswärtsteam": game.away_team or "N/A",
-                    "Ergebnis": (
-                        f"{game.home_score}:{game.away_score}"
-                        if game.home_score is not None and game.away_score is not None
-                        else "N/A"
-                    ),
-                    "Tore gesamt": (game.home_score or 0) + (game.away_score or 0),
-                    "Torschützen": (
-                        ", ".join(game.goalscorers) if game.goalscorers else "N/A"
-                    ),
-                }
-            )
-
-        return pd.DataFrame(data)
+    def filter_games(self, season: str, team: str, min_goals: int) -> np.ndarray:
+        """Filtert Spiele über die Indizes der MatchQuery (Zeilen in match_columns)."""
+        if st.session_state.get("match_query") is None:
+            st.session_state.match_query = MatchQuery(st.session_state.match_columns)
+        return st.session_state.match_query.filter(season, team, min_goals)
 
     def start_batch_download(
         self, seasons: List[str], speed_profile: str, max_workers: int
@@ -921,7 +1194,9 @@ class ModernBundesligaApp:
                 import asyncio
                 
                 # Create scraper with appropriate delay
-                scraper = KickerScraper(rate_limit_delay=delay)
+                scraper = KickerScraper(
+                    rate_limit_delay=delay, archive=get_html_archive()
+                )
                 
                 # Run the async batch download
                 status_text.text("� Initialisiere Download...")
@@ -1001,39 +1276,40 @@ class ModernBundesligaApp:
                     # Update detailed progress
                     progress_details.text(f"🔄 {status}")
                 
-                # Run with progress callback
-                games = asyncio.run(scraper.batch_download_with_progress(seasons, update_progress))
+                # Run with progress callback - Spiele direkt in die Datenbank streamen
+                with self.database.batch_writer() as db_writer:
+
+                    def store_game(game: GameData):
+                        db_writer.add(game)
+                        st.session_state.stats.add(game)
+                        st.session_state.head_to_head.add(game)
+
+                    games = asyncio.run(
+                        scraper.batch_download_with_progress(
+                            seasons, update_progress, game_callback=store_game
+                        )
+                    )
                 
                 # Store games in session state
                 st.session_state["current_games"] = games
+                self.refresh_match_columns({game.season for game in games})
                 
-                # Auto-export to Excel
+                # Auto-export im eingestellten Format
                 if games:
-                    export_filename = f"bundesliga_batch_{len(games)}_spiele.xlsx"
-                    
-                    # Ensure exports directory exists
-                    export_dir = st.session_state.get("export_dir", "exports")
-                    os.makedirs(export_dir, exist_ok=True)
-                    
-                    # Use ExcelExporter
-                    exporter = ExcelExporter()
-                    exporter.set_output_directory(export_dir)
-                    exported_file = exporter.export_by_team(games, export_filename)
+                    exported_file, data, exporter = self.export_with_format(
+                        games, f"bundesliga_batch_{len(games)}_spiele"
+                    )
                     
                     progress_bar.progress(1.0)
                     status_text.text("✅ Download abgeschlossen!")
                     
                     st.success(f"✅ {len(seasons)} Saison(en) erfolgreich heruntergeladen!")
-                    st.success(f"📁 {len(games)} Spiele in {exported_file} exportiert!")
+                    if exported_file:
+                        st.success(f"📁 {len(games)} Spiele in {exported_file} exportiert!")
                     
-                    # Download button for the exported file
-                    with open(exported_file, "rb") as file:
-                        st.download_button(
-                            label="📥 Excel-Datei herunterladen",
-                            data=file.read(),
-                            file_name=os.path.basename(exported_file),
-                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                        )
+                    self.offer_download(
+                        exported_file, data, exporter, f"bundesliga_batch_{len(games)}_spiele"
+                    )
 
             except Exception as e:
                 st.error(f"❌ Fehler beim Download: {str(e)}")
@@ -1045,7 +1321,7 @@ class ModernBundesligaApp:
                 import asyncio
                 
                 # Create scraper
-                scraper = KickerScraper()
+                scraper = KickerScraper(archive=get_html_archive())
                 
                 # Process URLs asynchronously
                 games = []
@@ -1059,35 +1335,88 @@ class ModernBundesligaApp:
                 current_games = st.session_state.get("current_games", [])
                 current_games.extend(games)
                 st.session_state["current_games"] = current_games
+                if games:
+                    self.database.upsert_games(games)
+                    for game in games:
+                        st.session_state.stats.add(game)
+                        st.session_state.head_to_head.add(game)
+                    self.refresh_match_columns({game.season for game in games})
                 
-                # Auto-export to Excel
+                # Auto-export im eingestellten Format
                 if games:
-                    export_filename = f"einzelspiele_{len(games)}.xlsx"
-                    
-                    # Ensure exports directory exists
-                    export_dir = st.session_state.get("export_dir", "exports")
-                    os.makedirs(export_dir, exist_ok=True)
-                    
-                    # Use ExcelExporter
-                    exporter = ExcelExporter()
-                    exporter.set_output_directory(export_dir)
-                    exported_file = exporter.export_by_team(games, export_filename)
+                    exported_file, data, exporter = self.export_with_format(
+                        games, f"einzelspiele_{len(games)}"
+                    )
                     
                     st.success(f"✅ {len(games)} Spiel(e) erfolgreich hinzugefügt!")
-                    st.success(f"📁 Daten in {exported_file} exportiert!")
+                    if exported_file:
+                        st.success(f"📁 Daten in {exported_file} exportiert!")
                     
-                    # Download button for the exported file
-                    with open(exported_file, "rb") as file:
-                        st.download_button(
-                            label="📥 Excel-Datei herunterladen",
-                            data=file.read(),
-                            file_name=os.path.basename(exported_file),
-                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                        )
+                    self.offer_download(
+                        exported_file, data, exporter, f"einzelspiele_{len(games)}"
+                    )
 
             except Exception as e:
                 st.error(f"❌ Fehler bei der URL-Verarbeitung: {str(e)}")
 
+    def export_with_format(self, games: List[GameData], base_name: str):
+        """
+        Exportiert Spiele im eingestellten Format.
+
+        Einzelne Dateien werden direkt in einen Speicherpuffer geschrieben,
+        der an den Download-Button geht. Ins Export-Verzeichnis wird nur
+        geschrieben, wenn "Exporte im Export-Verzeichnis speichern" aktiv ist
+        (oder das Format Verzeichnisse bzw. mehrere Dateien erzeugt).
+
+        Returns:
+            Tuple aus Pfad der Exportdatei (None ohne Speichern), Puffer für
+            den Download (None, wenn nur auf der Platte) und Exporter
+        """
+        export_dir = st.session_state.get("export_dir", "exports")
+        os.makedirs(export_dir, exist_ok=True)
+
+        exporter = get_exporter(st.session_state.get("export_format"), export_dir)
+        filename = f"{base_name}{exporter.extension}"
+
+        split_mode = SPLIT_MODE_LABELS.get(st.session_state.get("export_split"))
+        if split_mode and isinstance(exporter, ExcelExporter):
+            exported_file = exporter.export_split(
+                games, split_mode, skip_unchanged=True
+            )
+            data = None
+        elif not exporter.supports_buffer:
+            exported_file = exporter.export_if_changed(games, filename)
+            data = None
+        elif st.session_state.get("save_exports", True):
+            exported_file, data = exporter.export_with_buffer(games, filename)
+        else:
+            return None, exporter.export_to_buffer(games), exporter
+
+        if exporter.last_export_skipped:
+            st.info(f"ℹ️ {os.path.basename(exported_file)} ist bereits aktuell")
+        return exported_file, data, exporter
+
+    def offer_download(
+        self, exported_file: Optional[str], data, exporter, base_name: str
+    ):
+        """Download-Button für einen Export (nicht für Verzeichnisse)."""
+        if data is None:
+            if not exported_file or not os.path.isfile(exported_file):
+                return
+            data = open(exported_file, "rb")
+        file_name = (
+            os.path.basename(exported_file)
+            if exported_file
+            else f"{base_name}{exporter.extension}"
+        )
+        with data:
+            st.download_button(
+                label="📥 Export herunterladen",
+                data=data,
+                file_name=file_name,
+                mime=exporter.mime,
+            )
+
     def process_uploaded_file(self, uploaded_file):
         """Verarbeitet eine hochgeladene Datei."""
         try:
@@ -1115,32 +1444,15 @@ class ModernBundesligaApp:
             st.error(f"❌ Fehler beim Lesen der Datei: {str(e)}")
 
     def export_games(self, games: List[GameData], filename: str):
-        """Exportiert Spiele zu Excel."""
+        """Exportiert Spiele im eingestellten Format (mit Zeitstempel)."""
         try:
-            df = self.games_to_dataframe(games)
+            base_name = f"{filename}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            exported_file, data, exporter = self.export_with_format(games, base_name)
 
-            # Export-Verzeichnis aus Settings holen
-            export_dir = st.session_state.export_dir
+            if exported_file:
+                st.success(f"✅ {len(games)} Spiele exportiert nach: {exported_file}")
 
-            # Excel-Datei erstellen
-            excel_path = os.path.join(
-                export_dir,
-                f"{filename}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-            )
-            os.makedirs(export_dir, exist_ok=True)
-
-            df.to_excel(excel_path, index=False)
-
-            st.success(f"✅ {len(games)} Spiele exportiert nach: {excel_path}")
-
-            # Download-Button
-            with open(excel_path, "rb") as file:
-                st.download_button(
-                    label="📥 Datei herunterladen",
-                    data=file.read(),
-                    file_name=f"{filename}.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                )
+            self.offer_download(exported_file, data, exporter, base_name)
 
         except Exception as e:
             st.error(f"❌ Exportfehler: {str(e)}")
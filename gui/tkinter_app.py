@@ -5,11 +5,13 @@ Bundesliga Scraper - Moderne Tkinter GUI (Clean Design)
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import pandas as pd
+import numpy as np
 from typing import List, Optional
 import os
 import sys
 import time
 import threading
+import multiprocessing
 from datetime import datetime, date
 import logging
 from pathlib import Path
@@ -23,8 +25,40 @@ sys.path.insert(0, str(parent_dir))
 try:
     from models.game_data import GameData
     from scrapers.kicker_scraper import KickerScraper
-    from exporters.excel_exporter_new import ExcelExporter
+    from exporters.excel_exporter_new import ExcelExporter, SPLIT_MODE_LABELS
     from exporters.merge_service import MergeService
+    from exporters.export_formats import (
+        EXPORT_FORMATS,
+        get_exporter,
+        normalize_export_format,
+    )
+    from storage.match_database import MatchDatabase
+    from storage.columnar_store import ColumnarMatchStore
+    from storage.html_archive import HtmlArchive
+    from config.settings_manager import (
+        get_database_path,
+        get_columnar_store_path,
+        get_elo_settings,
+        get_settings_manager,
+    )
+    from analytics.elo import EloRatings, ELO_TABLE_COLUMNS
+    from analytics.goal_model import GoalModel
+    from analytics.goal_timing import (
+        TIMING_GROUPS,
+        bucket_labels,
+        finalize_timing,
+        goal_timing_counts,
+    )
+    from analytics.head_to_head import HeadToHead
+    from analytics.league_table import LeagueTable, TABLE_COLUMNS, points_for_win
+    from analytics.match_query import MatchQuery
+    from analytics.season_simulator import (
+        SeasonSimulator,
+        SimulationResult,
+        SIMULATION_COLUMNS,
+    )
+    from analytics.stats_aggregator import StatsAggregator
+    from models.columnar import season_start_year
 except ImportError as e:
     print(f"Import-Fehler: {e}")
     sys.exit(1)
@@ -33,6 +67,9 @@ except ImportError as e:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Höchstens so viele Spiele im Dashboard anzeigen (neueste zuerst)
+MAX_TREE_ROWS = 1000
+
 
 class ModernColors:
     """Moderne Farbpalette für die GUI."""
@@ -614,18 +651,64 @@ class ModernBundesligaGUI:
         self.root.configure(bg=ModernColors.BG_LIGHT)
 
         # Initialize data
-        self.scraper = KickerScraper()
+        self.html_archive = HtmlArchive.from_settings()
+        self.scraper = KickerScraper(archive=self.html_archive)
         self.exporter = ExcelExporter()
         self.exporter.output_dir = Path("exports")
         self.merger = MergeService()
-        self.games_data: List[GameData] = []
+        self._games_data: Optional[List[GameData]] = None
+
+        # Gespeicherte Spiele: Spaltenspeicher (mmap) für Anzeige und Statistik,
+        # GameData-Objekte werden erst bei Bedarf aus der Datenbank geladen
+        self.database = MatchDatabase(get_database_path())
+        self.columnar_store = ColumnarMatchStore(get_columnar_store_path())
+        self.match_columns = None
+        try:
+            self.match_columns = self.columnar_store.open()
+            if self.match_columns is None and self.database.count_games():
+                self.refresh_match_columns()
+            if self.match_columns is not None:
+                logger.info(
+                    f"{len(self.match_columns)} Spiele aus dem Spaltenspeicher geöffnet"
+                )
+        except Exception as e:
+            logger.error(f"Fehler beim Öffnen des Spaltenspeichers: {e}")
+
+        # Kennzahlen einmal aufbauen, danach nur noch pro Spiel fortschreiben
+        self.stats = StatsAggregator.from_columns(self.match_columns)
+        self.head_to_head = HeadToHead.from_columns(self.match_columns)
+        self.match_query: Optional[MatchQuery] = None
+        self.filtered_rows: Optional[np.ndarray] = None
 
         # Create GUI
         self.create_widgets()
+        self.update_stats()
 
         # Center window
         self.center_window()
 
+    @property
+    def games_data(self) -> List[GameData]:
+        """GameData-Objekte, beim ersten Zugriff aus der Datenbank geladen."""
+        if self._games_data is None:
+            try:
+                self._games_data = self.database.load_games()
+            except Exception as e:
+                logger.error(f"Fehler beim Laden der Datenbank: {e}")
+                self._games_data = []
+        return self._games_data
+
+    @games_data.setter
+    def games_data(self, games: List[GameData]):
+        self._games_data = games
+
+    def refresh_match_columns(self):
+        """Baut den Spaltenspeicher nach Datenbankänderungen neu auf."""
+        self.columnar_store.write_from_database(self.database)
+        self.match_columns = self.columnar_store.open()
+        # GameData-Objekte beim nächsten Zugriff neu laden
+        self._games_data = None
+
     def center_window(self):
         """Zentriert das Fenster auf dem Bildschirm."""
         self.root.update_idletasks()
@@ -795,6 +878,7 @@ class ModernBundesligaGUI:
     def create_data_table(self, parent):
         """Erstellt die Datentabelle."""
         table_frame = ttk.LabelFrame(parent, text="📋 Spiele", padding=20)
+        self.table_frame = table_frame
         table_frame.grid(row=1, column=0, sticky="nsew", padx=20, pady=(0, 20))
 
         # Configure grid
@@ -1026,18 +1110,500 @@ class ModernBundesligaGUI:
         process_button.pack(side="right")
 
     def create_statistics_tab(self):
-        """Erstellt den Statistik-Tab."""
+        """Erstellt den Statistik-Tab mit der Bundesliga-Tabelle."""
         stats_frame = ttk.Frame(self.notebook)
         self.notebook.add(stats_frame, text="📈 Statistiken")
+        stats_frame.grid_columnconfigure(0, weight=1)
+        stats_frame.grid_rowconfigure(1, weight=1)
+
+        self.league_table = None
+        self.elo: Optional[EloRatings] = None
+        self.goal_model = GoalModel()
+
+        # Auswahl von Saison und Spieltag
+        control_frame = ttk.Frame(stats_frame, padding=20)
+        control_frame.grid(row=0, column=0, sticky="ew")
+
+        ttk.Label(control_frame, text="📋 Tabelle", style="Title.TLabel").pack(
+            side="left"
+        )
+
+        self.table_matchday_var = tk.IntVar(value=1)
+        self.table_matchday_spinbox = ttk.Spinbox(
+            control_frame,
+            from_=1,
+            to=34,
+            width=5,
+            textvariable=self.table_matchday_var,
+            command=self.show_league_table,
+        )
+        self.table_matchday_spinbox.pack(side="right")
+        self.table_matchday_spinbox.bind("<Return>", lambda e: self.show_league_table())
+        ttk.Label(control_frame, text="Nach Spieltag:").pack(side="right", padx=(20, 5))
+
+        self.table_season_var = tk.StringVar()
+        self.table_season_combo = ttk.Combobox(
+            control_frame, textvariable=self.table_season_var, state="readonly", width=12
+        )
+        self.table_season_combo.pack(side="right")
+        self.table_season_combo.bind(
+            "<<ComboboxSelected>>", lambda e: self.select_table_season()
+        )
+        ttk.Label(control_frame, text="Saison:").pack(side="right", padx=(20, 5))
+
+        ttk.Button(
+            control_frame,
+            text="🎲 Prognose",
+            style="Modern.TButton",
+            command=self.start_season_forecast,
+        ).pack(side="right", padx=(20, 0))
+
+        # Tabelle
+        tree_frame = ttk.Frame(stats_frame, padding=(20, 0, 20, 20))
+        tree_frame.grid(row=1, column=0, sticky="nsew")
+        tree_frame.grid_columnconfigure(0, weight=1)
+        tree_frame.grid_rowconfigure(0, weight=1)
+
+        league_columns = TABLE_COLUMNS + ELO_TABLE_COLUMNS
+        self.league_tree = ttk.Treeview(
+            tree_frame, columns=league_columns, show="headings", style="Modern.Treeview"
+        )
+        self.league_tree.grid(row=0, column=0, sticky="nsew")
+
+        for col in league_columns:
+            self.league_tree.heading(col, text=col)
+            if col == "Verein":
+                self.league_tree.column(col, width=200, minwidth=100)
+            else:
+                self.league_tree.column(col, width=70, minwidth=40, anchor="center")
+
+        v_scrollbar = ttk.Scrollbar(
+            tree_frame, orient="vertical", command=self.league_tree.yview
+        )
+        v_scrollbar.grid(row=0, column=1, sticky="ns")
+        self.league_tree.configure(yscrollcommand=v_scrollbar.set)
+
+        self.create_player_section(stats_frame)
+        self.create_head_to_head_section(stats_frame)
+        self.create_goal_timing_section(stats_frame)
+
+    def create_head_to_head_section(self, parent):
+        """Erstellt den direkten Vergleich zweier Vereine."""
+        h2h_frame = ttk.LabelFrame(parent, text="⚔️ Direkter Vergleich", padding=10)
+        h2h_frame.grid(row=3, column=0, sticky="ew", padx=20, pady=(0, 20))
+        h2h_frame.grid_columnconfigure(0, weight=1)
+        h2h_frame.grid_columnconfigure(1, weight=1)
+
+        self.h2h_team_var = tk.StringVar()
+        self.h2h_opponent_var = tk.StringVar()
+        self.h2h_team_combo = ttk.Combobox(
+            h2h_frame, textvariable=self.h2h_team_var, state="readonly"
+        )
+        self.h2h_team_combo.grid(row=0, column=0, sticky="ew", padx=(0, 10))
+        self.h2h_opponent_combo = ttk.Combobox(
+            h2h_frame, textvariable=self.h2h_opponent_var, state="readonly"
+        )
+        self.h2h_opponent_combo.grid(row=0, column=1, sticky="ew")
+        for combo in (self.h2h_team_combo, self.h2h_opponent_combo):
+            combo.bind("<<ComboboxSelected>>", lambda e: self.show_head_to_head())
+
+        h2h_columns = ("", "Spiele", "S", "U", "N", "Tore")
+        self.h2h_tree = ttk.Treeview(
+            h2h_frame,
+            columns=h2h_columns,
+            show="headings",
+            style="Modern.Treeview",
+            height=3,
+        )
+        self.h2h_tree.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(10, 0))
+        for col in h2h_columns:
+            self.h2h_tree.heading(col, text=col)
+            self.h2h_tree.column(col, width=90, minwidth=40, anchor="center")
+
+    def create_goal_timing_section(self, parent):
+        """Erstellt die Verteilung der Torminuten nach Verein, Saison oder Ära."""
+        timing_frame = ttk.LabelFrame(parent, text="⏱️ Torminuten", padding=10)
+        timing_frame.grid(row=4, column=0, sticky="ew", padx=20, pady=(0, 20))
+        timing_frame.grid_columnconfigure(0, weight=1)
+
+        self.timing_level_var = tk.StringVar(value=TIMING_GROUPS["era"])
+        level_combo = ttk.Combobox(
+            timing_frame,
+            textvariable=self.timing_level_var,
+            values=list(TIMING_GROUPS.values()),
+            state="readonly",
+            width=12,
+        )
+        level_combo.grid(row=0, column=0, sticky="w")
+        level_combo.bind("<<ComboboxSelected>>", lambda e: self.update_goal_timing())
+
+        timing_columns = ["Gruppe"] + bucket_labels() + ["Tore"]
+        self.timing_tree = ttk.Treeview(
+            timing_frame,
+            columns=timing_columns,
+            show="headings",
+            style="Modern.Treeview",
+            height=6,
+        )
+        self.timing_tree.grid(row=1, column=0, sticky="ew", pady=(10, 0))
+        for col in timing_columns:
+            self.timing_tree.heading(col, text=col)
+            if col == "Gruppe":
+                self.timing_tree.column(col, width=180, minwidth=100)
+            else:
+                self.timing_tree.column(col, width=70, minwidth=40, anchor="center")
+
+        timing_scrollbar = ttk.Scrollbar(
+            timing_frame, orient="vertical", command=self.timing_tree.yview
+        )
+        timing_scrollbar.grid(row=1, column=1, sticky="ns", pady=(10, 0))
+        self.timing_tree.configure(yscrollcommand=timing_scrollbar.set)
+
+    def update_goal_timing(self):
+        """Berechnet die Torminuten der gewählten Aufteilung aus allen Toren."""
+        for item in self.timing_tree.get_children():
+            self.timing_tree.delete(item)
+
+        level = self.timing_level_var.get()
+        self.timing_tree.heading("Gruppe", text=level)
+        columns = self.match_columns
+        if columns is None or not len(columns):
+            return
 
-        # Placeholder for detailed statistics
-        placeholder = ttk.Label(
-            stats_frame,
-            text="📈 Detaillierte Statistiken\n\nWerden angezeigt, sobald Daten geladen sind.",
-            style="Title.TLabel",
-            anchor="center",
+        by = {label: key for key, label in TIMING_GROUPS.items()}[level]
+        frame = finalize_timing(goal_timing_counts(columns, by))
+        for row in frame.itertuples(index=False):
+            self.timing_tree.insert("", "end", values=list(row))
+
+    def update_head_to_head(self):
+        """Aktualisiert die Vereinsauswahl des direkten Vergleichs."""
+        teams = self.stats.team_names()
+        self.h2h_team_combo["values"] = teams
+        self.h2h_opponent_combo["values"] = teams
+        if self.h2h_team_var.get() not in teams:
+            self.h2h_team_var.set(teams[0] if teams else "")
+        if self.h2h_opponent_var.get() not in teams:
+            self.h2h_opponent_var.set(teams[1] if len(teams) > 1 else "")
+        self.show_head_to_head()
+
+    def show_head_to_head(self):
+        """Füllt Heim-, Auswärts- und Gesamtbilanz der gewählten Paarung."""
+        for item in self.h2h_tree.get_children():
+            self.h2h_tree.delete(item)
+        team, opponent = self.h2h_team_var.get(), self.h2h_opponent_var.get()
+        if not team or not opponent or team == opponent:
+            return
+
+        record = self.head_to_head.record(team, opponent)
+        for label, key in (("Heim", "home"), ("Auswärts", "away"), ("Gesamt", "total")):
+            counters = record[key]
+            self.h2h_tree.insert(
+                "",
+                "end",
+                values=(
+                    label,
+                    counters.games,
+                    counters.wins,
+                    counters.draws,
+                    counters.losses,
+                    f"{counters.goals_for}:{counters.goals_against}",
+                ),
+            )
+
+    def create_player_section(self, parent):
+        """Erstellt Torjägerliste und Spielerkarriere (aus dem Spielerindex)."""
+        player_frame = ttk.Frame(parent, padding=(20, 0, 20, 20))
+        player_frame.grid(row=2, column=0, sticky="nsew")
+        parent.grid_rowconfigure(2, weight=1)
+        player_frame.grid_columnconfigure(0, weight=1)
+        player_frame.grid_columnconfigure(1, weight=1)
+        player_frame.grid_rowconfigure(0, weight=1)
+
+        # Torjäger
+        scorer_frame = ttk.LabelFrame(player_frame, text="👟 Torjäger", padding=10)
+        scorer_frame.grid(row=0, column=0, sticky="nsew", padx=(0, 10))
+        scorer_frame.grid_columnconfigure(0, weight=1)
+        scorer_frame.grid_rowconfigure(1, weight=1)
+
+        self.scorer_team_var = tk.StringVar(value="Alle")
+        self.scorer_team_combo = ttk.Combobox(
+            scorer_frame, textvariable=self.scorer_team_var, state="readonly"
+        )
+        self.scorer_team_combo.grid(row=0, column=0, sticky="ew", pady=(0, 10))
+        self.scorer_team_combo.bind(
+            "<<ComboboxSelected>>", lambda e: self.show_top_scorers()
+        )
+
+        scorer_columns = ("Spieler", "Tore", "Elfmeter", "Einsätze")
+        self.scorer_tree = ttk.Treeview(
+            scorer_frame,
+            columns=scorer_columns,
+            show="headings",
+            style="Modern.Treeview",
+            height=8,
+        )
+        self.scorer_tree.grid(row=1, column=0, sticky="nsew")
+        for col in scorer_columns:
+            self.scorer_tree.heading(col, text=col)
+            if col == "Spieler":
+                self.scorer_tree.column(col, width=180, minwidth=100)
+            else:
+                self.scorer_tree.column(col, width=70, minwidth=40, anchor="center")
+
+        # Spielerkarriere
+        career_frame = ttk.LabelFrame(
+            player_frame, text="🧑 Spielerkarriere", padding=10
+        )
+        career_frame.grid(row=0, column=1, sticky="nsew", padx=(10, 0))
+        career_frame.grid_columnconfigure(0, weight=1)
+        career_frame.grid_rowconfigure(2, weight=1)
+
+        self.player_search_var = tk.StringVar()
+        player_entry = ttk.Entry(
+            career_frame, textvariable=self.player_search_var, style="Modern.TEntry"
+        )
+        player_entry.grid(row=0, column=0, sticky="ew", pady=(0, 10))
+        player_entry.bind("<Return>", lambda e: self.show_player_career())
+        ttk.Button(
+            career_frame,
+            text="Suchen",
+            style="Modern.TButton",
+            command=self.show_player_career,
+        ).grid(row=0, column=1, sticky="ew", padx=(10, 0), pady=(0, 10))
+
+        self.player_clubs_label = ttk.Label(career_frame, text="")
+        self.player_clubs_label.grid(row=1, column=0, columnspan=2, sticky="w")
+
+        career_columns = ("Saison", "Verein", "Einsätze", "Tore")
+        self.career_tree = ttk.Treeview(
+            career_frame,
+            columns=career_columns,
+            show="headings",
+            style="Modern.Treeview",
+            height=8,
+        )
+        self.career_tree.grid(row=2, column=0, columnspan=2, sticky="nsew")
+        for col in career_columns:
+            self.career_tree.heading(col, text=col)
+            if col == "Verein":
+                self.career_tree.column(col, width=180, minwidth=100)
+            else:
+                self.career_tree.column(col, width=70, minwidth=40, anchor="center")
+
+    def update_player_stats(self):
+        """Aktualisiert Vereinsauswahl und Torjägerliste."""
+        teams = self.stats.team_names()
+        self.scorer_team_combo["values"] = ["Alle"] + teams
+        if self.scorer_team_var.get() not in teams:
+            self.scorer_team_var.set("Alle")
+        self.show_top_scorers()
+
+    def show_top_scorers(self):
+        """Füllt die Torjägerliste für den gewählten Verein."""
+        for item in self.scorer_tree.get_children():
+            self.scorer_tree.delete(item)
+        team = self.scorer_team_var.get()
+        try:
+            scorers = self.database.top_scorers(team=None if team == "Alle" else team)
+        except Exception as e:
+            logger.error(f"Fehler beim Laden der Torjäger: {e}")
+            return
+        for row in scorers:
+            self.scorer_tree.insert(
+                "",
+                "end",
+                values=(
+                    row["player"],
+                    row["goals"],
+                    row["penalties"],
+                    row["appearances"],
+                ),
+            )
+
+    def show_player_career(self):
+        """Zeigt Vereinsstationen und Saisonbilanz des gesuchten Spielers."""
+        for item in self.career_tree.get_children():
+            self.career_tree.delete(item)
+        search = self.player_search_var.get().strip()
+        players = self.database.find_players(search, limit=1) if search else []
+        if not players:
+            self.player_clubs_label.configure(
+                text=f"Kein Spieler zu '{search}' gefunden." if search else ""
+            )
+            return
+
+        player = players[0]
+        clubs = self.database.player_clubs(player)
+        self.player_clubs_label.configure(
+            text=f"{player}: "
+            + " → ".join(
+                f"{club['team']} ({club['first_season']}–{club['last_season']})"
+                for club in clubs
+            )
+        )
+        for row in self.database.player_career(player):
+            self.career_tree.insert(
+                "",
+                "end",
+                values=(row["season"], row["team"], row["appearances"], row["goals"]),
+            )
+
+    def update_league_table(self):
+        """Berechnet die Tabellen aller Saisons aus dem Spaltenspeicher neu."""
+        columns = self.match_columns
+        if columns is not None and len(columns):
+            self.league_table = LeagueTable(columns)
+            seasons = list(reversed(self.league_table.seasons))
+            if self.elo is None:
+                self.elo = EloRatings(columns, **get_elo_settings())
+            else:
+                # Neue Spiele fortschreiben statt die Historie neu zu rechnen
+                self.elo.update(columns)
+        else:
+            self.league_table = None
+            self.elo = None
+            seasons = []
+
+        self.table_season_combo["values"] = seasons
+        if self.table_season_var.get() in seasons:
+            self.show_league_table()
+        else:
+            self.table_season_var.set(seasons[0] if seasons else "")
+            self.select_table_season()
+
+    def select_table_season(self):
+        """Zeigt die gewählte Saison nach ihrem letzten Spieltag."""
+        last_matchday = 0
+        if self.league_table is not None:
+            last_matchday = self.league_table.matchdays(self.table_season_var.get())
+        self.table_matchday_spinbox.configure(to=max(last_matchday, 1))
+        self.table_matchday_var.set(max(last_matchday, 1))
+        self.show_league_table()
+
+    def show_league_table(self):
+        """Füllt die Tabelle für Saison und Spieltag der Auswahl."""
+        for item in self.league_tree.get_children():
+            self.league_tree.delete(item)
+        if self.league_table is None:
+            return
+
+        try:
+            matchday = self.table_matchday_var.get()
+        except tk.TclError:
+            matchday = None
+
+        season = self.table_season_var.get()
+        standings = self.league_table.standings(season, matchday)
+        if self.elo is not None:
+            standings = self.elo.annotate(standings, season, matchday)
+        for row in standings.itertuples(index=False):
+            self.league_tree.insert(
+                "", "end", values=["" if pd.isna(value) else value for value in row]
+            )
+
+    def start_season_forecast(self):
+        """Startet die Monte-Carlo-Prognose der gewählten Saison im Hintergrund."""
+        season = self.table_season_var.get()
+        if self.league_table is None or self.match_query is None or not season:
+            messagebox.showwarning(
+                "Keine Daten", "Bitte laden Sie zunächst Spieldaten."
+            )
+            return
+        threading.Thread(
+            target=self.forecast_worker, args=(season,), daemon=True
+        ).start()
+
+    def forecast_worker(self, season: str):
+        """Worker-Thread: ausstehende Spiele laden, Modell anpassen, simulieren."""
+        progress_dialog = ModernProgressDialog(
+            self.root, "Saisonprognose", f"Simuliere Saison {season}...", 3
         )
-        placeholder.pack(expand=True)
+
+        try:
+            import asyncio
+
+            progress_dialog.update_progress(0, 3, "Lade ausstehende Spiele...")
+            known = self.match_query.match_keys(self.match_query.season_rows(season))
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                fixtures = loop.run_until_complete(
+                    self.scraper.get_remaining_fixtures(season, known)
+                )
+            finally:
+                loop.close()
+
+            if not fixtures:
+                progress_dialog.close()
+                self.root.after(
+                    0,
+                    lambda: messagebox.showinfo(
+                        "Saisonprognose",
+                        f"Keine ausstehenden Spiele - die Saison {season} ist abgeschlossen.",
+                    ),
+                )
+                return
+
+            progress_dialog.update_progress(1, 3, "Passe Tormodell an...")
+            # Unveränderte Saisons werden nicht erneut angepasst
+            self.goal_model.fit(self.match_columns, [season])
+
+            progress_dialog.update_progress(
+                2, 3, f"Simuliere {len(fixtures)} ausstehende Spiele..."
+            )
+            simulator = SeasonSimulator.from_goal_model(
+                self.league_table.standings(season),
+                [(home, away) for _, _, home, away in fixtures],
+                self.goal_model.fits[season],
+                win_points=points_for_win(season_start_year(season)),
+            )
+            result = simulator.run()
+
+            progress_dialog.update_progress(3, 3, "Prognose abgeschlossen!")
+            progress_dialog.close()
+            self.root.after(0, lambda: self.show_season_forecast(season, result))
+
+        except Exception as e:
+            progress_dialog.close()
+            logger.error(f"Fehler bei der Saisonprognose: {e}")
+            self.root.after(
+                0,
+                lambda: messagebox.showerror(
+                    "Prognosefehler", f"Fehler bei der Saisonprognose:\n{str(e)}"
+                ),
+            )
+
+    def show_season_forecast(self, season: str, result: SimulationResult):
+        """Zeigt Titel-, Europapokal- und Abstiegschancen in einem eigenen Fenster."""
+        window = tk.Toplevel(self.root)
+        window.title(f"🎲 Saisonprognose {season}")
+        window.geometry("900x560")
+        window.grid_columnconfigure(0, weight=1)
+        window.grid_rowconfigure(1, weight=1)
+
+        ttk.Label(
+            window,
+            text=(
+                f"{result.simulations:,} Simulationen in {result.elapsed:.1f} s "
+                f"({result.seasons_per_second:,.0f} Saisons/s)"
+            ),
+            style="Muted.TLabel",
+            padding=10,
+        ).grid(row=0, column=0, sticky="w")
+
+        tree = ttk.Treeview(
+            window, columns=SIMULATION_COLUMNS, show="headings", style="Modern.Treeview"
+        )
+        tree.grid(row=1, column=0, sticky="nsew", padx=10, pady=(0, 10))
+        for col in SIMULATION_COLUMNS:
+            tree.heading(col, text=col)
+            if col == "Verein":
+                tree.column(col, width=200, minwidth=100)
+            else:
+                tree.column(col, width=85, minwidth=50, anchor="center")
+
+        for row in result.to_frame().itertuples(index=False):
+            tree.insert("", "end", values=list(row))
 
     def create_settings_tab(self):
         """Erstellt den Einstellungen-Tab."""
@@ -1101,15 +1667,36 @@ class ModernBundesligaGUI:
 
         # Export format
         ttk.Label(export_frame, text="Standard-Format:").pack(anchor="w")
-        self.format_var = tk.StringVar(value="Excel (.xlsx)")
+        self.format_var = tk.StringVar(
+            value=normalize_export_format(get_settings_manager().get_export_format())
+        )
         format_combo = ttk.Combobox(
             export_frame,
             textvariable=self.format_var,
-            values=["Excel (.xlsx)", "CSV (.csv)", "JSON (.json)"],
+            values=list(EXPORT_FORMATS),
             style="Modern.TCombobox",
             state="readonly",
         )
         format_combo.pack(fill="x", pady=(5, 15))
+        # Auswahl sofort speichern (gilt auch für die Streamlit-App)
+        format_combo.bind(
+            "<<ComboboxSelected>>",
+            lambda event: get_settings_manager().set_export_format(
+                self.format_var.get()
+            ),
+        )
+
+        # Aufteilung großer Exporte
+        ttk.Label(export_frame, text="Aufteilung:").pack(anchor="w")
+        self.split_var = tk.StringVar(value="Eine Arbeitsmappe")
+        split_combo = ttk.Combobox(
+            export_frame,
+            textvariable=self.split_var,
+            values=list(SPLIT_MODE_LABELS),
+            style="Modern.TCombobox",
+            state="readonly",
+        )
+        split_combo.pack(fill="x", pady=(5, 15))
 
         # Export directory
         ttk.Label(export_frame, text="Export-Verzeichnis:").pack(anchor="w")
@@ -1487,14 +2074,66 @@ jeweils aktuelle Version ist maßgeblich.
             )
             info_label.pack()
 
+    def update_match_filter(self):
+        """Baut die Filter-Indizes neu auf und aktualisiert die Auswahlfelder."""
+        columns = self.match_columns
+        if columns is not None and len(columns):
+            self.match_query = MatchQuery(columns)
+        else:
+            self.match_query = None
+
+        self.season_combo["values"] = ["Alle"] + self.stats.season_names()
+        self.team_combo["values"] = ["Alle"] + self.stats.team_names()
+        self.apply_filters()
+
     def apply_filters(self):
         """Wendet die Filter auf die Daten an."""
-        # Implementation would filter self.games_data and update the tree
-        messagebox.showinfo("Filter", "Filter wurden angewendet!")
+        for item in self.tree.get_children():
+            self.tree.delete(item)
+        if self.match_query is None:
+            self.filtered_rows = None
+            self.table_frame.configure(text="📋 Spiele")
+            return
+
+        try:
+            min_goals = int(self.goals_var.get() or 0)
+        except ValueError:
+            messagebox.showwarning(
+                "Ungültige Eingabe", "Min. Tore muss eine ganze Zahl sein."
+            )
+            return
+
+        rows = self.match_query.filter(
+            self.season_var.get(), self.team_var.get(), min_goals
+        )
+        self.filtered_rows = rows
+
+        # Neueste Spiele zuerst, nur die angezeigten Zeilen lesen
+        shown = rows[::-1][:MAX_TREE_ROWS]
+        df = self.match_columns.to_dataframe(shown)
+        for values in df[list(self.tree["columns"])].itertuples(index=False):
+            self.tree.insert("", "end", values=[str(value) for value in values])
+
+        if len(rows) > len(shown):
+            title = f"📋 Spiele ({len(shown):,} von {len(rows):,})"
+        else:
+            title = f"📋 Spiele ({len(rows):,})"
+        self.table_frame.configure(text=title.replace(",", "."))
+
+    def get_filtered_games(self) -> List[GameData]:
+        """GameData-Objekte der zuletzt gefilterten Spiele."""
+        if self.filtered_rows is None or self.match_query is None:
+            return self.games_data
+        if len(self.filtered_rows) == len(self.match_columns):
+            return self.games_data
+        return self.database.load_games(
+            keys=self.match_query.match_keys(self.filtered_rows)
+        )
 
     def export_filtered_data(self):
         """Exportiert die gefilterten Daten."""
-        if not self.games_data:
+        games = self.get_filtered_games()
+        if not games:
             messagebox.showwarning(
                 "Keine Daten", "Es sind keine Daten zum Exportieren vorhanden."
             )
@@ -1516,7 +2155,7 @@ jeweils aktuelle Version ist maßgeblich.
             try:
                 # Convert games to DataFrame
                 data = []
-                for game in self.games_data:
+                for game in games:
                     data.append(
                         {
                             "Datum": game.date or "",
@@ -1632,32 +2271,35 @@ jeweils aktuelle Version ist maßgeblich.
 
             try:
                 # Run the async batch download with progress callback
-                games = loop.run_until_complete(
-                    self.scraper.batch_download_with_progress(
-                        seasons, progress_callback
+                # Spiele werden währenddessen direkt in die Datenbank gestreamt
+                with self.database.batch_writer() as db_writer:
+
+                    def store_game(game: GameData):
+                        db_writer.add(game)
+                        self.stats.add(game)
+                        self.head_to_head.add(game)
+                        self.root.after(0, self.update_stats_cards)
+
+                    games = loop.run_until_complete(
+                        self.scraper.batch_download_with_progress(
+                            seasons, progress_callback, game_callback=store_game
+                        )
                     )
-                )
                 all_games.extend(games)
 
-                # Store games
-                self.games_data = all_games
+                # Spaltenspeicher inkl. bereits gespeicherter Saisons aktualisieren
+                self.refresh_match_columns()
 
-                # Auto-export to Excel
+                # Auto-export im eingestellten Format
                 if all_games and not progress_dialog.cancelled:
                     progress_dialog.update_progress(
-                        current_game_count, current_game_count, "Exportiere zu Excel..."
+                        current_game_count,
+                        current_game_count,
+                        f"Exportiere ({self.format_var.get()})...",
                     )
 
-                    export_filename = f"bundesliga_batch_{len(all_games)}_spiele.xlsx"
-
-                    # Get configured export directory
-                    export_dir = self.export_dir_var.get()
-                    os.makedirs(export_dir, exist_ok=True)
-
-                    # Use ExcelExporter
-                    self.exporter.set_output_directory(export_dir)
-                    exported_file = self.exporter.export_by_team(
-                        all_games, export_filename
+                    exported_file = self.export_games(
+                        all_games, f"bundesliga_batch_{len(all_games)}_spiele"
                     )
 
                     logger.info(
@@ -1786,18 +2428,16 @@ jeweils aktuelle Version ist maßgeblich.
 
                 # Store games
                 if games:
-                    current_games = getattr(self, "games_data", [])
-                    current_games.extend(games)
-                    self.games_data = current_games  # Auto-export to Excel
-                    export_filename = f"einzelspiele_{len(games)}.xlsx"
-
-                    # Get configured export directory
-                    export_dir = self.export_dir_var.get()
-                    os.makedirs(export_dir, exist_ok=True)
-
-                    # Use ExcelExporter
-                    self.exporter.set_output_directory(export_dir)
-                    exported_file = self.exporter.export_by_team(games, export_filename)
+                    self.database.upsert_games(games)
+                    for game in games:
+                        self.stats.add(game)
+                        self.head_to_head.add(game)
+                    self.refresh_match_columns()
+                    self.root.after(0, self.update_stats)
+                    # Auto-export im eingestellten Format
+                    exported_file = self.export_games(
+                        games, f"einzelspiele_{len(games)}"
+                    )
 
                     logger.info(
                         f"URL-Verarbeitung abgeschlossen: {len(games)} Spiele in {exported_file} exportiert"
@@ -1830,30 +2470,44 @@ jeweils aktuelle Version ist maßgeblich.
                 ),
             )
 
-    def update_stats(self):
-        """Aktualisiert die Statistiken."""
-        if self.games_data:
-            total_games = len(self.games_data)
-            total_goals = sum(
-                game.home_score + game.away_score
-                for game in self.games_data
-                if game.home_score is not None and game.away_score is not None
+    def export_games(self, games: List[GameData], base_name: str) -> str:
+        """
+        Exportiert Spiele im eingestellten Format ins Export-Verzeichnis.
+
+        Bei Excel wird zusätzlich die eingestellte Aufteilung berücksichtigt.
+        """
+        export_dir = self.export_dir_var.get()
+        os.makedirs(export_dir, exist_ok=True)
+
+        exporter = get_exporter(self.format_var.get(), export_dir)
+        split_mode = SPLIT_MODE_LABELS.get(self.split_var.get())
+        if split_mode and isinstance(exporter, ExcelExporter):
+            exported_file = exporter.export_split(
+                games, split_mode, skip_unchanged=True
             )
-            seasons = len(set(game.season for game in self.games_data if game.season))
-            teams = len(
-                set(
-                    [game.home_team for game in self.games_data]
-                    + [game.away_team for game in self.games_data]
-                )
+        else:
+            exported_file = exporter.export_if_changed(
+                games, f"{base_name}{exporter.extension}"
             )
+        if exporter.last_export_skipped:
+            logger.info(f"Export bereits aktuell, nicht neu geschrieben: {exported_file}")
+        return exported_file
 
-            self.stats_cards["games"].update_value(str(total_games))
-            self.stats_cards["goals"].update_value(str(total_goals))
-            self.stats_cards["seasons"].update_value(str(seasons))
-            self.stats_cards["teams"].update_value(str(teams))
-        else:
-            for card in self.stats_cards.values():
-                card.update_value("0")
+    def update_stats(self):
+        """Aktualisiert die Statistiken."""
+        self.update_stats_cards()
+        self.update_league_table()
+        self.update_match_filter()
+        self.update_player_stats()
+        self.update_head_to_head()
+        self.update_goal_timing()
+
+    def update_stats_cards(self):
+        """Aktualisiert die Statistik-Karten aus den laufenden Kennzahlen."""
+        self.stats_cards["games"].update_value(str(self.stats.total_games))
+        self.stats_cards["goals"].update_value(str(self.stats.total_goals))
+        self.stats_cards["seasons"].update_value(str(self.stats.season_count))
+        self.stats_cards["teams"].update_value(str(self.stats.team_count))
 
     def clear_cache(self):
         """Leert den Cache."""
@@ -1864,7 +2518,10 @@ jeweils aktuelle Version ist maßgeblich.
         if messagebox.askyesno(
             "Daten löschen", "Alle geladenen Daten wirklich löschen?"
         ):
-            self.games_data.clear()
+            self.games_data = []
+            self.match_columns = None
+            self.stats.clear()
+            self.head_to_head.clear()
             self.update_stats()
 
             # Clear tree
@@ -1944,4 +2601,5 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
@@ -7,6 +7,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import sys
 import subprocess
+import multiprocessing
 from pathlib import Path
 
 # Füge das Projektverzeichnis zum Python-Pfad hinzu
@@ -203,4 +204,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Für Prozess-Pools (z.B. aufgeteilter Export) in der gebauten .exe
+    multiprocessing.freeze_support()
     main()
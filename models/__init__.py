@@ -4,6 +4,7 @@ Models package - Erweiterte Datenmodelle für Bundesliga Scraper
 
 from .extended_data import ExtendedMatchData, ExtendedGoal, Lineup, Player
 from .game_data import GameData, Team, Goal
+from .serialization import encode_games, decode_games, SCHEMA_VERSION
 
 __all__ = [
     "ExtendedMatchData",
@@ -13,4 +14,7 @@ __all__ = [
     "GameData",
     "Team",
     "Goal",
+    "encode_games",
+    "decode_games",
+    "SCHEMA_VERSION",
 ]
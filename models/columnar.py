@@ -0,0 +1,444 @@
+"""
+Flache Datensätze für spaltenorientierte Exporte und Analysen
+
+Zerlegt GameData-Objekte in drei "lange" Tabellen (Spiele, Tore,
+Aufstellungen). Die Generatoren liefern eine Zeile nach der anderen, damit
+Exporter streamen können, ohne alle Zeilen gleichzeitig im Speicher zu halten.
+
+MatchColumns hält dieselben Daten als NumPy-Arrays für vektorisierte Analysen.
+"""
+
+import re
+import unicodedata
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+from .game_data import GameData
+
+MATCH_COLUMNS = [
+    "match_key",
+    "season",
+    "matchday",
+    "date",
+    "home_team",
+    "away_team",
+    "home_score",
+    "away_score",
+    "total_goals",
+    "winner",
+    "stadium",
+    "attendance",
+]
+
+GOAL_COLUMNS = [
+    "match_key",
+    "season",
+    "matchday",
+    "team",
+    "opponent",
+    "is_home",
+    "scorer",
+    "minute",
+    "assist",
+    "penalty",
+    "own_goal",
+]
+
+LINEUP_COLUMNS = [
+    "match_key",
+    "season",
+    "matchday",
+    "team",
+    "opponent",
+    "is_home",
+    "slot",
+    "player",
+    "position",
+    "number",
+]
+
+
+def match_key(game: GameData) -> str:
+    """
+    Liefert den eindeutigen Schlüssel eines Spiels.
+
+    Normalerweise die kicker-URL; Spiele ohne URL (z.B. manuell erfasst)
+    erhalten einen stabilen Ersatzschlüssel aus Saison, Datum und Teams.
+    """
+    if game.url:
+        return game.url
+    return (
+        f"local:{game.season}:{game.date}:{game.home_team.name}:{game.away_team.name}"
+    )
+
+
+def player_key(name: Optional[str]) -> str:
+    """
+    Normalisierter Schlüssel eines Spielers.
+
+    Groß-/Kleinschreibung, Umlaute, Akzente und Leerzeichen werden
+    vereinheitlicht, so dass "Thomas Müller", "thomas  mueller" und
+    "Ivan Perišić"/"Ivan Perisic" jeweils auf denselben Eintrag im
+    Spielerindex fallen.
+    """
+    text = " ".join((name or "").split()).casefold()
+    for umlaut, replacement in (("ä", "ae"), ("ö", "oe"), ("ü", "ue"), ("ß", "ss")):
+        text = text.replace(umlaut, replacement)
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+
+def match_records(games: Iterable[GameData]) -> Iterator[Dict[str, Any]]:
+    """Eine Zeile pro Spiel."""
+    for game in games:
+        yield {
+            "match_key": match_key(game),
+            "season": game.season,
+            "matchday": game.matchday,
+            "date": game.date,
+            "home_team": game.home_team.name,
+            "away_team": game.away_team.name,
+            "home_score": game.home_score,
+            "away_score": game.away_score,
+            "total_goals": game.home_score + game.away_score,
+            "winner": game.get_winner() or "Unentschieden",
+            "stadium": game.stadium,
+            "attendance": game.attendance,
+        }
+
+
+def goal_records(games: Iterable[GameData]) -> Iterator[Dict[str, Any]]:
+    """Eine Zeile pro Tor."""
+    for game in games:
+        key = match_key(game)
+        for is_home, goals, team, opponent in (
+            (True, game.home_goals, game.home_team.name, game.away_team.name),
+            (False, game.away_goals, game.away_team.name, game.home_team.name),
+        ):
+            for goal in goals:
+                yield {
+                    "match_key": key,
+                    "season": game.season,
+                    "matchday": game.matchday,
+                    # Verein laut Quelle, sonst die Seite, auf der das Tor steht
+                    "team": goal.team or team,
+                    "opponent": opponent,
+                    "is_home": is_home,
+                    "scorer": goal.scorer,
+                    "minute": goal.minute,
+                    "assist": goal.assist,
+                    "penalty": goal.penalty,
+                    "own_goal": goal.own_goal,
+                }
+
+
+def lineup_records(games: Iterable[GameData]) -> Iterator[Dict[str, Any]]:
+    """Eine Zeile pro Spieler der Startaufstellung."""
+    for game in games:
+        key = match_key(game)
+        for is_home, team, opponent in (
+            (True, game.home_team, game.away_team.name),
+            (False, game.away_team, game.home_team.name),
+        ):
+            for slot, player in enumerate(team.players, start=1):
+                yield {
+                    "match_key": key,
+                    "season": game.season,
+                    "matchday": game.matchday,
+                    "team": team.name,
+                    "opponent": opponent,
+                    "is_home": is_home,
+                    "slot": slot,
+                    "player": player.name,
+                    "position": player.position,
+                    "number": player.number,
+                }
+
+
+# ---------------------------------------------------------------------------
+# Spaltenorientierte Arrays (NumPy)
+# ---------------------------------------------------------------------------
+
+_SEASON_YEAR = re.compile(r"(\d{4})")
+_DATE = re.compile(r"(\d{1,2})\.(\d{1,2})\.(\d{2,4})?")
+
+
+def season_start_year(season: Optional[str]) -> int:
+    """Startjahr einer Saison ("2024-25", "2024/25" oder "2024" -> 2024)."""
+    match = _SEASON_YEAR.search(season or "")
+    return int(match.group(1)) if match else 0
+
+
+def date_sort_key(date: Optional[str], season: Optional[str] = None) -> int:
+    """
+    Wandelt ein kicker-Datum in eine sortierbare Zahl (JJJJMMTT).
+
+    Fehlt das Jahr (z.B. "Sa., 24.08."), wird es aus der Saison abgeleitet:
+    Spiele ab Juli gehören zum Startjahr, der Rest zum Folgejahr.
+    """
+    match = _DATE.search(date or "")
+    if not match:
+        return 0
+
+    day, month = int(match.group(1)), int(match.group(2))
+    start_year = season_start_year(season)
+    year_text = match.group(3)
+
+    if year_text and len(year_text) == 4:
+        year = int(year_text)
+    elif year_text:
+        century = (start_year // 100) * 100 if start_year else 1900
+        year = century + int(year_text)
+        if start_year and year < start_year - 1:
+            year += 100
+    else:
+        year = start_year + (0 if month >= 7 else 1) if start_year else 0
+
+    return year * 10000 + month * 100 + day
+
+
+class MatchColumns:
+    """
+    Alle Spiele und Tore als NumPy-Spalten.
+
+    Vereine, Saisons und Spieler sind als Integer-IDs kodiert; die Namen stehen
+    in den Wörterbüchern teams/seasons/players. Die Zeilen sind chronologisch
+    sortiert (Saison, Spieltag, Datum). Spalten können über einen Loader
+    verzögert geladen werden - so liest ein memory-mapped Store nur die
+    Spalten, die tatsächlich benutzt werden.
+    """
+
+    MATCH_ARRAYS = {
+        "season_id": np.int16,
+        "matchday": np.int16,
+        "date_key": np.int32,
+        "home_id": np.int16,
+        "away_id": np.int16,
+        "home_score": np.int16,
+        "away_score": np.int16,
+        "date": str,
+        "match_key": str,
+    }
+
+    GOAL_ARRAYS = {
+        "goal_match": np.int32,
+        "goal_is_home": np.bool_,
+        "goal_minute": np.int16,
+        "goal_scorer_id": np.int32,
+        "goal_penalty": np.bool_,
+        "goal_own_goal": np.bool_,
+    }
+
+    def __init__(
+        self,
+        teams: List[str],
+        seasons: List[str],
+        arrays: Optional[Dict[str, np.ndarray]] = None,
+        loader: Optional[Callable[[str], np.ndarray]] = None,
+        players: Union[List[str], Callable[[], List[str]], None] = None,
+    ):
+        self.teams = teams
+        self.seasons = seasons
+        self._arrays: Dict[str, np.ndarray] = dict(arrays or {})
+        self._loader = loader
+        self._players = players
+        self._team_index: Optional[Dict[str, int]] = None
+        self._season_index: Optional[Dict[str, int]] = None
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        # Nur für Spalten aufgerufen, die noch nicht als Attribut existieren
+        if name in MatchColumns.MATCH_ARRAYS or name in MatchColumns.GOAL_ARRAYS:
+            arrays = self.__dict__["_arrays"]
+            if name not in arrays:
+                loader = self.__dict__["_loader"]
+                if loader is None:
+                    raise AttributeError(name)
+                arrays[name] = loader(name)
+            return arrays[name]
+        raise AttributeError(name)
+
+    def __len__(self) -> int:
+        return len(self.home_score)
+
+    @property
+    def players(self) -> List[str]:
+        """Spielernamen (verzögert geladen)."""
+        if callable(self._players):
+            self._players = self._players()
+        return self._players or []
+
+    @property
+    def total_goals(self) -> np.ndarray:
+        return self.home_score.astype(np.int32) + self.away_score
+
+    @property
+    def season_years(self) -> np.ndarray:
+        """Startjahr der Saison je Spiel."""
+        years = np.array([season_start_year(s) for s in self.seasons], dtype=np.int16)
+        return years[self.season_id]
+
+    def team_id(self, name: str) -> int:
+        """ID eines Vereins oder -1, falls unbekannt."""
+        if self._team_index is None:
+            self._team_index = {team: i for i, team in enumerate(self.teams)}
+        return self._team_index.get(name, -1)
+
+    def season_id_of(self, season: str) -> int:
+        """ID einer Saison oder -1, falls unbekannt."""
+        if self._season_index is None:
+            self._season_index = {s: i for i, s in enumerate(self.seasons)}
+        return self._season_index.get(season, -1)
+
+    def to_dataframe(self, rows: Optional[np.ndarray] = None) -> "pd.DataFrame":
+        """
+        Anzeige-Tabelle (wie im Dashboard) für die angegebenen Zeilen.
+
+        Es werden nur die ausgewählten Zeilen gelesen, nicht das ganze Archiv.
+        """
+        import pandas as pd
+
+        if rows is None:
+            rows = np.arange(len(self))
+        teams = np.asarray(self.teams, dtype=object)
+        seasons = np.asarray(self.seasons, dtype=object)
+        home_score = np.asarray(self.home_score[rows])
+        away_score = np.asarray(self.away_score[rows])
+        matchday = np.asarray(self.matchday[rows])
+
+        return pd.DataFrame(
+            {
+                "Datum": np.asarray(self.date[rows]),
+                "Saison": seasons[self.season_id[rows]] if len(seasons) else [],
+                "Spieltag": np.where(matchday > 0, matchday.astype(str), ""),
+                "Heimteam": teams[self.home_id[rows]] if len(teams) else [],
+                "Auswärtsteam": teams[self.away_id[rows]] if len(teams) else [],
+                "Ergebnis": [f"{h}:{a}" for h, a in zip(home_score, away_score)],
+                "Tore": home_score.astype(np.int32) + away_score,
+            }
+        )
+
+    @classmethod
+    def from_records(
+        cls,
+        matches: Iterable[tuple],
+        goals: Iterable[tuple] = (),
+    ) -> "MatchColumns":
+        """
+        Baut die Spalten aus einfachen Tupeln auf.
+
+        Args:
+            matches: (match_key, season, matchday, date, home_team, away_team,
+                      home_score, away_score)
+            goals: (match_key, is_home, scorer, minute, penalty, own_goal)
+        """
+        team_ids: Dict[str, int] = {}
+        season_ids: Dict[str, int] = {}
+        player_ids: Dict[str, int] = {}
+        row_of_key: Dict[str, int] = {}
+        columns: Dict[str, list] = {name: [] for name in cls.MATCH_ARRAYS}
+
+        for row, (key, season, matchday, date, home, away, hs, aws) in enumerate(
+            matches
+        ):
+            row_of_key[key] = row
+            season = season or ""
+            columns["match_key"].append(key)
+            columns["season_id"].append(season_ids.setdefault(season, len(season_ids)))
+            columns["matchday"].append(matchday or 0)
+            columns["date"].append(date or "")
+            columns["date_key"].append(date_sort_key(date, season))
+            columns["home_id"].append(team_ids.setdefault(home, len(team_ids)))
+            columns["away_id"].append(team_ids.setdefault(away, len(team_ids)))
+            columns["home_score"].append(hs or 0)
+            columns["away_score"].append(aws or 0)
+
+        goal_columns: Dict[str, list] = {name: [] for name in cls.GOAL_ARRAYS}
+        for key, is_home, scorer, minute, penalty, own_goal in goals:
+            row = row_of_key.get(key)
+            if row is None:
+                continue
+            goal_columns["goal_match"].append(row)
+            goal_columns["goal_is_home"].append(bool(is_home))
+            goal_columns["goal_minute"].append(minute or 0)
+            goal_columns["goal_scorer_id"].append(
+                player_ids.setdefault(scorer or "", len(player_ids))
+            )
+            goal_columns["goal_penalty"].append(bool(penalty))
+            goal_columns["goal_own_goal"].append(bool(own_goal))
+
+        arrays = {
+            name: np.array(values, dtype=cls.MATCH_ARRAYS[name])
+            for name, values in columns.items()
+        }
+        goal_arrays = {
+            name: np.array(values, dtype=cls.GOAL_ARRAYS[name])
+            for name, values in goal_columns.items()
+        }
+
+        # Saisons chronologisch nummerieren (statt in Einfügereihenfolge)
+        seasons = sorted(season_ids, key=lambda s: (season_start_year(s), s))
+        remap = np.zeros(len(season_ids), dtype=np.int16)
+        for new_id, season in enumerate(seasons):
+            remap[season_ids[season]] = new_id
+        if len(arrays["season_id"]):
+            arrays["season_id"] = remap[arrays["season_id"]]
+
+        # Zeilen chronologisch sortieren, Tor-Verweise mitziehen
+        order = np.lexsort(
+            (
+                np.arange(len(arrays["season_id"])),
+                arrays["date_key"],
+                arrays["matchday"],
+                arrays["season_id"],
+            )
+        )
+        arrays = {name: values[order] for name, values in arrays.items()}
+        inverse = np.empty_like(order)
+        inverse[order] = np.arange(len(order))
+        goal_arrays["goal_match"] = inverse[goal_arrays["goal_match"]].astype(np.int32)
+        goal_order = np.argsort(goal_arrays["goal_match"], kind="stable")
+        goal_arrays = {name: values[goal_order] for name, values in goal_arrays.items()}
+
+        arrays.update(goal_arrays)
+        return cls(
+            teams=list(team_ids),
+            seasons=seasons,
+            arrays=arrays,
+            players=list(player_ids),
+        )
+
+    @classmethod
+    def from_games(cls, games: Iterable[GameData]) -> "MatchColumns":
+        """Baut die Spalten aus GameData-Objekten auf."""
+        games = list(games)
+        matches = (
+            (
+                match_key(game),
+                game.season,
+                game.matchday,
+                game.date,
+                game.home_team.name,
+                game.away_team.name,
+                game.home_score,
+                game.away_score,
+            )
+            for game in games
+        )
+        goals = (
+            (
+                match_key(game),
+                is_home,
+                goal.scorer,
+                goal.minute,
+                goal.penalty,
+                goal.own_goal,
+            )
+            for game in games
+            for is_home, goal_list in (
+                (True, game.home_goals),
+                (False, game.away_goals),
+            )
+            for goal in goal_list
+        )
+        return cls.from_records(matches, goals)
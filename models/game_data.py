@@ -51,6 +51,7 @@ class GameData:
     matchday: Optional[int] = None
     stadium: Optional[str] = None
     attendance: Optional[int] = None
+    url: Optional[str] = None
 
     def get_total_goals(self) -> int:
         """Gibt die Gesamtanzahl der Tore zurück."""
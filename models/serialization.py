@@ -0,0 +1,368 @@
+"""
+Binäre Serialisierung für GameData-Objekte
+
+Kompaktes, versioniertes Format für Caching, Checkpoints und den Datenaustausch
+zwischen Prozessen. Jeder Datensatz beginnt mit einem kleinen Header
+(Magic-Bytes, Schema-Version, Codec), danach folgt die msgpack-Nutzlast:
+eine String-Tabelle und positionsbasierte Arrays statt Dictionaries.
+"""
+
+import json
+import struct
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .game_data import GameData, Team, Player, Goal
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - Fallback ohne msgpack
+    msgpack = None
+
+
+MAGIC = b"BLGD"
+SCHEMA_VERSION = 2
+
+CODEC_MSGPACK = 1
+CODEC_JSON = 2
+
+_HEADER = struct.Struct("<4sBB")
+
+
+class SerializationError(ValueError):
+    """Fehler beim Kodieren oder Dekodieren von Spieldaten."""
+
+
+# ---------------------------------------------------------------------------
+# Objekt <-> Array Konvertierung
+# ---------------------------------------------------------------------------
+
+
+class _StringTable:
+    """Ersetzt wiederholte Strings (Teams, Spieler) durch Indizes."""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def __call__(self, value: Optional[str]) -> Optional[int]:
+        if value is None:
+            return None
+        index = self._index.get(value)
+        if index is None:
+            index = len(self.strings)
+            self._index[value] = index
+            self.strings.append(value)
+        return index
+
+
+class _NullableList(list):
+    """Liste, deren Zugriff mit None als Index wieder None liefert."""
+
+    def __getitem__(self, index):
+        if index is None:
+            return None
+        return list.__getitem__(self, index)
+
+
+def _pack_player(player: Player, intern: _StringTable) -> list:
+    return [intern(player.name), intern(player.position), player.number]
+
+
+def _pack_team(team: Team, intern: _StringTable) -> list:
+    return [intern(team.name), [_pack_player(p, intern) for p in team.players]]
+
+
+def _pack_goal(goal: Goal, intern: _StringTable) -> list:
+    return [
+        intern(goal.scorer),
+        goal.minute,
+        intern(goal.team),
+        intern(goal.assist),
+        goal.penalty,
+        goal.own_goal,
+    ]
+
+
+def _pack_game(game: GameData, intern: _StringTable) -> list:
+    return [
+        intern(game.date),
+        intern(game.season),
+        game.matchday,
+        game.home_score,
+        game.away_score,
+        intern(game.stadium),
+        game.attendance,
+        _pack_team(game.home_team, intern),
+        _pack_team(game.away_team, intern),
+        [_pack_goal(g, intern) for g in game.home_goals],
+        [_pack_goal(g, intern) for g in game.away_goals],
+        intern(game.url),
+    ]
+
+
+def _unpack_team_v1(data: list, strings: List[Optional[str]]) -> Team:
+    name, players = data
+    return Team(
+        name=strings[name],
+        players=[
+            Player(name=strings[n], position=strings[pos], number=num)
+            for n, pos, num in players
+        ],
+    )
+
+
+def _unpack_goal_v1(data: list, strings: List[Optional[str]]) -> Goal:
+    scorer, minute, team, assist, penalty, own_goal = data
+    return Goal(
+        scorer=strings[scorer],
+        minute=minute,
+        team=strings[team],
+        assist=strings[assist],
+        penalty=penalty,
+        own_goal=own_goal,
+    )
+
+
+def _unpack_game_v1(data: list, strings: List[Optional[str]]) -> GameData:
+    (
+        date,
+        season,
+        matchday,
+        home_score,
+        away_score,
+        stadium,
+        attendance,
+        home_team,
+        away_team,
+        home_goals,
+        away_goals,
+    ) = data
+    return GameData(
+        home_team=_unpack_team_v1(home_team, strings),
+        away_team=_unpack_team_v1(away_team, strings),
+        date=strings[date],
+        home_score=home_score,
+        away_score=away_score,
+        season=strings[season],
+        home_goals=[_unpack_goal_v1(g, strings) for g in home_goals],
+        away_goals=[_unpack_goal_v1(g, strings) for g in away_goals],
+        matchday=matchday,
+        stadium=strings[stadium],
+        attendance=attendance,
+    )
+
+
+def _unpack_game_v2(data: list, strings: List[Optional[str]]) -> GameData:
+    # v2 ergänzt die Spiel-URL als letztes Feld
+    game = _unpack_game_v1(data[:-1], strings)
+    game.url = strings[data[-1]]
+    return game
+
+
+# Dekoder je Schema-Version - ältere Versionen bleiben lesbar
+_GAME_DECODERS = {
+    1: _unpack_game_v1,
+    2: _unpack_game_v2,
+}
+
+
+# ---------------------------------------------------------------------------
+# Header und Codec
+# ---------------------------------------------------------------------------
+
+
+def _dumps(payload: Any, codec: int) -> bytes:
+    if codec == CODEC_MSGPACK:
+        return msgpack.packb(payload, use_bin_type=True)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+def _loads(payload: bytes, codec: int) -> Any:
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise SerializationError(
+                "Daten wurden mit msgpack kodiert, msgpack ist aber nicht installiert"
+            )
+        return msgpack.unpackb(payload, raw=False, use_list=True)
+    if codec == CODEC_JSON:
+        return json.loads(payload.decode("utf-8"))
+    raise SerializationError(f"Unbekannter Codec: {codec}")
+
+
+def _default_codec() -> int:
+    return CODEC_MSGPACK if msgpack is not None else CODEC_JSON
+
+
+def _encode_records(games: Iterable[GameData]) -> bytes:
+    intern = _StringTable()
+    records = [_pack_game(game, intern) for game in games]
+    codec = _default_codec()
+    return _HEADER.pack(MAGIC, SCHEMA_VERSION, codec) + _dumps(
+        [intern.strings, records], codec
+    )
+
+
+def _decode_records(data: bytes) -> List[GameData]:
+    if len(data) < _HEADER.size:
+        raise SerializationError("Daten zu kurz für einen gültigen Header")
+
+    magic, version, codec = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SerializationError("Ungültige Magic-Bytes - kein GameData-Format")
+
+    decoder = _GAME_DECODERS.get(version)
+    if decoder is None:
+        raise SerializationError(
+            f"Schema-Version {version} wird nicht unterstützt "
+            f"(aktuell: {SCHEMA_VERSION})"
+        )
+
+    strings, records = _loads(data[_HEADER.size :], codec)
+    # Index None -> None, damit optionale Felder ohne Sonderfall auflösen
+    lookup = _NullableList(strings)
+    return [decoder(record, lookup) for record in records]
+
+
+# ---------------------------------------------------------------------------
+# Öffentliche API
+# ---------------------------------------------------------------------------
+
+
+def encode_game(game: GameData) -> bytes:
+    """Kodiert ein einzelnes Spiel in das binäre Format."""
+    return _encode_records([game])
+
+
+def decode_game(data: bytes) -> GameData:
+    """Dekodiert ein einzelnes Spiel aus dem binären Format."""
+    games = _decode_records(data)
+    if len(games) != 1:
+        raise SerializationError(f"Erwartet 1 Spiel, gefunden: {len(games)}")
+    return games[0]
+
+
+def encode_games(games: Iterable[GameData]) -> bytes:
+    """Kodiert eine ganze Liste von Spielen (z.B. eine Saison) in einem Block."""
+    return _encode_records(games)
+
+
+def decode_games(data: bytes) -> List[GameData]:
+    """Dekodiert eine mit encode_games erzeugte Spieleliste."""
+    return _decode_records(data)
+
+
+def save_games(games: Iterable[GameData], path: str) -> str:
+    """Speichert Spiele im binären Format in eine Datei."""
+    file_path = Path(path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_bytes(encode_games(games))
+    return str(file_path)
+
+
+def load_games(path: str) -> List[GameData]:
+    """Lädt Spiele aus einer mit save_games geschriebenen Datei."""
+    return decode_games(Path(path).read_bytes())
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+
+def make_sample_games(count: int = 306, season: str = "2024-25") -> List[GameData]:
+    """Erzeugt synthetische Spiele mit Aufstellungen und Toren für Benchmarks."""
+    teams = [f"Verein {i:02d}" for i in range(18)]
+    games = []
+
+    for i in range(count):
+        home_name = teams[i % len(teams)]
+        away_name = teams[(i * 7 + 1) % len(teams)]
+        home_score, away_score = i % 4, (i // 3) % 3
+
+        home_team = Team(name=home_name)
+        away_team = Team(name=away_name)
+        for n in range(11):
+            home_team.add_player(Player(name=f"Spieler {n} {home_name}"))
+            away_team.add_player(Player(name=f"Spieler {n} {away_name}"))
+
+        games.append(
+            GameData(
+                home_team=home_team,
+                away_team=away_team,
+                date=f"{(i % 28) + 1:02d}.{(i % 12) + 1:02d}.2024",
+                home_score=home_score,
+                away_score=away_score,
+                season=season,
+                home_goals=[
+                    Goal(
+                        scorer=f"Spieler {g} {home_name}",
+                        minute=10 + g * 20,
+                        team=home_name,
+                    )
+                    for g in range(home_score)
+                ],
+                away_goals=[
+                    Goal(
+                        scorer=f"Spieler {g} {away_name}",
+                        minute=15 + g * 20,
+                        team=away_name,
+                    )
+                    for g in range(away_score)
+                ],
+                matchday=(i // 9) % 34 + 1,
+            )
+        )
+
+    return games
+
+
+def benchmark_against_excel(
+    games: List[GameData], work_dir: Optional[str] = None
+) -> Dict[str, float]:
+    """
+    Vergleicht den Binär-Roundtrip mit dem Excel-Roundtrip (Export + read_excel).
+
+    Returns:
+        Dict mit Laufzeiten in Sekunden und Dateigrößen in Bytes
+    """
+    import tempfile
+
+    import pandas as pd
+
+    from exporters.excel_exporter_new import ExcelExporter
+
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp_dir:
+        start = time.perf_counter()
+        binary_path = save_games(games, str(Path(tmp_dir) / "games.blgd"))
+        load_games(binary_path)
+        binary_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        exporter = ExcelExporter(tmp_dir)
+        excel_path = exporter.export_by_team(games, "games.xlsx")
+        pd.read_excel(excel_path, sheet_name=None)
+        excel_seconds = time.perf_counter() - start
+
+        return {
+            "games": len(games),
+            "binary_seconds": binary_seconds,
+            "excel_seconds": excel_seconds,
+            "speedup": excel_seconds / binary_seconds if binary_seconds else 0.0,
+            "binary_bytes": Path(binary_path).stat().st_size,
+            "excel_bytes": Path(excel_path).stat().st_size,
+        }
+
+
+if __name__ == "__main__":
+    results = benchmark_against_excel(make_sample_games(306))
+    print("📊 Serialisierungs-Benchmark (1 Saison):")
+    for key, value in results.items():
+        print(
+            f"   {key}: {value:.4f}"
+            if isinstance(value, float)
+            else f"   {key}: {value}"
+        )
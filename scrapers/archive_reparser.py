@@ -0,0 +1,305 @@
+"""
+ArchiveReparser - Offline-Neuauswertung des HTML-Archivs
+
+Führt die Extraktion von KickerScraper.parse_game_html über alle archivierten
+Spielseiten aus - ohne Netzwerk und verteilt auf alle CPU-Kerne. Danach
+werden Datenbank, Spaltenspeicher und Excel-Export neu aufgebaut und die
+Unterschiede zur vorherigen Auswertung je Saison ausgegeben.
+
+Aufruf:
+    python -m scrapers.archive_reparser [--workers N] [--no-export] [--dry-run]
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from models.game_data import GameData
+from .kicker_scraper import KickerScraper
+
+logger = logging.getLogger(__name__)
+
+# Nur Spiel-Detailseiten werden neu ausgewertet (gleiches Muster wie im Scraper)
+GAME_URL_PATTERN = re.compile(r"/([\w-]+)-gegen-([\w-]+)-(\d{4})-")
+
+
+@dataclass
+class SeasonDiff:
+    """Unterschiede einer Saison zwischen alter und neuer Auswertung."""
+
+    season: str
+    unchanged: int = 0
+    changed: int = 0
+    new: int = 0
+    failed: int = 0
+    changed_fields: Dict[str, int] = field(default_factory=dict)
+    examples: List[Tuple[str, List[str]]] = field(default_factory=list)
+
+    def summary(self) -> str:
+        fields = ", ".join(
+            f"{name}: {count}" for name, count in sorted(self.changed_fields.items())
+        )
+        return (
+            f"Saison {self.season}: {self.changed} geändert, {self.new} neu, "
+            f"{self.unchanged} unverändert, {self.failed} fehlgeschlagen"
+            + (f" ({fields})" if fields else "")
+        )
+
+
+# ---------------------------------------------------------------------------
+# Worker-Prozesse
+# ---------------------------------------------------------------------------
+
+_worker_archive = None
+_worker_scraper = None
+
+
+def _init_worker(archive_dir: str):
+    from storage.html_archive import HtmlArchive
+
+    global _worker_archive, _worker_scraper
+    _worker_archive = HtmlArchive(archive_dir)
+    _worker_scraper = KickerScraper()
+
+
+def _parse_chunk(urls: List[str]) -> List[Tuple[str, Optional[GameData]]]:
+    results = []
+    # Die Extraktion protokolliert ausführlich per print - im Worker verwerfen
+    with contextlib.redirect_stdout(io.StringIO()):
+        for url in urls:
+            try:
+                html = _worker_archive.get(url)
+                game = _worker_scraper.parse_game_html(url, html) if html else None
+            except Exception:
+                game = None
+            results.append((url, game))
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Vergleich
+# ---------------------------------------------------------------------------
+
+
+def _game_signature(game: GameData) -> Dict[str, object]:
+    """Vergleichbare Felder eines Spiels."""
+    return {
+        "ergebnis": (game.home_score, game.away_score),
+        "datum": game.date,
+        "teams": (game.home_team.name, game.away_team.name),
+        "tore": (
+            [(g.scorer, g.minute) for g in game.home_goals],
+            [(g.scorer, g.minute) for g in game.away_goals],
+        ),
+        "aufstellungen": (
+            [p.name for p in game.home_team.players],
+            [p.name for p in game.away_team.players],
+        ),
+    }
+
+
+def diff_games(old: GameData, new: GameData) -> List[str]:
+    """Namen der Felder, die sich zwischen zwei Auswertungen unterscheiden."""
+    old_signature = _game_signature(old)
+    new_signature = _game_signature(new)
+    return [
+        name for name in old_signature if old_signature[name] != new_signature[name]
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Reparser
+# ---------------------------------------------------------------------------
+
+
+class ArchiveReparser:
+    """Wertet das HTML-Archiv neu aus und baut die Datenbestände neu auf."""
+
+    def __init__(
+        self,
+        archive,
+        database,
+        columnar_store=None,
+        workers: Optional[int] = None,
+        chunk_size: int = 50,
+    ):
+        """
+        Args:
+            archive: HtmlArchive mit den gespeicherten Seiten
+            database: MatchDatabase, die aktualisiert wird
+            columnar_store: Optionaler ColumnarMatchStore zum Neuaufbau
+            workers: Anzahl Prozesse (Standard: alle CPU-Kerne)
+            chunk_size: Seiten pro Arbeitspaket
+        """
+        self.archive = archive
+        self.database = database
+        self.columnar_store = columnar_store
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+    def game_urls(self) -> List[str]:
+        """Alle archivierten Spiel-Detailseiten."""
+        return [
+            url
+            for url in self.archive.urls(contains="-gegen-")
+            if GAME_URL_PATTERN.search(url)
+        ]
+
+    def parse_all(
+        self,
+        urls: List[str],
+        progress_callback: Optional[Callable[[int, int, str], None]] = None,
+    ) -> Dict[str, Optional[GameData]]:
+        """Wertet alle URLs parallel aus (URL -> GameData oder None)."""
+        chunks = [
+            urls[i : i + self.chunk_size] for i in range(0, len(urls), self.chunk_size)
+        ]
+        results: Dict[str, Optional[GameData]] = {}
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(str(self.archive.archive_dir),),
+        ) as executor:
+            futures = [executor.submit(_parse_chunk, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                results.update(future.result())
+                if progress_callback:
+                    progress_callback(
+                        len(results), len(urls), f"{len(results)}/{len(urls)} Seiten"
+                    )
+
+        return results
+
+    def run(
+        self,
+        dry_run: bool = False,
+        progress_callback: Optional[Callable[[int, int, str], None]] = None,
+    ) -> Tuple[List[GameData], Dict[str, SeasonDiff]]:
+        """
+        Führt den kompletten Reparse aus.
+
+        Args:
+            dry_run: Nur vergleichen, Datenbank und Spaltenspeicher nicht ändern
+            progress_callback: Wird mit (current, total, status) aufgerufen
+
+        Returns:
+            Tuple aus neu ausgewerteten Spielen und Unterschieden je Saison
+        """
+        urls = self.game_urls()
+        previous = {game.url: game for game in self.database.load_games(keys=urls)}
+
+        parsed = self.parse_all(urls, progress_callback)
+
+        diffs: Dict[str, SeasonDiff] = {}
+        games: List[GameData] = []
+        for url in urls:
+            old = previous.get(url)
+            new = parsed.get(url)
+
+            if new is not None and old is not None:
+                # Saison und Spieltag stammen aus der Spieltagsübersicht
+                new.season = old.season or new.season
+                new.matchday = old.matchday or new.matchday
+                new.stadium = new.stadium or old.stadium
+                new.attendance = new.attendance or old.attendance
+
+            season = (new or old).season if (new or old) else "?"
+            diff = diffs.setdefault(season, SeasonDiff(season=season))
+
+            if new is None:
+                diff.failed += 1
+                continue
+
+            games.append(new)
+            if old is None:
+                diff.new += 1
+                continue
+
+            changed = diff_games(old, new)
+            if changed:
+                diff.changed += 1
+                for name in changed:
+                    diff.changed_fields[name] = diff.changed_fields.get(name, 0) + 1
+                if len(diff.examples) < 5:
+                    diff.examples.append((url, changed))
+            else:
+                diff.unchanged += 1
+
+        if not dry_run and games:
+            self.database.upsert_games(games)
+            if self.columnar_store is not None:
+                self.columnar_store.write_from_database(self.database)
+
+        return games, diffs
+
+
+def main(argv: Optional[List[str]] = None):
+    """Kommandozeilen-Einstieg für den Offline-Reparse."""
+    from config.settings_manager import get_settings_manager
+    from exporters.excel_exporter_new import ExcelExporter
+    from storage.columnar_store import ColumnarMatchStore
+    from storage.html_archive import HtmlArchive
+    from storage.match_database import MatchDatabase
+
+    settings = get_settings_manager()
+
+    parser = argparse.ArgumentParser(
+        description="Wertet archivierte kicker-Seiten offline neu aus"
+    )
+    parser.add_argument("--archive", default=settings.get_html_archive_path())
+    parser.add_argument("--database", default=settings.get_database_path())
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--no-export", action="store_true", help="Keinen Excel-Export erzeugen"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Nur Unterschiede anzeigen"
+    )
+    args = parser.parse_args(argv)
+
+    archive = HtmlArchive(args.archive)
+    database = MatchDatabase(args.database)
+    reparser = ArchiveReparser(
+        archive,
+        database,
+        columnar_store=ColumnarMatchStore(settings.get_columnar_store_path()),
+        workers=args.workers,
+    )
+
+    print(f"🗂️ {len(archive)} Seiten im Archiv, {reparser.workers} Prozesse")
+    start = time.perf_counter()
+    games, diffs = reparser.run(
+        dry_run=args.dry_run,
+        progress_callback=lambda current, total, status: print(
+            f"\r🔄 {status}", end="", flush=True
+        ),
+    )
+    print(f"\n✅ {len(games)} Spiele in {time.perf_counter() - start:.1f}s ausgewertet")
+
+    for season in sorted(diffs):
+        diff = diffs[season]
+        print(f"   {diff.summary()}")
+        for url, changed in diff.examples:
+            print(f"      - {url}: {', '.join(changed)}")
+
+    if games and not args.dry_run and not args.no_export:
+        exporter = ExcelExporter(settings.get_export_directory())
+        exported_file = exporter.export_by_team(
+            database.load_games(), "bundesliga_reparse.xlsx"
+        )
+        print(f"📊 Export neu erstellt: {exported_file}")
+
+    database.close()
+    archive.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ Verbesserter Kicker-Scraper mit vollständigen Namen und exakt 11 Spielern pro T
 
 import asyncio
 import re
-from typing import Dict, List, Any, Optional, Type
+from typing import Dict, Iterable, List, Any, Optional, Tuple, Type
 from types import TracebackType
 from bs4 import BeautifulSoup
 import httpx
@@ -13,10 +13,11 @@ from urllib.parse import urljoin
 
 from .base_scraper import BaseScraper
 from models.game_data import GameData, Team, Player, Goal
+from models.columnar import season_start_year
 
 
 class KickerScraper(BaseScraper):
-    def __init__(self, rate_limit_delay: float = 1.0):
+    def __init__(self, rate_limit_delay: float = 1.0, archive=None):
         """
         Initialisiert den Kicker-Scraper.
 
@@ -25,10 +26,12 @@ class KickerScraper(BaseScraper):
                              - 0.2 = Sehr schnell (risikoreicher)
                              - 0.5 = Schnell (moderates Risiko)
                              - 1.0 = Standard (sicher)
+            archive: Optionales HtmlArchive - jede geladene Seite wird archiviert
         """
         self.base_url = "https://www.kicker.de"
         self.session = None
         self.rate_limit_delay = rate_limit_delay
+        self.archive = archive
 
     async def analyze_structure(self, url: str) -> Dict[str, Any]:
         """Analysiert die DOM-Struktur einer Kicker-Seite"""
@@ -49,6 +52,11 @@ class KickerScraper(BaseScraper):
         try:
             response = await self.session.get(url)
             response.raise_for_status()
+            if self.archive is not None:
+                try:
+                    self.archive.put(url, response.text)
+                except Exception as e:
+                    print(f"⚠️ Archivierung fehlgeschlagen für {url}: {e}")
             return response.text
         except Exception as e:
             print(f"❌ Fehler beim Laden von {url}: {e}")
@@ -73,6 +81,15 @@ class KickerScraper(BaseScraper):
         if not html:
             return None
 
+        return self.parse_game_html(url, html)
+
+    def parse_game_html(self, url: str, html: str) -> Optional[GameData]:
+        """
+        Extrahiert ein Spiel aus bereits geladenem HTML (ohne Netzwerk).
+
+        Wird von parse_game_detail und vom Offline-Reparse des HTML-Archivs
+        verwendet.
+        """
         soup = BeautifulSoup(html, "html.parser")
 
         try:
@@ -82,13 +99,10 @@ class KickerScraper(BaseScraper):
                 print("❌ Konnte Team-Namen nicht aus URL extrahieren")
                 return None
 
-            home_team_url = url_match.group(1)
-            away_team_url = url_match.group(2)
             year = url_match.group(3)
 
             # Team-Namen bereinigen
-            home_team_name = self.clean_team_name(home_team_url)
-            away_team_name = self.clean_team_name(away_team_url)
+            home_team_name, away_team_name = self.teams_from_url(url)
 
             print(f"   Teams: {home_team_name} vs {away_team_name}")
 
@@ -140,6 +154,7 @@ class KickerScraper(BaseScraper):
                 home_goals=home_goals,
                 away_goals=away_goals,
                 matchday=None,
+                url=url,
             )
 
         except Exception as e:
@@ -1097,9 +1112,17 @@ class KickerScraper(BaseScraper):
         return all_games
 
     async def batch_download_with_progress(
-        self, seasons: List[str], progress_callback=None
+        self, seasons: List[str], progress_callback=None, game_callback=None
     ) -> List[GameData]:
-        """Lädt alle Spiele für gegebene Saisons mit Fortschritts-Callbacks"""
+        """
+        Lädt alle Spiele für gegebene Saisons mit Fortschritts-Callbacks
+
+        Args:
+            seasons: Liste der Saisons (z.B. "2024-25")
+            progress_callback: Wird mit (current, total, status) aufgerufen
+            game_callback: Wird mit jedem erfolgreich geparsten GameData aufgerufen
+                           (z.B. MatchDatabase.batch_writer() zum Streamen in die DB)
+        """
         all_games = []
         total_games_processed = 0
         
@@ -1153,6 +1176,8 @@ class KickerScraper(BaseScraper):
                         game_data.matchday = expected_matchday
 
                     season_games.append(game_data)
+                    if game_callback:
+                        game_callback(game_data)
                     total_goals = game_data.home_score + game_data.away_score
                     print(
                         f"✅ {game_data.home_team.name} {game_data.home_score}:{game_data.away_score} {game_data.away_team.name} (Spieltag {game_data.matchday}, {total_goals} {'Tor' if total_goals == 1 else 'Tore'})"
@@ -1177,48 +1202,13 @@ class KickerScraper(BaseScraper):
 
     async def get_season_game_urls(self, season: str) -> List[tuple]:
         """Lädt alle Spiel-URLs für eine Saison"""
-        season_url = f"https://www.kicker.de/bundesliga/spieltag/{season}/-1"
-
         try:
-            html = await self.fetch(season_url)
-            if not html:
+            soup = await self._fetch_season_schedule(season)
+            if soup is None:
                 return []
 
-            soup = BeautifulSoup(html, "html.parser")
             game_urls_with_matchdays = []
-
-            # Suche nach Spieltag-Überschriften
-            matchday_headers = soup.find_all(
-                ["h2", "h3"], class_=re.compile(r"headline|title")
-            )
-            expected_matchdays = self._get_expected_matchdays(season)
-
-            for headline in matchday_headers:
-                header_text = headline.get_text(strip=True)
-
-                # Prüfe auf Spieltag-Pattern
-                matchday_match = re.search(r"(\d+)\.\s*Spieltag", header_text)
-                if not matchday_match:
-                    continue
-
-                matchday_num = int(matchday_match.group(1))
-
-                # Überspringe Spieltage die über der erwarteten Anzahl liegen
-                if matchday_num > expected_matchdays:
-                    print(
-                        f"⚠️ Überspringe Spieltag {matchday_num} (über Limit {expected_matchdays})"
-                    )
-                    continue
-
-                print(f"📅 Gefunden: {header_text} -> Spieltag {matchday_num}")
-
-                parent_container = headline.parent
-                if not parent_container:
-                    continue
-
-                game_rows = parent_container.find_all(
-                    "div", class_="kick__v100-gameList__gameRow"
-                )
+            for matchday_num, game_rows in self._schedule_matchdays(soup, season):
                 games_found = 0
 
                 for game_row in game_rows:
@@ -1253,6 +1243,159 @@ class KickerScraper(BaseScraper):
             print(f"Fehler beim Laden der Saison-URLs: {e}")
             return []
 
+    async def _fetch_season_schedule(self, season: str) -> Optional[BeautifulSoup]:
+        """Lädt den Spielplan einer Saison ("2024-25") mit allen Spieltagen"""
+        season_url = f"https://www.kicker.de/bundesliga/spieltag/{season}/-1"
+        html = await self.fetch(season_url)
+        if not html:
+            return None
+        return BeautifulSoup(html, "html.parser")
+
+    def _schedule_matchdays(self, soup: BeautifulSoup, season: str) -> Iterable[tuple]:
+        """Liefert (Spieltag, Spielzeilen) für jeden Spieltag im Spielplan"""
+        # Suche nach Spieltag-Überschriften
+        matchday_headers = soup.find_all(
+            ["h2", "h3"], class_=re.compile(r"headline|title")
+        )
+        expected_matchdays = self._get_expected_matchdays(season)
+
+        for headline in matchday_headers:
+            header_text = headline.get_text(strip=True)
+
+            # Prüfe auf Spieltag-Pattern
+            matchday_match = re.search(r"(\d+)\.\s*Spieltag", header_text)
+            if not matchday_match:
+                continue
+
+            matchday_num = int(matchday_match.group(1))
+
+            # Überspringe Spieltage die über der erwarteten Anzahl liegen
+            if matchday_num > expected_matchdays:
+                print(
+                    f"⚠️ Überspringe Spieltag {matchday_num} (über Limit {expected_matchdays})"
+                )
+                continue
+
+            print(f"📅 Gefunden: {header_text} -> Spieltag {matchday_num}")
+
+            parent_container = headline.parent
+            if not parent_container:
+                continue
+
+            yield matchday_num, parent_container.find_all(
+                "div", class_="kick__v100-gameList__gameRow"
+            )
+
+    def _has_result(self, game_row) -> bool:
+        """Prüft, ob eine Spielzeile ein Endergebnis zeigt (statt Anstoßzeit)"""
+        if game_row.find(class_=re.compile(r"live", re.I)):
+            return False
+        scores = [
+            element.get_text(strip=True)
+            for element in game_row.find_all(
+                class_=re.compile(r"scoreHolder__score$")
+            )
+        ]
+        return len(scores) >= 2 and all(score.isdigit() for score in scores[:2])
+
+    async def get_season_schedule(self, season: str) -> List[tuple]:
+        """
+        Lädt alle Paarungen einer Saison - gespielte und noch ausstehende.
+
+        Anders als get_season_game_urls werden alle Spiel-Links einer Zeile
+        berücksichtigt (auch /vorschau für noch nicht gespielte Spiele).
+
+        Args:
+            season: Saison im kicker-Format ("2024-25")
+
+        Returns:
+            Liste von (schema_url, spieltag, heimverein, gastverein, gespielt)
+        """
+        try:
+            soup = await self._fetch_season_schedule(season)
+            if soup is None:
+                return []
+
+            schedule = {}
+            for matchday_num, game_rows in self._schedule_matchdays(soup, season):
+                for game_row in game_rows:
+                    link = game_row.find("a", href=re.compile(r"-gegen-"))
+                    href = link.get("href") if link else None
+                    if not href or not isinstance(href, str):
+                        continue
+
+                    # Einheitliche /schema-URL wie bei den gespeicherten Spielen
+                    base = re.sub(r"/[\w-]+$", "", href.split("?")[0])
+                    schema_url = urljoin(self.base_url, f"{base}/schema")
+                    teams = self.teams_from_url(schema_url)
+                    if teams and schema_url not in schedule:
+                        schedule[schema_url] = (
+                            schema_url,
+                            matchday_num,
+                            *teams,
+                            self._has_result(game_row),
+                        )
+
+            print(f"🗓️ Spielplan {season}: {len(schedule)} Paarungen")
+            return list(schedule.values())
+
+        except Exception as e:
+            print(f"Fehler beim Laden des Spielplans: {e}")
+            return []
+
+    def teams_from_url(self, url: str) -> Optional[Tuple[str, str]]:
+        """Heim- und Gastverein aus einer Spiel-URL (.../heim-gegen-gast-2024-...)"""
+        url_match = re.search(r"/([\w-]+)-gegen-([\w-]+)-(\d{4})-", url)
+        if not url_match:
+            return None
+        return (
+            self.clean_team_name(url_match.group(1)),
+            self.clean_team_name(url_match.group(2)),
+        )
+
+    async def get_remaining_fixtures(
+        self, season: str, known_urls: Iterable[str]
+    ) -> List[tuple]:
+        """
+        Lädt die noch ausstehenden Spiele einer Saison.
+
+        Grundlage ist der komplette Spielplan (get_season_schedule): Paarungen
+        ohne Ergebnis, die noch nicht erfasst sind.
+
+        Args:
+            season: Saison in beliebiger Schreibweise ("2024", "2024-25", "2024/25")
+            known_urls: URLs der bereits erfassten Spiele
+
+        Returns:
+            Liste von (url, spieltag, heimverein, gastverein)
+        """
+        start_year = season_start_year(season)
+        if not start_year:
+            return []
+        known = set(known_urls)
+        schedule = await self.get_season_schedule(
+            f"{start_year}-{str(start_year + 1)[2:]}"
+        )
+
+        fixtures = []
+        missing = 0
+        for url, matchday, home, away, played in schedule:
+            if url in known:
+                continue
+            if played:
+                # Bereits gespielt, aber nicht erfasst - kein ausstehendes Spiel
+                missing += 1
+                continue
+            fixtures.append((url, matchday, home, away))
+
+        if missing:
+            print(
+                f"⚠️ {missing} gespielte Spiele der Saison {season} fehlen in der "
+                "Datenbank - die Tabelle ist unvollständig"
+            )
+        print(f"📅 {len(fixtures)} ausstehende Spiele in Saison {season}")
+        return fixtures
+
     def _get_expected_matchdays(self, season: str) -> int:
         """Bestimmt die erwartete Anzahl der Spieltage basierend auf der Saison"""
         # Extrahiere das Startjahr der Saison
@@ -0,0 +1,9 @@
+"""
+Storage package - Persistente Datenspeicher für Bundesliga Scraper
+"""
+
+from .match_database import MatchDatabase, BatchWriter, match_key
+from .columnar_store import ColumnarMatchStore
+from .html_archive import HtmlArchive
+
+__all__ = ["MatchDatabase", "BatchWriter", "ColumnarMatchStore", "HtmlArchive", "match_key"]
@@ -0,0 +1,183 @@
+"""
+ColumnarMatchStore - Memory-mapped Spaltenspeicher für das Spielarchiv
+
+Jede Spalte von MatchColumns liegt als eigene .npy-Datei auf der Platte und
+wird beim Öffnen per np.load(mmap_mode="r") eingeblendet. Gelesen werden
+dabei nur meta.json und die Dateiköpfe; welche Seiten tatsächlich von der
+Platte kommen, entscheidet das Betriebssystem beim Zugriff. Startzeit und
+Speicherbedarf bleiben so unabhängig von der Archivgröße.
+
+Layout:
+    <store>/CURRENT          -> Name der aktuellen Version (z.B. "v3")
+    <store>/v3/meta.json     -> Wörterbücher (Vereine, Saisons) und Zeilenzahl
+    <store>/v3/players.json  -> Spielernamen (verzögert geladen)
+    <store>/v3/<spalte>.npy  -> je eine Datei pro Spalte
+
+Neue Versionen werden vollständig geschrieben, bevor CURRENT umgestellt wird.
+Die vorherige Version bleibt erhalten (KEEP_VERSIONS), damit bereits
+geöffnete MatchColumns - z.B. in einer anderen Streamlit-Sitzung oder GUI -
+weiter lesen können; ihre Spalten sind ohnehin beim Öffnen eingeblendet.
+Ältere Versionen werden entfernt, die Spaltendateien zuerst: ist eine davon
+noch eingeblendet (Windows), bleibt die Version vollständig erhalten und
+wird beim nächsten Schreiben erneut versucht.
+"""
+
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+import numpy as np
+
+from models.game_data import GameData
+from models.columnar import MatchColumns
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+# Anzahl Versionen, die nach dem Schreiben erhalten bleiben (aktuelle + vorherige)
+KEEP_VERSIONS = 2
+
+
+class ColumnarMatchStore:
+    """Schreib- und Lesezugriff auf einen memory-mapped Spaltenspeicher."""
+
+    def __init__(self, store_dir: str = "data/columnar"):
+        self.store_dir = Path(store_dir)
+
+    # ------------------------------------------------------------------
+    # Schreiben
+    # ------------------------------------------------------------------
+
+    def _current_version(self) -> Optional[str]:
+        pointer = self.store_dir / "CURRENT"
+        if not pointer.exists():
+            return None
+        return pointer.read_text(encoding="utf-8").strip() or None
+
+    def write(self, data: Union[MatchColumns, Iterable[GameData]]) -> Path:
+        """
+        Schreibt eine neue Version des Speichers.
+
+        Args:
+            data: MatchColumns oder GameData-Objekte
+
+        Returns:
+            Path: Verzeichnis der geschriebenen Version
+        """
+        columns = (
+            data if isinstance(data, MatchColumns) else MatchColumns.from_games(data)
+        )
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+
+        current = self._current_version()
+        number = int(current[1:]) + 1 if current else 1
+        version = f"v{number}"
+        version_dir = self.store_dir / version
+        if version_dir.exists():
+            shutil.rmtree(version_dir)
+        version_dir.mkdir()
+
+        for name in list(MatchColumns.MATCH_ARRAYS) + list(MatchColumns.GOAL_ARRAYS):
+            np.save(
+                version_dir / f"{name}.npy",
+                np.ascontiguousarray(getattr(columns, name)),
+            )
+
+        meta = {
+            "format_version": FORMAT_VERSION,
+            "rows": len(columns),
+            "goals": int(len(columns.goal_match)),
+            "teams": columns.teams,
+            "seasons": columns.seasons,
+        }
+        (version_dir / "meta.json").write_text(
+            json.dumps(meta, ensure_ascii=False), encoding="utf-8"
+        )
+        (version_dir / "players.json").write_text(
+            json.dumps(columns.players, ensure_ascii=False), encoding="utf-8"
+        )
+
+        # Zeiger atomar umstellen
+        pointer_tmp = self.store_dir / "CURRENT.tmp"
+        pointer_tmp.write_text(version, encoding="utf-8")
+        os.replace(pointer_tmp, self.store_dir / "CURRENT")
+
+        self._cleanup(keep=version)
+        logger.info(
+            f"Spaltenspeicher geschrieben: {version_dir} ({len(columns)} Spiele)"
+        )
+        return version_dir
+
+    def _cleanup(self, keep: str):
+        """Entfernt alle Versionen außer den letzten KEEP_VERSIONS (bis keep)."""
+        newest = int(keep[1:])
+        for path in self.store_dir.glob("v*"):
+            if not path.is_dir() or not path.name[1:].isdigit():
+                continue
+            if int(path.name[1:]) > newest - KEEP_VERSIONS:
+                continue
+            try:
+                # Spalten zuerst - schlägt eine fehl (noch eingeblendet unter
+                # Windows), bleiben meta.json und players.json lesbar
+                for column in path.glob("*.npy"):
+                    column.unlink()
+                shutil.rmtree(path)
+            except OSError:
+                # Noch in Verwendung - beim nächsten Schreiben erneut
+                pass
+
+    def write_from_database(self, database) -> Path:
+        """Baut den Speicher direkt aus einer MatchDatabase (ohne GameData)."""
+        return self.write(database.load_columns())
+
+    # ------------------------------------------------------------------
+    # Lesen
+    # ------------------------------------------------------------------
+
+    def exists(self) -> bool:
+        version = self._current_version()
+        return version is not None and (self.store_dir / version / "meta.json").exists()
+
+    def open(self) -> Optional[MatchColumns]:
+        """
+        Öffnet die aktuelle Version in O(1).
+
+        Gelesen werden nur meta.json und die Köpfe der Spaltendateien; alle
+        Spalten werden sofort eingeblendet (nicht erst beim ersten Zugriff),
+        damit sie auch nach dem Schreiben neuerer Versionen gültig bleiben.
+        Die Spielernamen werden verzögert geladen.
+
+        Returns:
+            MatchColumns oder None, falls noch kein Speicher existiert
+        """
+        if not self.exists():
+            return None
+
+        version_dir = self.store_dir / self._current_version()
+        meta = json.loads((version_dir / "meta.json").read_text(encoding="utf-8"))
+        if meta.get("format_version") != FORMAT_VERSION:
+            logger.warning(
+                f"Spaltenspeicher-Format {meta.get('format_version')} nicht unterstützt"
+            )
+            return None
+
+        arrays = {
+            name: np.load(version_dir / f"{name}.npy", mmap_mode="r")
+            for name in list(MatchColumns.MATCH_ARRAYS) + list(MatchColumns.GOAL_ARRAYS)
+        }
+
+        def load_players():
+            return json.loads(
+                (version_dir / "players.json").read_text(encoding="utf-8")
+            )
+
+        return MatchColumns(
+            teams=meta["teams"],
+            seasons=meta["seasons"],
+            arrays=arrays,
+            players=load_players,
+        )
@@ -0,0 +1,606 @@
+"""
+HtmlArchive - Komprimiertes Archiv aller abgerufenen kicker-Seiten
+
+Jede Seite wird als eigener zstd-Frame an eine Segmentdatei angehängt. Ein
+SQLite-Index ordnet jeder URL Segment, Offset und Länge zu, so dass einzelne
+Seiten ohne Entpacken des restlichen Archivs gelesen werden können.
+
+Da sich kicker-Seiten einen Großteil ihres Markups teilen, wird nach den
+ersten Seiten ein zstd-Wörterbuch trainiert und für alle weiteren Seiten
+verwendet. compact() schreibt alle Seiten mit dem aktuellen Wörterbuch neu
+und gibt dabei ersetzte Seitenversionen frei. Das geschieht automatisch
+nach dem Wörterbuch-Training und sobald ersetzte Versionen mehr als
+compact_ratio der Segmente belegen. Schlägt das Training fehl, wird es erst
+nach einer Verdopplung des Archivs erneut versucht.
+
+Training und Kompaktierung laufen in einem Hintergrund-Thread, damit put()
+(und damit der Scraper) nicht auf das Umschreiben des Archivs wartet.
+Gelesen wird unter der Sperre des Archivs; alte Segmente werden erst
+gelöscht, wenn der Index auf die neuen zeigt.
+
+Ohne das Paket zstandard wird zlib verwendet (ohne Wörterbuch).
+
+Layout:
+    <archiv>/index.db             -> URL -> (Segment, Offset, Länge) + Wörterbücher
+    <archiv>/segment-00001.bin    -> aneinandergehängte Frames
+"""
+
+import logging
+import sqlite3
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard as zstd
+except ImportError:  # pragma: no cover - zstandard ist optional
+    zstd = None
+
+logger = logging.getLogger(__name__)
+
+
+CODEC_ZSTD = "zstd"
+CODEC_ZLIB = "zlib"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    segment INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    raw_size INTEGER NOT NULL,
+    codec TEXT NOT NULL,
+    dict_id INTEGER,
+    fetched_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS dictionaries (
+    id INTEGER PRIMARY KEY,
+    data BLOB NOT NULL,
+    samples INTEGER NOT NULL,
+    created_at TEXT NOT NULL
+);
+"""
+
+
+class _SegmentWriter:
+    """Hängt Frames fortlaufend an Segmentdateien an."""
+
+    def __init__(self, archive: "HtmlArchive", segment: Optional[int] = None):
+        self.archive = archive
+        self.segment = segment
+        self.handle = None
+
+    def append(self, data: bytes) -> Tuple[int, int]:
+        """Hängt einen Frame an (Segment, Offset)."""
+        if self.handle is None and self.segment is not None:
+            self.handle = open(self.archive._segment_path(self.segment), "ab")
+        if self.handle is not None:
+            position = self.handle.tell()
+            if position and position + len(data) > self.archive.segment_size:
+                self.close()
+                self.segment = None
+        if self.segment is None:
+            self.segment = self.archive._allocate_segment()
+            self.handle = open(self.archive._segment_path(self.segment), "ab")
+
+        offset = self.handle.tell()
+        self.handle.write(data)
+        self.handle.flush()
+        return self.segment, offset
+
+    def close(self):
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+
+
+class HtmlArchive:
+    """Segmentiertes, wörterbuch-komprimiertes Archiv für HTML-Seiten."""
+
+    def __init__(
+        self,
+        archive_dir: str = "data/html_archive",
+        segment_size: int = 64 * 1024 * 1024,
+        level: int = 10,
+        train_after: int = 100,
+        dict_size: int = 112 * 1024,
+        compact_ratio: Optional[float] = 0.5,
+    ):
+        """
+        Öffnet (oder erstellt) ein Archiv.
+
+        Args:
+            archive_dir: Verzeichnis für Index und Segmente
+            segment_size: Maximale Größe einer Segmentdatei in Bytes
+            level: zstd-Kompressionsstufe
+            train_after: Anzahl Seiten, nach der das Wörterbuch trainiert wird
+            dict_size: Zielgröße des Wörterbuchs in Bytes
+            compact_ratio: Anteil ersetzter Seitenversionen an den Segmenten,
+                ab dem im Hintergrund kompaktiert wird (None = nie)
+        """
+        self.archive_dir = Path(archive_dir)
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size
+        self.level = level
+        self.train_after = train_after
+        self.dict_size = dict_size
+        self.compact_ratio = compact_ratio
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            str(self.archive_dir / "index.db"), check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+        self._dictionaries: Dict[int, "zstd.ZstdCompressionDict"] = {}
+        self._decompressors: Dict[Optional[int], "zstd.ZstdDecompressor"] = {}
+        self._compressor = None
+        self._dict_id: Optional[int] = None
+        self._load_latest_dictionary()
+
+        self._last_segment_number = self._last_segment()
+        self._writer = _SegmentWriter(self, self._last_segment_number)
+
+        # Seitenanzahl für den nächsten Trainingsversuch (verdoppelt sich nach
+        # einem Fehlschlag) und Bytes ersetzter Seitenversionen in den Segmenten
+        self._next_training = train_after
+        self._garbage_bytes = self._measure_garbage()
+
+        # Hintergrund-Wartung (Training/Kompaktierung); höchstens eine zugleich
+        self._maintenance: Optional[threading.Thread] = None
+        self._compacting = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> Optional["HtmlArchive"]:
+        """Öffnet das Archiv gemäß Einstellungen (None, wenn deaktiviert)."""
+        from config.settings_manager import get_settings_manager
+
+        settings = get_settings_manager()
+        if not settings.is_html_archive_enabled():
+            return None
+        return cls(settings.get_html_archive_path())
+
+    # ------------------------------------------------------------------
+    # Wörterbuch
+    # ------------------------------------------------------------------
+
+    def _load_latest_dictionary(self):
+        if zstd is None:
+            return
+        row = self._conn.execute(
+            "SELECT id, data FROM dictionaries ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        if row:
+            self._dict_id = row[0]
+            self._dictionaries[row[0]] = zstd.ZstdCompressionDict(row[1])
+        self._compressor = None
+
+    def _dictionary(self, dict_id: int) -> "zstd.ZstdCompressionDict":
+        with self._lock:
+            if dict_id not in self._dictionaries:
+                row = self._conn.execute(
+                    "SELECT data FROM dictionaries WHERE id = ?", (dict_id,)
+                ).fetchone()
+                if row is None:
+                    raise KeyError(f"Wörterbuch {dict_id} fehlt im Archiv")
+                self._dictionaries[dict_id] = zstd.ZstdCompressionDict(row[0])
+            return self._dictionaries[dict_id]
+
+    def train_dictionary(self, max_samples: int = 2000) -> Optional[int]:
+        """
+        Trainiert ein neues zstd-Wörterbuch aus bereits archivierten Seiten.
+
+        Returns:
+            ID des neuen Wörterbuchs oder None, wenn zstandard fehlt oder zu
+            wenige Seiten vorhanden sind
+        """
+        if zstd is None:
+            return None
+
+        with self._lock:
+            urls = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT url FROM pages ORDER BY fetched_at DESC LIMIT ?",
+                    (max_samples,),
+                )
+            ]
+        if len(urls) < 10:
+            return None
+
+        # Nur das Lesen der Proben hält die Sperre, nicht das Training
+        samples = [html.encode("utf-8") for html in map(self.get, urls) if html]
+        try:
+            dictionary = zstd.train_dictionary(self.dict_size, samples)
+        except zstd.ZstdError as e:
+            logger.warning(f"Wörterbuch-Training fehlgeschlagen: {e}")
+            return None
+
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO dictionaries (data, samples, created_at) VALUES (?, ?, ?)",
+                (dictionary.as_bytes(), len(samples), datetime.now().isoformat()),
+            )
+            self._conn.commit()
+            self._dict_id = cursor.lastrowid
+            self._dictionaries[self._dict_id] = dictionary
+            self._compressor = None
+
+        logger.info(
+            f"zstd-Wörterbuch {self._dict_id} aus {len(samples)} Seiten trainiert"
+        )
+        return self._dict_id
+
+    # ------------------------------------------------------------------
+    # Kompression
+    # ------------------------------------------------------------------
+
+    def _new_compressor(self) -> Tuple["zstd.ZstdCompressor", Optional[int]]:
+        """Kompressor für das aktuelle Wörterbuch (und dessen ID)."""
+        with self._lock:
+            dict_id = self._dict_id
+            dictionary = self._dictionaries[dict_id] if dict_id is not None else None
+        return zstd.ZstdCompressor(level=self.level, dict_data=dictionary), dict_id
+
+    def _compress(
+        self, raw: bytes, compressor: Optional[tuple] = None
+    ) -> Tuple[bytes, str, Optional[int]]:
+        """
+        Komprimiert eine Seite.
+
+        Ohne compressor wird der gemeinsame Kompressor verwendet (nur unter
+        der Sperre); compact() übergibt einen eigenen aus _new_compressor().
+        """
+        if zstd is None:
+            return zlib.compress(raw, 9), CODEC_ZLIB, None
+
+        if compressor is None:
+            if self._compressor is None:
+                self._compressor = self._new_compressor()
+            compressor = self._compressor
+        zstd_compressor, dict_id = compressor
+        return zstd_compressor.compress(raw), CODEC_ZSTD, dict_id
+
+    def _decompress(
+        self,
+        data: bytes,
+        codec: str,
+        dict_id: Optional[int],
+        decompressors: Optional[dict] = None,
+    ) -> bytes:
+        """
+        Entpackt einen Frame.
+
+        zstd-Dekompressoren sind nicht threadsicher: ohne decompressors wird
+        der gemeinsame Cache verwendet (nur unter der Sperre), Leser außerhalb
+        der Sperre übergeben einen eigenen.
+        """
+        if codec == CODEC_ZLIB:
+            return zlib.decompress(data)
+        if codec != CODEC_ZSTD:
+            raise ValueError(f"Unbekannter Codec im Archiv: {codec}")
+        if zstd is None:
+            raise ImportError(
+                "Archiv enthält zstd-Frames, zstandard ist aber nicht installiert"
+            )
+
+        if decompressors is None:
+            decompressors = self._decompressors
+        decompressor = decompressors.get(dict_id)
+        if decompressor is None:
+            dictionary = self._dictionary(dict_id) if dict_id is not None else None
+            decompressor = zstd.ZstdDecompressor(dict_data=dictionary)
+            decompressors[dict_id] = decompressor
+        return decompressor.decompress(data)
+
+    # ------------------------------------------------------------------
+    # Segmente
+    # ------------------------------------------------------------------
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.archive_dir / f"segment-{segment:05d}.bin"
+
+    def _last_segment(self) -> int:
+        numbers = [
+            int(path.stem.split("-")[1])
+            for path in self.archive_dir.glob("segment-*.bin")
+        ]
+        return max(numbers, default=1)
+
+    def _segment_bytes(self) -> int:
+        return sum(
+            path.stat().st_size for path in self.archive_dir.glob("segment-*.bin")
+        )
+
+    def _measure_garbage(self) -> int:
+        """Bytes in den Segmenten, auf die der Index nicht (mehr) verweist."""
+        with self._lock:
+            stored_bytes = self._conn.execute(
+                "SELECT COALESCE(SUM(length), 0) FROM pages"
+            ).fetchone()[0]
+            return max(self._segment_bytes() - stored_bytes, 0)
+
+    def _allocate_segment(self) -> int:
+        """Vergibt die Nummer eines neuen Segments (put und compact)."""
+        with self._lock:
+            self._last_segment_number += 1
+            return self._last_segment_number
+
+    # ------------------------------------------------------------------
+    # Öffentliche API
+    # ------------------------------------------------------------------
+
+    def put(self, url: str, html: str):
+        """Archiviert eine Seite (eine vorhandene Version wird ersetzt)."""
+        if not html:
+            return
+
+        raw = html.encode("utf-8")
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT length FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if previous:
+                self._garbage_bytes += previous[0]
+
+            data, codec, dict_id = self._compress(raw)
+            segment, offset = self._writer.append(data)
+            self._conn.execute(
+                """
+                INSERT INTO pages
+                    (url, segment, offset, length, raw_size, codec, dict_id, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    segment = excluded.segment,
+                    offset = excluded.offset,
+                    length = excluded.length,
+                    raw_size = excluded.raw_size,
+                    codec = excluded.codec,
+                    dict_id = excluded.dict_id,
+                    fetched_at = excluded.fetched_at
+                """,
+                (
+                    url,
+                    segment,
+                    offset,
+                    len(data),
+                    len(raw),
+                    codec,
+                    dict_id,
+                    datetime.now().isoformat(),
+                ),
+            )
+            self._conn.commit()
+            self._schedule_maintenance()
+
+    def _training_due(self) -> bool:
+        return (
+            zstd is not None
+            and self._dict_id is None
+            and len(self) >= self._next_training
+        )
+
+    def _compaction_due(self) -> bool:
+        return (
+            self.compact_ratio is not None
+            and self._garbage_bytes > 0
+            and self._garbage_bytes > self.compact_ratio * self._segment_bytes()
+        )
+
+    def _schedule_maintenance(self):
+        """Startet Training/Kompaktierung im Hintergrund, wenn fällig (siehe put)."""
+        with self._lock:
+            if self._maintenance is not None and self._maintenance.is_alive():
+                return
+            if self._training_due():
+                reason = f"Wörterbuch-Training ab {len(self)} Seiten"
+            elif self._compaction_due():
+                reason = f"{self._garbage_bytes} Bytes ersetzter Seitenversionen"
+            else:
+                return
+
+            logger.info(f"HTML-Archiv-Wartung im Hintergrund gestartet: {reason}")
+            self._maintenance = threading.Thread(
+                target=self._maintain, name="html-archive-maintenance", daemon=True
+            )
+            self._maintenance.start()
+
+    def _maintain(self):
+        """Trainiert das Wörterbuch bzw. kompaktiert (Hintergrund-Thread)."""
+        try:
+            if self._training_due():
+                pages = len(self)
+                if self.train_dictionary() is not None:
+                    # Bisherige Seiten mit dem neuen Wörterbuch neu schreiben
+                    self.compact()
+                    return
+                self._next_training = pages * 2
+                logger.info(
+                    f"Nächster Wörterbuch-Versuch ab {self._next_training} Seiten"
+                )
+
+            if self._compaction_due():
+                self.compact()
+        except Exception as e:
+            logger.error(f"Wartung des HTML-Archivs fehlgeschlagen: {e}")
+
+    def wait_for_maintenance(self):
+        """Wartet auf eine laufende Hintergrund-Wartung."""
+        maintenance = self._maintenance
+        if maintenance is not None:
+            maintenance.join()
+
+    def get(self, url: str) -> Optional[str]:
+        """Liest eine archivierte Seite oder None, falls sie fehlt."""
+        # Lesen und Entpacken unter der Sperre: compact() löscht alte Segmente
+        # ebenfalls nur unter der Sperre, und die Dekompressoren sind geteilt
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT segment, offset, length, codec, dict_id FROM pages "
+                "WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            segment, offset, length, codec, dict_id = row
+            with open(self._segment_path(segment), "rb") as f:
+                f.seek(offset)
+                data = f.read(length)
+            return self._decompress(data, codec, dict_id).decode("utf-8")
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return (
+                self._conn.execute(
+                    "SELECT 1 FROM pages WHERE url = ?", (url,)
+                ).fetchone()
+                is not None
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def urls(self, contains: Optional[str] = None) -> List[str]:
+        """Alle archivierten URLs, optional gefiltert nach Teilstring."""
+        with self._lock:
+            if contains:
+                rows = self._conn.execute(
+                    "SELECT url FROM pages WHERE instr(url, ?) > 0 ORDER BY url",
+                    (contains,),
+                )
+            else:
+                rows = self._conn.execute("SELECT url FROM pages ORDER BY url")
+            return [row[0] for row in rows]
+
+    def _locations(self) -> List[tuple]:
+        """Indexzeilen (URL, Segment, Offset, Länge, Codec, Wörterbuch), sortiert."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT url, segment, offset, length, codec, dict_id FROM pages "
+                "ORDER BY segment, offset"
+            ).fetchall()
+
+    def _read_sequential(self, locations: List[tuple]) -> Iterator[Tuple[str, str]]:
+        """
+        Liest die Seiten zu _locations(); jedes Segment wird einmal geöffnet.
+
+        Läuft ohne die Sperre und mit eigenen Dekompressoren. Ein offenes
+        Segment bleibt lesbar, auch wenn compact() es inzwischen löscht; ist
+        ein Segment beim Öffnen schon verschwunden, werden dessen Seiten über
+        get() am neuen Ort gelesen.
+        """
+        decompressors: Dict[Optional[int], "zstd.ZstdDecompressor"] = {}
+        handle, current = None, None
+        try:
+            for url, segment, offset, length, codec, dict_id in locations:
+                if segment != current:
+                    if handle is not None:
+                        handle.close()
+                        handle = None
+                    current = segment
+                    try:
+                        handle = open(self._segment_path(segment), "rb")
+                    except FileNotFoundError:
+                        pass
+                if handle is None:
+                    html = self.get(url)
+                    if html is not None:
+                        yield url, html
+                    continue
+                handle.seek(offset)
+                data = handle.read(length)
+                html = self._decompress(data, codec, dict_id, decompressors)
+                yield url, html.decode("utf-8")
+        finally:
+            if handle is not None:
+                handle.close()
+
+    def iter_pages(self) -> Iterator[Tuple[str, str]]:
+        """Iteriert (URL, HTML) in Speicherreihenfolge (sequentielles Lesen)."""
+        yield from self._read_sequential(self._locations())
+
+    def stats(self) -> Dict[str, float]:
+        """Seitenanzahl, Rohgröße, komprimierte Größe und Verhältnis."""
+        with self._lock:
+            pages, raw_bytes, stored_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), "
+                "COALESCE(SUM(length), 0) FROM pages"
+            ).fetchone()
+        segment_bytes = self._segment_bytes()
+        return {
+            "pages": pages,
+            "raw_bytes": raw_bytes,
+            "stored_bytes": stored_bytes,
+            "segment_bytes": segment_bytes,
+            "ratio": stored_bytes / raw_bytes if raw_bytes else 0.0,
+        }
+
+    def compact(self):
+        """
+        Schreibt alle Seiten mit dem aktuellen Wörterbuch in neue Segmente.
+
+        Entfernt dabei ersetzte Seitenversionen und komprimiert Seiten, die
+        vor dem Wörterbuch-Training archiviert wurden, erneut. Die Seiten
+        werden einzeln gelesen und geschrieben; im Speicher liegen nur die
+        Indexzeilen. Das Umschreiben läuft ohne die Sperre, so dass put() und
+        get() weiterarbeiten; neue Seiten landen dabei in eigenen Segmenten.
+        Der Index wird nur für Seiten umgestellt, die währenddessen nicht
+        ersetzt wurden, und die alten Segmente werden erst danach gelöscht.
+        """
+        with self._compacting:
+            with self._lock:
+                locations = self._locations()
+                old_segments = list(self.archive_dir.glob("segment-*.bin"))
+                # put() schreibt ab jetzt in ein neues Segment
+                self._writer.close()
+                self._writer = _SegmentWriter(self)
+
+            origins = {url: (segment, offset) for url, segment, offset, *_ in locations}
+            compressor = self._new_compressor() if zstd is not None else None
+            writer = _SegmentWriter(self)
+            updates = []
+            try:
+                for url, html in self._read_sequential(locations):
+                    data, codec, dict_id = self._compress(
+                        html.encode("utf-8"), compressor
+                    )
+                    segment, offset = writer.append(data)
+                    updates.append(
+                        (segment, offset, len(data), codec, dict_id, url) + origins[url]
+                    )
+            finally:
+                writer.close()
+
+            with self._lock:
+                self._conn.executemany(
+                    "UPDATE pages SET segment = ?, offset = ?, length = ?, "
+                    "codec = ?, dict_id = ? "
+                    "WHERE url = ? AND segment = ? AND offset = ?",
+                    updates,
+                )
+                self._conn.commit()
+
+                for path in old_segments:
+                    path.unlink()
+                self._garbage_bytes = self._measure_garbage()
+
+        logger.info(f"HTML-Archiv kompaktiert: {len(updates)} Seiten")
+
+    def close(self):
+        """Wartet auf die Hintergrund-Wartung und schließt Segment und Index."""
+        self.wait_for_maintenance()
+        with self._lock:
+            self._writer.close()
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
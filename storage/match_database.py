@@ -0,0 +1,837 @@
+"""
+MatchDatabase - Eingebettete SQLite-Datenbank für gescrapte Spiele
+
+Speichert Spiele, Tore, Aufstellungen, Vereine und Spieler normalisiert.
+Spiele werden über die kicker-URL eindeutig identifiziert (Upsert), so dass
+wiederholte Downloads bestehende Einträge aktualisieren statt sie zu
+duplizieren.
+
+Der Spielerindex (Tabelle player_stats) fasst Tore und Einsätze je Spieler,
+Saison und Verein zusammen. Er wird bei jedem Upsert um den alten Beitrag des
+Spiels bereinigt und um den neuen ergänzt, so dass Torjägerlisten und
+Karrieredaten ohne Durchlauf über alle Spiele abgefragt werden können.
+"""
+
+import logging
+import sqlite3
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from models.game_data import GameData, Team, Player, Goal
+from models.columnar import MatchColumns, match_key, player_key
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS teams (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS players (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    season TEXT NOT NULL,
+    matchday INTEGER,
+    date TEXT,
+    home_team_id INTEGER NOT NULL REFERENCES teams(id),
+    away_team_id INTEGER NOT NULL REFERENCES teams(id),
+    home_score INTEGER NOT NULL,
+    away_score INTEGER NOT NULL,
+    stadium TEXT,
+    attendance INTEGER,
+    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS goals (
+    id INTEGER PRIMARY KEY,
+    match_id INTEGER NOT NULL REFERENCES matches(id) ON DELETE CASCADE,
+    is_home INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    player_id INTEGER REFERENCES players(id),
+    team TEXT,
+    minute INTEGER,
+    assist_player_id INTEGER REFERENCES players(id),
+    penalty INTEGER NOT NULL DEFAULT 0,
+    own_goal INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS lineups (
+    match_id INTEGER NOT NULL REFERENCES matches(id) ON DELETE CASCADE,
+    is_home INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    team_id INTEGER NOT NULL REFERENCES teams(id),
+    player_id INTEGER NOT NULL REFERENCES players(id),
+    position TEXT,
+    number INTEGER,
+    PRIMARY KEY (match_id, is_home, seq)
+);
+
+CREATE TABLE IF NOT EXISTS player_stats (
+    player_key TEXT NOT NULL,
+    season TEXT NOT NULL,
+    team TEXT NOT NULL,
+    name TEXT NOT NULL,
+    goals INTEGER NOT NULL DEFAULT 0,
+    penalties INTEGER NOT NULL DEFAULT 0,
+    own_goals INTEGER NOT NULL DEFAULT 0,
+    appearances INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (player_key, season, team)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_matches_season_matchday ON matches(season, matchday);
+CREATE INDEX IF NOT EXISTS idx_matches_home_team ON matches(home_team_id);
+CREATE INDEX IF NOT EXISTS idx_matches_away_team ON matches(away_team_id);
+CREATE INDEX IF NOT EXISTS idx_goals_match ON goals(match_id);
+CREATE INDEX IF NOT EXISTS idx_goals_player ON goals(player_id);
+CREATE INDEX IF NOT EXISTS idx_lineups_team ON lineups(team_id);
+CREATE INDEX IF NOT EXISTS idx_lineups_player ON lineups(player_id);
+CREATE INDEX IF NOT EXISTS idx_player_stats_team ON player_stats(team);
+CREATE INDEX IF NOT EXISTS idx_player_stats_season ON player_stats(season);
+"""
+
+# Spielerindex aus Toren und Aufstellungen neu aufbauen (Bestandsdatenbanken).
+# Eigentore zählen für den Verein des Schützen, also den Gegner der Seite,
+# der das Tor gutgeschrieben wird.
+REBUILD_PLAYER_STATS = """
+INSERT INTO player_stats (
+    player_key, season, team, name, goals, penalties, own_goals, appearances
+)
+SELECT player_key(name), season, team, MAX(name),
+       SUM(goals), SUM(penalties), SUM(own_goals), SUM(appearances)
+FROM (
+    SELECT p.name AS name, m.season AS season, t.name AS team,
+           1 - g.own_goal AS goals, g.penalty * (1 - g.own_goal) AS penalties,
+           g.own_goal AS own_goals, 0 AS appearances
+    FROM goals g
+    JOIN matches m ON m.id = g.match_id
+    JOIN players p ON p.id = g.player_id
+    JOIN teams t ON t.id = CASE WHEN g.is_home = g.own_goal
+                                THEN m.away_team_id ELSE m.home_team_id END
+    UNION ALL
+    SELECT p.name, m.season, t.name, 0, 0, 0, 1
+    FROM lineups l
+    JOIN matches m ON m.id = l.match_id
+    JOIN players p ON p.id = l.player_id
+    JOIN teams t ON t.id = l.team_id
+)
+GROUP BY player_key(name), season, team
+"""
+
+# (Spieler-Schlüssel, Saison, Verein) -> [Name, Tore, Elfmeter, Eigentore, Einsätze]
+_PlayerContributions = Dict[Tuple[str, str, str], List[Any]]
+
+
+class MatchDatabase:
+    """SQLite-Speicher für Bundesliga-Spiele mit Upsert- und Batch-APIs."""
+
+    def __init__(self, db_path: str = "data/bundesliga.db"):
+        """
+        Öffnet (oder erstellt) die Datenbank.
+
+        Args:
+            db_path: Pfad zur SQLite-Datei (":memory:" für reine RAM-Datenbank)
+        """
+        self.db_path = db_path
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        # Die GUIs schreiben aus Worker-Threads, daher eine geteilte
+        # Verbindung, die durch einen Lock geschützt wird
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.create_function("player_key", 1, player_key, deterministic=True)
+        self._conn.executescript(SCHEMA)
+
+        self._team_ids: Dict[str, int] = {}
+        self._player_ids: Dict[str, int] = {}
+
+        # Datenbanken aus älteren Versionen haben noch keinen Spielerindex
+        if not self._conn.execute("SELECT 1 FROM player_stats LIMIT 1").fetchone():
+            self.rebuild_player_index()
+
+    # ------------------------------------------------------------------
+    # Schreiben
+    # ------------------------------------------------------------------
+
+    def _get_id(self, table: str, cache: Dict[str, int], name: str) -> int:
+        """Liefert die ID eines Vereins/Spielers und legt ihn bei Bedarf an."""
+        cached = cache.get(name)
+        if cached is not None:
+            return cached
+
+        self._conn.execute(f"INSERT OR IGNORE INTO {table}(name) VALUES (?)", (name,))
+        row = self._conn.execute(
+            f"SELECT id FROM {table} WHERE name = ?", (name,)
+        ).fetchone()
+        cache[name] = row[0]
+        return row[0]
+
+    def _team_id(self, name: str) -> int:
+        return self._get_id("teams", self._team_ids, name)
+
+    def _player_id(self, name: Optional[str]) -> Optional[int]:
+        if not name:
+            return None
+        return self._get_id("players", self._player_ids, name)
+
+    def _upsert_game(self, game: GameData):
+        """Schreibt ein Spiel inkl. Tore und Aufstellungen (ohne Commit)."""
+        conn = self._conn
+        url = match_key(game)
+        previous = self._stored_contributions(url)
+        home_team_id = self._team_id(game.home_team.name)
+        away_team_id = self._team_id(game.away_team.name)
+
+        conn.execute(
+            """
+            INSERT INTO matches (
+                url, season, matchday, date, home_team_id, away_team_id,
+                home_score, away_score, stadium, attendance
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                season = excluded.season,
+                matchday = COALESCE(excluded.matchday, matches.matchday),
+                date = excluded.date,
+                home_team_id = excluded.home_team_id,
+                away_team_id = excluded.away_team_id,
+                home_score = excluded.home_score,
+                away_score = excluded.away_score,
+                stadium = excluded.stadium,
+                attendance = excluded.attendance,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            (
+                url,
+                game.season,
+                game.matchday,
+                game.date,
+                home_team_id,
+                away_team_id,
+                game.home_score,
+                game.away_score,
+                game.stadium,
+                game.attendance,
+            ),
+        )
+        match_id = conn.execute(
+            "SELECT id FROM matches WHERE url = ?", (url,)
+        ).fetchone()[0]
+
+        # Abhängige Zeilen komplett ersetzen
+        conn.execute("DELETE FROM goals WHERE match_id = ?", (match_id,))
+        conn.execute("DELETE FROM lineups WHERE match_id = ?", (match_id,))
+
+        goal_rows = []
+        lineup_rows = []
+        for is_home, goals, team, team_id in (
+            (1, game.home_goals, game.home_team, home_team_id),
+            (0, game.away_goals, game.away_team, away_team_id),
+        ):
+            for seq, goal in enumerate(goals):
+                goal_rows.append(
+                    (
+                        match_id,
+                        is_home,
+                        seq,
+                        self._player_id(goal.scorer),
+                        goal.team,
+                        goal.minute,
+                        self._player_id(goal.assist),
+                        int(goal.penalty),
+                        int(goal.own_goal),
+                    )
+                )
+            for seq, player in enumerate(team.players):
+                lineup_rows.append(
+                    (
+                        match_id,
+                        is_home,
+                        seq,
+                        team_id,
+                        self._player_id(player.name),
+                        player.position,
+                        player.number,
+                    )
+                )
+
+        conn.executemany(
+            """
+            INSERT INTO goals (
+                match_id, is_home, seq, player_id, team, minute,
+                assist_player_id, penalty, own_goal
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            goal_rows,
+        )
+        conn.executemany(
+            """
+            INSERT INTO lineups (
+                match_id, is_home, seq, team_id, player_id, position, number
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            lineup_rows,
+        )
+
+        self._update_player_stats(previous, self._game_contributions(game))
+
+    # ------------------------------------------------------------------
+    # Spielerindex
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _add_contribution(
+        contributions: _PlayerContributions,
+        name: Optional[str],
+        season: str,
+        team: str,
+        goals: int = 0,
+        penalties: int = 0,
+        own_goals: int = 0,
+        appearances: int = 0,
+    ):
+        if not name:
+            return
+        entry = contributions.setdefault(
+            (player_key(name), season, team), [name, 0, 0, 0, 0]
+        )
+        entry[1] += goals
+        entry[2] += penalties
+        entry[3] += own_goals
+        entry[4] += appearances
+
+    def _match_contributions(
+        self,
+        season: str,
+        home: str,
+        away: str,
+        goals: Iterable[Tuple[bool, Optional[str], bool, bool]],
+        lineups: Iterable[Tuple[bool, Optional[str]]],
+    ) -> _PlayerContributions:
+        """Beitrag eines Spiels zum Spielerindex (wie REBUILD_PLAYER_STATS)."""
+        contributions: _PlayerContributions = {}
+        for is_home, scorer, penalty, own_goal in goals:
+            own_goal = bool(own_goal)
+            team = away if bool(is_home) == own_goal else home
+            self._add_contribution(
+                contributions,
+                scorer,
+                season,
+                team,
+                goals=int(not own_goal),
+                penalties=int(bool(penalty) and not own_goal),
+                own_goals=int(own_goal),
+            )
+        for is_home, name in lineups:
+            self._add_contribution(
+                contributions, name, season, home if is_home else away, appearances=1
+            )
+        return contributions
+
+    def _game_contributions(self, game: GameData) -> _PlayerContributions:
+        goals = [
+            (is_home, goal.scorer, goal.penalty, goal.own_goal)
+            for is_home, goal_list in (
+                (True, game.home_goals),
+                (False, game.away_goals),
+            )
+            for goal in goal_list
+        ]
+        lineups = [
+            (is_home, player.name)
+            for is_home, team in ((True, game.home_team), (False, game.away_team))
+            for player in team.players
+        ]
+        return self._match_contributions(
+            game.season, game.home_team.name, game.away_team.name, goals, lineups
+        )
+
+    def _stored_contributions(self, url: str) -> _PlayerContributions:
+        """Bisheriger Beitrag eines gespeicherten Spiels (leer, falls neu)."""
+        conn = self._conn
+        match = conn.execute(
+            """
+            SELECT m.id, m.season, ht.name, at.name
+            FROM matches m
+            JOIN teams ht ON ht.id = m.home_team_id
+            JOIN teams at ON at.id = m.away_team_id
+            WHERE m.url = ?
+            """,
+            (url,),
+        ).fetchone()
+        if match is None:
+            return {}
+        match_id, season, home, away = match
+        goals = conn.execute(
+            """
+            SELECT g.is_home, p.name, g.penalty, g.own_goal
+            FROM goals g JOIN players p ON p.id = g.player_id
+            WHERE g.match_id = ?
+            """,
+            (match_id,),
+        ).fetchall()
+        lineups = conn.execute(
+            """
+            SELECT l.is_home, p.name
+            FROM lineups l JOIN players p ON p.id = l.player_id
+            WHERE l.match_id = ?
+            """,
+            (match_id,),
+        ).fetchall()
+        return self._match_contributions(season, home, away, goals, lineups)
+
+    def _update_player_stats(
+        self, previous: _PlayerContributions, current: _PlayerContributions
+    ):
+        """Ersetzt den alten Beitrag eines Spiels durch den neuen."""
+        deltas: _PlayerContributions = {}
+        for sign, contributions in ((-1, previous), (1, current)):
+            for key, (name, *counts) in contributions.items():
+                delta = deltas.setdefault(key, [name, 0, 0, 0, 0])
+                delta[0] = name
+                for i, count in enumerate(counts, 1):
+                    delta[i] += sign * count
+
+        rows = [(*key, *delta) for key, delta in deltas.items() if any(delta[1:])]
+        if not rows:
+            return
+        self._conn.executemany(
+            """
+            INSERT INTO player_stats (
+                player_key, season, team, name,
+                goals, penalties, own_goals, appearances
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(player_key, season, team) DO UPDATE SET
+                name = excluded.name,
+                goals = goals + excluded.goals,
+                penalties = penalties + excluded.penalties,
+                own_goals = own_goals + excluded.own_goals,
+                appearances = appearances + excluded.appearances
+            """,
+            rows,
+        )
+        if previous:
+            self._conn.executemany(
+                """
+                DELETE FROM player_stats
+                WHERE player_key = ? AND season = ? AND team = ?
+                  AND goals = 0 AND own_goals = 0 AND appearances = 0
+                """,
+                [key for key in previous if key not in current],
+            )
+
+    def rebuild_player_index(self):
+        """Baut den Spielerindex komplett aus Toren und Aufstellungen neu auf."""
+        with self._lock:
+            self._conn.execute("DELETE FROM player_stats")
+            self._conn.execute(REBUILD_PLAYER_STATS)
+            self._conn.commit()
+
+    def upsert_game(self, game: GameData):
+        """Fügt ein Spiel ein oder aktualisiert es (Schlüssel: kicker-URL)."""
+        self.upsert_games([game])
+
+    def upsert_games(self, games: Iterable[GameData]) -> int:
+        """
+        Fügt mehrere Spiele in einer einzigen Transaktion ein.
+
+        Returns:
+            int: Anzahl der geschriebenen Spiele
+        """
+        count = 0
+        with self._lock:
+            try:
+                for game in games:
+                    if game is None:
+                        continue
+                    self._upsert_game(game)
+                    count += 1
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                # Caches können IDs aus der zurückgerollten Transaktion enthalten
+                self._team_ids.clear()
+                self._player_ids.clear()
+                raise
+        return count
+
+    def batch_writer(self, batch_size: int = 50) -> "BatchWriter":
+        """Erstellt einen Writer, in den der Scraper Spiele streamen kann."""
+        return BatchWriter(self, batch_size)
+
+    def delete_season(self, season: str) -> int:
+        """Löscht alle Spiele einer Saison."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM matches WHERE season = ?", (season,)
+            )
+            self._conn.execute("DELETE FROM player_stats WHERE season = ?", (season,))
+            self._conn.commit()
+            return cursor.rowcount
+
+    # ------------------------------------------------------------------
+    # Lesen
+    # ------------------------------------------------------------------
+
+    def count_games(self) -> int:
+        """Anzahl der gespeicherten Spiele."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
+
+    def get_seasons(self) -> List[str]:
+        """Alle gespeicherten Saisons (sortiert)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT season FROM matches ORDER BY season"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_teams(self) -> List[str]:
+        """Alle bekannten Vereine (sortiert)."""
+        with self._lock:
+            rows = self._conn.execute("SELECT name FROM teams ORDER BY name").fetchall()
+        return [row[0] for row in rows]
+
+    def load_games(
+        self,
+        seasons: Optional[List[str]] = None,
+        team: Optional[str] = None,
+        matchday: Optional[int] = None,
+        keys: Optional[Iterable[str]] = None,
+    ) -> List[GameData]:
+        """
+        Lädt Spiele als GameData-Objekte.
+
+        Tore und Aufstellungen werden mit je einer Abfrage geladen und im
+        Speicher zugeordnet, statt pro Spiel nachzufragen.
+
+        Args:
+            seasons: Nur diese Saisons laden (None = alle)
+            team: Nur Spiele dieses Vereins laden
+            matchday: Nur diesen Spieltag laden
+            keys: Nur Spiele mit diesen Schlüsseln (siehe match_key)
+        """
+        conditions = []
+        params: list = []
+        if seasons:
+            conditions.append(f"m.season IN ({','.join('?' * len(seasons))})")
+            params.extend(seasons)
+        if team:
+            conditions.append(
+                "(m.home_team_id = (SELECT id FROM teams WHERE name = ?)"
+                " OR m.away_team_id = (SELECT id FROM teams WHERE name = ?))"
+            )
+            params.extend([team, team])
+        if matchday is not None:
+            conditions.append("m.matchday = ?")
+            params.append(matchday)
+        if keys is not None:
+            conditions.append("m.url IN (SELECT url FROM temp.wanted_keys)")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._lock:
+            conn = self._conn
+            if keys is not None:
+                conn.execute("DROP TABLE IF EXISTS temp.wanted_keys")
+                conn.execute("CREATE TEMP TABLE wanted_keys (url TEXT PRIMARY KEY)")
+                conn.executemany(
+                    "INSERT OR IGNORE INTO temp.wanted_keys VALUES (?)",
+                    ((key,) for key in keys),
+                )
+            conn.execute("DROP TABLE IF EXISTS temp.selected_matches")
+            conn.execute(
+                f"""
+                CREATE TEMP TABLE selected_matches AS
+                SELECT m.id, m.url, m.season, m.matchday, m.date,
+                       ht.name AS home_name, at.name AS away_name,
+                       m.home_score, m.away_score, m.stadium, m.attendance
+                FROM matches m
+                JOIN teams ht ON ht.id = m.home_team_id
+                JOIN teams at ON at.id = m.away_team_id
+                {where}
+                """,
+                params,
+            )
+            match_rows = conn.execute(
+                "SELECT * FROM selected_matches ORDER BY season, matchday, id"
+            ).fetchall()
+            goal_rows = conn.execute("""
+                SELECT g.match_id, g.is_home, p.name, g.minute, g.team,
+                       a.name, g.penalty, g.own_goal
+                FROM goals g
+                JOIN selected_matches s ON s.id = g.match_id
+                LEFT JOIN players p ON p.id = g.player_id
+                LEFT JOIN players a ON a.id = g.assist_player_id
+                ORDER BY g.match_id, g.is_home, g.seq
+                """).fetchall()
+            lineup_rows = conn.execute("""
+                SELECT l.match_id, l.is_home, p.name, l.position, l.number
+                FROM lineups l
+                JOIN selected_matches s ON s.id = l.match_id
+                JOIN players p ON p.id = l.player_id
+                ORDER BY l.match_id, l.is_home, l.seq
+                """).fetchall()
+            conn.execute("DROP TABLE temp.selected_matches")
+            conn.execute("DROP TABLE IF EXISTS temp.wanted_keys")
+
+        goals_by_match = defaultdict(lambda: ([], []))
+        for (
+            match_id,
+            is_home,
+            scorer,
+            minute,
+            team_name,
+            assist,
+            penalty,
+            own,
+        ) in goal_rows:
+            goal = Goal(
+                scorer=scorer or "",
+                minute=minute,
+                team=team_name,
+                assist=assist,
+                penalty=bool(penalty),
+                own_goal=bool(own),
+            )
+            goals_by_match[match_id][0 if is_home else 1].append(goal)
+
+        players_by_match = defaultdict(lambda: ([], []))
+        for match_id, is_home, name, position, number in lineup_rows:
+            player = Player(name=name, position=position, number=number)
+            players_by_match[match_id][0 if is_home else 1].append(player)
+
+        games = []
+        for (
+            match_id,
+            url,
+            season,
+            matchday,
+            date,
+            home_name,
+            away_name,
+            home_score,
+            away_score,
+            stadium,
+            attendance,
+        ) in match_rows:
+            home_goals, away_goals = goals_by_match.get(match_id, ([], []))
+            home_players, away_players = players_by_match.get(match_id, ([], []))
+            games.append(
+                GameData(
+                    home_team=Team(name=home_name, players=home_players),
+                    away_team=Team(name=away_name, players=away_players),
+                    date=date,
+                    home_score=home_score,
+                    away_score=away_score,
+                    season=season,
+                    home_goals=home_goals,
+                    away_goals=away_goals,
+                    matchday=matchday,
+                    stadium=stadium,
+                    attendance=attendance,
+                    url=None if url.startswith("local:") else url,
+                )
+            )
+
+        return games
+
+    def top_scorers(
+        self,
+        team: Optional[str] = None,
+        season: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """
+        Torjägerliste aus dem Spielerindex.
+
+        Args:
+            team: Nur Tore für diesen Verein (None = alle)
+            season: Nur diese Saison (None = ewige Liste)
+            limit: Maximale Anzahl Einträge
+        """
+        conditions = []
+        params: list = []
+        if team:
+            conditions.append("team = ?")
+            params.append(team)
+        if season:
+            conditions.append("season = ?")
+            params.append(season)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT MAX(name), SUM(goals) AS total, SUM(penalties),
+                       SUM(appearances), COUNT(DISTINCT season)
+                FROM player_stats
+                {where}
+                GROUP BY player_key
+                HAVING total > 0
+                ORDER BY total DESC, MAX(name)
+                LIMIT ?
+                """,
+                (*params, limit),
+            ).fetchall()
+        return [
+            {
+                "player": name,
+                "goals": goals,
+                "penalties": penalties,
+                "appearances": appearances,
+                "seasons": seasons,
+            }
+            for name, goals, penalties, appearances, seasons in rows
+        ]
+
+    def player_career(self, name: str) -> List[Dict[str, Any]]:
+        """Tore und Einsätze eines Spielers je Saison und Verein."""
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT season, team, goals, penalties, own_goals, appearances
+                FROM player_stats
+                WHERE player_key = ?
+                ORDER BY season, team
+                """,
+                (player_key(name),),
+            ).fetchall()
+        return [
+            {
+                "season": season,
+                "team": team,
+                "goals": goals,
+                "penalties": penalties,
+                "own_goals": own_goals,
+                "appearances": appearances,
+            }
+            for season, team, goals, penalties, own_goals, appearances in rows
+        ]
+
+    def player_clubs(self, name: str) -> List[Dict[str, Any]]:
+        """Vereinsstationen eines Spielers (erste/letzte Saison, Tore, Einsätze)."""
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT team, MIN(season), MAX(season), SUM(goals), SUM(appearances)
+                FROM player_stats
+                WHERE player_key = ?
+                GROUP BY team
+                ORDER BY MIN(season)
+                """,
+                (player_key(name),),
+            ).fetchall()
+        return [
+            {
+                "team": team,
+                "first_season": first,
+                "last_season": last,
+                "goals": goals,
+                "appearances": appearances,
+            }
+            for team, first, last, goals, appearances in rows
+        ]
+
+    def find_players(self, text: str, limit: int = 20) -> List[str]:
+        """Spielernamen, deren normalisierter Name den Suchtext enthält."""
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT MAX(name), SUM(goals) AS total
+                FROM player_stats
+                WHERE instr(player_key, ?) > 0
+                GROUP BY player_key
+                ORDER BY total DESC, MAX(name)
+                LIMIT ?
+                """,
+                (player_key(text), limit),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def load_columns(self) -> MatchColumns:
+        """
+        Lädt alle Spiele und Tore direkt als NumPy-Spalten.
+
+        Erzeugt keine GameData-Objekte und ist daher deutlich schneller als
+        load_games() - Grundlage für den memory-mapped Spaltenspeicher.
+        """
+        with self._lock:
+            match_rows = self._conn.execute("""
+                SELECT m.url, m.season, m.matchday, m.date, ht.name, at.name,
+                       m.home_score, m.away_score
+                FROM matches m
+                JOIN teams ht ON ht.id = m.home_team_id
+                JOIN teams at ON at.id = m.away_team_id
+                """).fetchall()
+            goal_rows = self._conn.execute("""
+                SELECT m.url, g.is_home, p.name, g.minute, g.penalty, g.own_goal
+                FROM goals g
+                JOIN matches m ON m.id = g.match_id
+                LEFT JOIN players p ON p.id = g.player_id
+                ORDER BY g.match_id, g.is_home, g.seq
+                """).fetchall()
+        return MatchColumns.from_records(match_rows, goal_rows)
+
+    def close(self):
+        """Schließt die Datenbankverbindung."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class BatchWriter:
+    """
+    Sammelt gestreamte Spiele und schreibt sie blockweise in die Datenbank.
+
+    Kann direkt als game_callback an KickerScraper.batch_download_with_progress
+    übergeben werden.
+    """
+
+    def __init__(self, database: MatchDatabase, batch_size: int = 50):
+        self.database = database
+        self.batch_size = batch_size
+        self.written = 0
+        self._buffer: List[GameData] = []
+
+    def add(self, game: GameData):
+        """Nimmt ein Spiel entgegen und schreibt bei voller Batch."""
+        if game is None:
+            return
+        self._buffer.append(game)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    __call__ = add
+
+    def flush(self):
+        """Schreibt alle gepufferten Spiele."""
+        if not self._buffer:
+            return
+        self.written += self.database.upsert_games(self._buffer)
+        self._buffer = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Fehler beim Schreiben der letzten Batch: {e}")
+            if exc_type is None:
+                raise
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test für den Spaltenspeicher: geöffnete Versionen bleiben nach dem
+Schreiben neuer Versionen lesbar
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Füge das Hauptverzeichnis zum Python-Pfad hinzu
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir))
+
+from models.game_data import GameData, Goal, Team
+from models.columnar import MatchColumns
+from storage.columnar_store import KEEP_VERSIONS, ColumnarMatchStore
+
+
+def _columns() -> MatchColumns:
+    games = [
+        GameData(
+            home_team=Team("FC Bayern München"),
+            away_team=Team("VfL Wolfsburg"),
+            date="Sa., 24.08.",
+            home_score=2,
+            away_score=1,
+            season="2024/25",
+            home_goals=[
+                Goal("Kane", 12, "FC Bayern München"),
+                Goal("Musiala", 67, "FC Bayern München"),
+            ],
+            away_goals=[Goal("Wind", 90, "VfL Wolfsburg")],
+            matchday=1,
+        ),
+        GameData(
+            home_team=Team("VfL Wolfsburg"),
+            away_team=Team("FC Bayern München"),
+            date="Sa., 18.01.",
+            home_score=0,
+            away_score=0,
+            season="2024/25",
+            matchday=18,
+        ),
+    ]
+    return MatchColumns.from_games(games)
+
+
+def test_open_survives_new_versions(tmp_path=None):
+    """write -> open -> write -> Zugriff auf noch nicht gelesene Spalten."""
+    if tmp_path is None:
+        tmp_path = Path(tempfile.mkdtemp())
+    store = ColumnarMatchStore(str(tmp_path / "columnar"))
+    columns = _columns()
+
+    store.write(columns)
+    opened = store.open()
+    store.write(columns)
+
+    # Noch nicht angefasste Spalten und Spielernamen der alten Version
+    assert list(opened.season_id) == list(columns.season_id)
+    assert list(opened.goal_minute) == list(columns.goal_minute)
+    assert opened.players == columns.players
+
+    # Auch nach weiteren Versionen bleiben die eingeblendeten Spalten gültig
+    for _ in range(KEEP_VERSIONS + 1):
+        store.write(columns)
+    assert list(opened.goal_scorer_id) == list(columns.goal_scorer_id)
+
+    versions = sorted(path.name for path in (tmp_path / "columnar").glob("v*"))
+    assert len(versions) == KEEP_VERSIONS
+    assert len(store.open()) == len(columns)
+
+
+if __name__ == "__main__":
+    test_open_survives_new_versions()
+    print("✅ Test abgeschlossen!")